@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+# The app opens its snapshot database on the first request, so it is pointed at a scratch file
+_directory = tempfile.TemporaryDirectory()
+os.environ["GAME_SNAPSHOTS"] = os.path.join(_directory.name, "snapshots.sqlite3")
+import app as web  # noqa: E402
+
+
+def tearDownModule():
+    if web.snapshots is not None:
+        web.snapshots.close()
+    _directory.cleanup()
+
+
+class TestApp(unittest.TestCase):
+
+    def setUp(self):
+        self.client = web.app.test_client()
+
+    def start(self, difficulty: str = "hard") -> str:
+        response = self.client.post("/start_game", json={"gameType": "single", "difficulty": difficulty,
+                                                         "playerName": "Tester"})
+        self.assertEqual(response.json["status"], "success")
+        return response.json["gameId"]
+
+    def test_start_game_and_make_move(self):
+        """Test that a move gets the computer's reply and that bad moves are refused."""
+        game_id = self.start()
+        response = self.client.post("/make_move", json={"gameId": game_id, "row": 1, "col": 1}).json
+        self.assertEqual(response["status"], "continue")
+        self.assertEqual(sorted(response["board"]), sorted(["x", "o"] + [""] * 7))
+        response = self.client.post("/make_move", json={"gameId": game_id, "row": 1, "col": 1}).json
+        self.assertEqual(response["status"], "invalid")
+        response = self.client.post("/make_move", json={"gameId": "unknown", "row": 0, "col": 0})
+        self.assertEqual(response.status_code, 404)
+
+    def test_players_without_names(self):
+        """Test that a two player game started without names gets default names and is snapshotted."""
+        response = self.client.post("/start_game", json={"gameType": "multi"}).json
+        self.assertEqual(response["status"], "success")
+        names = [player.name for player in web.games[response["gameId"]].players]
+        self.assertEqual(names, ["Anonymous X", "Anonymous O"])
+
+    def test_games_resume_from_snapshots(self):
+        """Test that a game in progress is resumed when the store is opened again, as after a restart."""
+        game_id = self.start()
+        self.client.post("/make_move", json={"gameId": game_id, "row": 1, "col": 1})
+        web.snapshots.close()
+        web.snapshots = None
+        web.games.clear()
+        response = self.client.post("/make_move", json={"gameId": game_id, "row": 0, "col": 1}).json
+        self.assertEqual(response["status"], "continue")
+        self.assertEqual(response["board"].count("x"), 2)
+
+    def test_hard_replies_keep_their_variety(self):
+        """Test that hard mode answers the centre with different corners across games."""
+        replies = set()
+        for _ in range(40):
+            board = self.client.post("/make_move", json={"gameId": self.start(), "row": 1, "col": 1}).json["board"]
+            replies.add(board.index("o"))
+        self.assertGreater(len(replies), 1)
+        self.assertLessEqual(replies, {0, 2, 6, 8})
+
+    def metrics(self) -> tuple[dict[str, str], dict[str, float]]:
+        """Returns the type of each metric and the value of each sample served at /metrics."""
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        kinds, samples = {}, {}
+        for line in response.get_data(as_text=True).splitlines():
+            if line.startswith("# TYPE "):
+                name, kind = line[len("# TYPE "):].split()
+                kinds[name] = kind
+            elif line and not line.startswith("#"):
+                sample, value = line.rsplit(" ", 1)
+                samples[sample] = float(value)
+        return kinds, samples
+
+    def test_metrics_count_requests_and_decisions(self):
+        """Test that requests and AI decisions are counted in the text served at /metrics."""
+        kinds, before = self.metrics()
+        self.assertEqual(kinds["tictactoe_requests_total"], "counter")
+        self.assertEqual(kinds["tictactoe_ai_decision_seconds"], "histogram")
+        for _ in range(2):
+            self.client.post("/make_move", json={"gameId": self.start(), "row": 0, "col": 0})
+        _, after = self.metrics()
+        decisions = 'tictactoe_ai_decision_seconds_count{difficulty="hard"}'
+        self.assertEqual(after[decisions], before.get(decisions, 0) + 2)
+        self.assertEqual(after['tictactoe_requests_total{endpoint="make_move",status="200"}'],
+                         before.get('tictactoe_requests_total{endpoint="make_move",status="200"}', 0) + 2)
+
+if __name__ == "__main__":
+    unittest.main()
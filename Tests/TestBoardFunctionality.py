@@ -31,6 +31,24 @@ class TestBoardFunctionality(unittest.TestCase):
         self.assertEqual(self.board_3x3.get_diagonals(2, "right"), [['o', 0], [0, 'x'], [0, 0], [0, 0]])
         self.assertEqual(self.board_3x3.get_diagonals(1, "left"), [[0], [0], ['o'], ['x'], [0], [0], [0], [0], ['o']])
 
+    def test_reused_line_buffers(self):
+        """Ensure reused buffers hold the same lines as new lists and follow the board after a reset in place."""
+        for row, col, marker in ((0, 0, "r"), (1, 1, "y"), (2, 2, "r"), (5, 3, "y"), (3, 6, "r")):
+            self.board_6x7.update_square(row, col, marker)
+        expected = (self.board_6x7.get_columns(), self.board_6x7.get_diagonals(4, "right"),
+                    self.board_6x7.get_diagonals(4, "left"))
+        rows = self.board_6x7.get_rows()
+        self.board_6x7.reuse_line_buffers()
+        columns = self.board_6x7.get_columns()
+        self.assertEqual((columns, self.board_6x7.get_diagonals(4, "right"),
+                          self.board_6x7.get_diagonals(4, "left")), expected)
+
+        self.board_6x7.reset_board()
+        self.assertIs(self.board_6x7.get_rows(), rows)
+        self.assertIs(self.board_6x7.get_columns(), columns)
+        self.assertEqual(columns, [[0] * 6 for _ in range(7)])
+        self.assertEqual(self.board_6x7.get_diagonals(4, "left"), [[0] * 4] * 12)
+
     def test_horizontal_win_connect_4_of_7(self):
         """Test if horizontal win condition is detected."""
         for col in range(7):  # Connect 4 win condition met with multiple wins in one move
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+from games.Game import TicTacToe, ConnectFour
+from games.records import GameRecordWriter, read_records
+
+
+def finish(game, moves):
+    """Plays the moves with alternating markers and records the result through update_players_stats."""
+    for index, move in enumerate(moves):
+        game.make_move(*move, game.players[index % 2].marker)
+        if game.check_winner():
+            break
+    game.update_winner_info()
+    game.update_players_stats()
+    game.reset_game_state()
+
+
+class TestGameRecords(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a record file in a temporary directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "games.rec")
+
+    def test_observer_records_each_game(self):
+        """Test that a registered writer records every completed game with its moves and result."""
+        game = TicTacToe()
+        with GameRecordWriter(self.path) as writer:
+            game.add_observer(writer)
+            finish(game, [(0, 0), (1, 0), (0, 1), (2, 0), (0, 2)])
+            game.go_first = True
+            finish(game, [(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2)])
+        records = list(read_records(self.path))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].result, 1)
+        self.assertEqual(records[0].moves, ((0, 0), (1, 0), (0, 1), (2, 0), (0, 2)))
+        self.assertEqual((records[0].rows, records[0].columns, records[0].win_value), (3, 3, 3))
+        self.assertEqual(records[1].result, 0)
+        self.assertEqual(len(records[1].moves), 9)
+
+    def test_connect_four_record(self):
+        """Test that Connect Four games keep their board size and the landing square of each move."""
+        game = ConnectFour()
+        with GameRecordWriter(self.path) as writer:
+            game.add_observer(writer)
+            finish(game, [(0,), (1,), (0,), (1,), (0,), (1,), (0,)])
+        record, = read_records(self.path)
+        self.assertEqual((record.rows, record.columns, record.win_value), (6, 7, 4))
+        self.assertEqual(record.result, 1)
+        self.assertEqual(record.moves[-1], (2, 0))
+
+    def test_truncated_file(self):
+        """Ensure ValueError is raised when the last record was only partly written."""
+        game = TicTacToe()
+        with GameRecordWriter(self.path) as writer:
+            game.add_observer(writer)
+            finish(game, [(0, 0), (1, 0), (0, 1), (2, 0), (0, 2)])
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 1)
+        with self.assertRaises(ValueError):
+            list(read_records(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
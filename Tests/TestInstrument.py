@@ -0,0 +1,45 @@
+import unittest
+from core.board import Board
+from games.Game import TicTacToe
+from utils.instrument import Instrumentation
+
+
+class TestInstrument(unittest.TestCase):
+
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+        self.game = TicTacToe()
+        self.game.create_ai_player(name="CPU", difficulty=False)
+        self.game.add_observer(self.instrumentation)
+
+    def tearDown(self):
+        self.instrumentation.disable()
+
+    def test_methods_restored_when_disabled(self):
+        """Test that disabling puts back the original methods, so nothing is counted."""
+        original = Board.__dict__["get_columns"]
+        self.instrumentation.enable()
+        self.assertIsNot(Board.__dict__["get_columns"], original)
+        self.instrumentation.disable()
+        self.assertIs(Board.__dict__["get_columns"], original)
+        self.game.board.get_columns()
+        self.assertEqual(self.instrumentation.calls, {})
+
+    def test_counts_for_each_game(self):
+        """Test that the calls of each finished game are reported separately and added to the totals."""
+        with self.instrumentation:
+            for _ in range(2):
+                self.game.make_move(1, 1, "x")
+                self.game.players[1].move(self.game.board)
+                self.game.update_players_stats()
+                self.game.reset_game_state()
+        self.assertEqual(len(self.instrumentation.games), 2)
+        first_game = self.instrumentation.games[0]
+        self.assertEqual(first_game["TicTacToe.AIPlayer.win_or_block"][0], 1)
+        self.assertEqual(self.instrumentation.totals["TicTacToe.AIPlayer.win_or_block"][0], 2)
+        self.assertEqual(self.instrumentation.calls, {})
+        self.assertIn("over 2 games", self.instrumentation.report())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from games.Game import TicTacToe, ConnectFour
+from games.mcts import MCTSPlayer, shutdown_pools
+
+
+def play(game, moves):
+    """Plays the moves with alternating markers starting with the first player."""
+    for index, move in enumerate(moves):
+        game.apply_move(move, game.players[index % 2].marker)
+
+
+class TestMCTS(unittest.TestCase):
+
+    def test_takes_the_win(self):
+        """Test that the search finds a winning square over a block."""
+        game = TicTacToe()
+        game.create_mcts_player(iterations=2000)
+        play(game, [(1, 0), (0, 0), (1, 1), (0, 1), (2, 2)])
+        self.assertEqual(game.players[1].move(), (0, 2))
+
+    def test_blocks_the_opponent_in_connect_four(self):
+        """Test that the search blocks three in a row on a Connect Four board."""
+        game = ConnectFour()
+        game.create_mcts_player(iterations=3000, rollout="win_or_block")
+        play(game, [0, 6, 1, 6, 2])
+        self.assertEqual(game.players[1].move(), 3)
+
+    def test_larger_board(self):
+        """Test that the search plays a legal move on a configured board size and restores the position."""
+        game = TicTacToe(rows=5, columns=5, connect_value=4)
+        game.create_mcts_player(iterations=200)
+        play(game, [(2, 2)])
+        rows = game.board.get_board()
+        move = game.players[1].move()
+        self.assertIn(move, game.legal_moves())
+        self.assertEqual(game.board.get_board(), rows)
+        self.assertEqual(game.move_list, [(2, 2)])
+        self.assertEqual(game.players[1].playouts, 200)
+        self.assertGreater(game.players[1].playouts_per_second, 0)
+
+    def test_time_budget(self):
+        """Test that a time budget replaces the iteration count."""
+        game = ConnectFour()
+        game.create_mcts_player(iterations=1)
+        player = game.players[1]
+        player.think(0.05)
+        self.assertGreater(player.playouts, 1)
+        self.assertLess(player.search_time, 0.5)
+
+    def test_zero_budget(self):
+        """Test that a spent budget or no iterations still runs one playout and plays a legal move."""
+        game = TicTacToe()
+        game.create_mcts_player(iterations=0)
+        player = game.players[1]
+        play(game, [(1, 1)])
+        self.assertIn(player.think(0), game.legal_moves())
+        self.assertEqual(player.playouts, 1)
+        self.assertIn(player.move(), game.legal_moves())
+        self.assertEqual(game.move_list, [(1, 1)])
+
+    def test_root_parallel_search(self):
+        """Test that parallel workers share the iterations and their merged counts still find the win."""
+        game = ConnectFour()
+        game.create_mcts_player(iterations=2000, workers=2)
+        play(game, [0, 6, 0, 6, 1, 6, 5])
+        try:
+            self.assertEqual(game.players[1].move(), 6)
+        finally:
+            shutdown_pools()
+        self.assertEqual(game.players[1].playouts, 2000)
+        self.assertEqual(game.move_list, [(5, 0), (5, 6), (4, 0), (4, 6), (5, 1), (3, 6), (5, 5)])
+
+    def test_invalid_rollout_policy(self):
+        """Test that an unknown rollout policy is rejected."""
+        with self.assertRaises(ValueError):
+            MCTSPlayer(rollout="greedy")
+
+
+if __name__ == "__main__":
+    unittest.main()
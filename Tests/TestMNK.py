@@ -0,0 +1,49 @@
+import unittest
+from core.board import winning_windows
+from games.Game import TicTacToe
+
+
+def play(game, moves):
+    """Plays the moves with alternating markers starting with the first player."""
+    for index, move in enumerate(moves):
+        game.apply_move(move, game.players[index % 2].marker)
+
+
+class TestMNK(unittest.TestCase):
+
+    def test_winning_windows(self):
+        """Test the number of windows on classic, Connect Four and Gomoku sized boards."""
+        self.assertEqual(len(winning_windows(3, 3, 3)), 8)
+        self.assertEqual(len(winning_windows(6, 7, 4)), 69)
+        self.assertEqual(len(winning_windows(15, 15, 5)), 572)
+        self.assertIn(((0, 2), (1, 1), (2, 0)), winning_windows(3, 3, 3))
+
+    def test_takes_the_win(self):
+        """Test that the player completes its own line rather than blocking."""
+        game = TicTacToe(rows=5, columns=5, connect_value=4)
+        game.create_mnk_player()
+        play(game, [(0, 0), (1, 1), (0, 1), (1, 2), (4, 4), (1, 3), (4, 3)])
+        self.assertIn(game.players[1].move(), [(1, 0), (1, 4)])
+
+    def test_blocks_an_open_three(self):
+        """Test that the player stops an open three from becoming an unstoppable open four on a large board."""
+        game = TicTacToe(rows=15, columns=15, connect_value=5)
+        game.create_mnk_player()
+        play(game, [(7, 7), (0, 0), (7, 8), (0, 14), (7, 9)])
+        self.assertIn(game.players[1].move(), [(7, 6), (7, 10)])
+
+    def test_leaves_the_game_unchanged(self):
+        """Test that searching to a time budget plays a legal move and restores the position."""
+        game = TicTacToe(rows=7, columns=7, connect_value=5)
+        game.create_mnk_player(depth=6)
+        play(game, [(3, 3), (2, 2), (3, 4)])
+        rows = game.board.get_board()
+        move = game.players[1].think(0.2)
+        self.assertIn(move, game.legal_moves())
+        self.assertEqual(game.board.get_board(), rows)
+        self.assertEqual(game.move_list, [(3, 3), (2, 2), (3, 4)])
+        self.assertGreaterEqual(game.players[1].depth_reached, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from games.Game import TicTacToe
+from utils.metrics import Registry, deep_size
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_and_gauge(self):
+        """Test the text format of labelled counters and of gauges read from a function."""
+        requests = self.registry.counter("requests_total", "Requests.", ("endpoint",))
+        self.registry.gauge("active", "Active games.", function=lambda: 3)
+        requests.inc("make_move")
+        requests.inc("make_move")
+        lines = self.registry.render().splitlines()
+        self.assertIn("# TYPE requests_total counter", lines)
+        self.assertIn('requests_total{endpoint="make_move"} 2', lines)
+        self.assertIn("active 3", lines)
+
+    def test_counter_read_from_function(self):
+        """Test that a counter kept elsewhere is read when the metrics are rendered."""
+        hits = [5]
+        self.registry.counter("hits_total", "Hits.", function=lambda: hits[0])
+        hits[0] += 1
+        lines = self.registry.render().splitlines()
+        self.assertIn("# TYPE hits_total counter", lines)
+        self.assertIn("hits_total 6", lines)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that each bucket counts the observations up to its bound, ending with the total count."""
+        latency = self.registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            latency.observe(value)
+        lines = self.registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', lines)
+        self.assertIn("latency_seconds_count 4", lines)
+        self.assertIn("latency_seconds_sum 2.65", lines)
+
+    def test_deep_size_leaves_out_shared_objects(self):
+        """Test that excluded observers do not count towards the size of a game."""
+        game = TicTacToe()
+        size = deep_size(game)
+        shared = [bytearray(100000)]
+        game.add_observer(shared)
+        self.assertGreater(deep_size(game), size + 100000)
+        self.assertLess(deep_size(game, [shared]), size + 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
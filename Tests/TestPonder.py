@@ -0,0 +1,84 @@
+import threading
+import unittest
+from time import perf_counter
+from games.Game import TicTacToe
+from games.ponder import Ponderer
+
+
+def first_free_square(game, player, stop):
+    """Deterministic decision used in place of the AI search."""
+    return game.legal_moves()[0]
+
+
+def wait_for_stop(game, player, stop):
+    """Decision that searches until it is stopped."""
+    stop.wait(30)
+    return game.legal_moves()[0]
+
+
+class TestPonder(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a hard mode game with the human to move."""
+        self.game = TicTacToe()
+        self.game.create_ai_player(name="CPU", difficulty=True)
+        self.ai = self.game.players[1]
+        self.ponderer = Ponderer(first_free_square)
+
+    def test_reply_ready_for_every_human_move(self):
+        """Test that each human move has a prepared reply for the position it leads to."""
+        self.ponderer.start(self.game, self.ai)
+        self.ponderer.join()
+        self.game.make_move(0, 0, "x")
+        self.assertEqual(self.ponderer.take(self.game), (0, 1))
+        self.assertEqual(self.game.move_list, [(0, 0)])
+
+    def test_take_stops_pondering(self):
+        """Test that a reply can only be taken once and not after pondering was cancelled."""
+        self.ponderer.start(self.game, self.ai)
+        self.ponderer.join()
+        self.ponderer.cancel()
+        self.game.make_move(1, 1, "x")
+        self.assertIsNone(self.ponderer.take(self.game))
+
+    def test_pondering_leaves_game_untouched(self):
+        """Test that pondering works on a copy without the game's observers."""
+        notified = []
+
+        class Observer:
+            def game_complete(self, game):
+                notified.append(game)
+
+        self.game.add_observer(Observer())
+        self.game.make_move(1, 1, "x")
+        self.game.make_move(0, 0, "o")
+        self.ponderer.start(self.game, self.ai)
+        self.ponderer.join()
+        self.assertEqual(self.game.move_list, [(1, 1), (0, 0)])
+        self.assertEqual(len(self.game.observers), 1)
+        self.assertEqual(notified, [])
+
+    def test_cancel_stops_the_search(self):
+        """Test that cancelling ends a decision in progress and starting again leaves one thread running."""
+        ponderer = Ponderer(wait_for_stop)
+        ponderer.start(self.game, self.ai)
+        first = ponderer._thread
+        ponderer.start(self.game, self.ai)
+        self.assertFalse(first.is_alive())
+        ponderer.cancel()
+        ponderer.join(5)
+        self.assertFalse(ponderer._thread.is_alive())
+
+    def test_stop_ends_think(self):
+        """Test that the computer's search returns its strategy move at once when stopped."""
+        self.game.make_move(1, 1, "x")
+        stop = threading.Event()
+        stop.set()
+        start = perf_counter()
+        move = self.ai.think(budget=30, stop=stop)
+        self.assertLess(perf_counter() - start, 5)
+        self.assertIn(move, self.game.legal_moves())
+
+
+if __name__ == "__main__":
+    unittest.main()
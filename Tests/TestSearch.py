@@ -0,0 +1,74 @@
+import unittest
+from time import perf_counter
+from games.Game import TicTacToe, ConnectFour
+from games.search import AnytimeSearch
+
+
+def play(game, moves):
+    """Plays the moves with alternating markers starting with the first player."""
+    for index, move in enumerate(moves):
+        game.apply_move(move, game.players[index % 2].marker)
+
+
+class TestSearch(unittest.TestCase):
+
+    def test_takes_the_win(self):
+        """Test that the search finds a winning square over a block."""
+        game = TicTacToe()
+        play(game, [(0, 0), (1, 0), (0, 1), (1, 1)])
+        self.assertEqual(AnytimeSearch(game, "x").run(1.0), (0, 2))
+
+    def test_blocks_the_opponent(self):
+        """Test that the search blocks the only line the opponent can complete."""
+        game = TicTacToe()
+        play(game, [(0, 0), (1, 1), (0, 1)])
+        self.assertEqual(AnytimeSearch(game, "o").run(1.0), (0, 2))
+
+    def test_search_restores_the_position(self):
+        """Test that the board and move list are unchanged after searching."""
+        game = TicTacToe()
+        play(game, [(1, 1), (0, 0)])
+        rows = game.board.get_board()
+        search = AnytimeSearch(game, "x")
+        search.run(1.0)
+        self.assertTrue(search.solved)
+        self.assertEqual(search.best_score, 0)
+        self.assertEqual(game.board.get_board(), rows)
+        self.assertEqual(game.move_list, [(1, 1), (0, 0)])
+        self.assertEqual(game.round_count, 2)
+
+    def test_expired_deadline_keeps_initial_move(self):
+        """Test that the initial move is returned when no iteration completes in time."""
+        game = ConnectFour()
+        search = AnytimeSearch(game, "r")
+        search.start(initial_move=3)
+        self.assertFalse(search.refine(perf_counter() - 1))
+        self.assertEqual(search.depth, 0)
+        self.assertEqual(search.best_move, 3)
+
+    def test_connect_four_threat(self):
+        """Test that the search blocks a vertical threat in Connect Four."""
+        game = ConnectFour()
+        play(game, [0, 6, 0, 6, 0])
+        self.assertEqual(AnytimeSearch(game, "y", max_depth=2).run(2.0), 0)
+
+    def test_hard_mode_never_loses_to_search(self):
+        """Test that hard mode thinking still draws against a perfect opponent."""
+        game = TicTacToe()
+        game.create_ai_player(name="CPU", difficulty=True)
+        for _ in range(2):
+            for i in range(game.board_size):
+                player = game.players[i % 2] if game.go_first else game.players[i % 2 - 1]
+                if isinstance(player, TicTacToe.AIPlayer):
+                    move = player.think(5.0)
+                else:
+                    move = AnytimeSearch(game, player.marker).run(5.0)
+                game.apply_move(move, player.marker)
+                if game.last_move_won():
+                    break
+            self.assertFalse(game.check_winner())
+            game.reset_game_state()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from games.Game import TicTacToe, ConnectFour
+from games.mcts import MCTSPlayer
+from games.mnk import MNKPlayer
+from games.snapshot import encode_game, decode_game, SnapshotStore
+from games.solver import SolverPlayer
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a one player Tic Tac Toe game part way through and a temporary database."""
+        self.game = TicTacToe()
+        self.game.create_ai_player(name="CPU Hard", difficulty=True)
+        self.game.update_player_name("Ada", "x")
+        self.game.players[0].won()
+        self.game.players[0].game_played()
+        self.game.go_first = False
+        for row, col, marker in ((1, 1, "o"), (0, 0, "x"), (2, 2, "o")):
+            self.game.make_move(row, col, marker)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "snapshots.sqlite3")
+
+    def test_tic_tac_toe_round_trip(self):
+        """Test that a decoded game has the same board, moves, turn order and players."""
+        restored = decode_game(encode_game(self.game))
+        self.assertEqual(restored.board.get_rows(), self.game.board.get_rows())
+        self.assertEqual(restored.move_list, self.game.move_list)
+        self.assertEqual(restored.round_count, 3)
+        self.assertFalse(restored.go_first)
+        self.assertEqual(repr(restored.players), repr(self.game.players))
+        self.assertIsInstance(restored.players[1], TicTacToe.AIPlayer)
+        self.assertTrue(restored.players[1].difficulty)
+        self.assertIs(restored.players[1].game, restored)
+
+    def test_connect_four_round_trip(self):
+        """Test that Connect Four snapshots rebuild the stacked pieces from the column moves."""
+        game = ConnectFour()
+        for col, marker in ((3, "r"), (3, "y"), (4, "r"), (2, "y")):
+            game.make_move(col, marker)
+        restored = decode_game(encode_game(game))
+        self.assertEqual(restored.board.get_rows(), game.board.get_rows())
+        self.assertEqual(restored.move_list, [(5, 3), (4, 3), (5, 4), (5, 2)])
+
+    def test_markers_out_of_turn(self):
+        """Test that moves set up out of turn order keep their markers."""
+        game = TicTacToe()
+        game.go_first = False
+        for move, marker in (((0, 0), "x"), ((1, 1), "x"), ((2, 2), "o")):
+            game.apply_move(move, marker)
+        restored = decode_game(encode_game(game))
+        self.assertEqual(restored.board.get_rows(), game.board.get_rows())
+        self.assertEqual(restored.move_list, game.move_list)
+
+    def test_search_players_round_trip(self):
+        """Test that MCTS and MNK players come back with their settings rather than as human players."""
+        game = ConnectFour()
+        game.create_mcts_player(iterations=200, rollout="win_or_block", time_budget=0.5)
+        restored = decode_game(encode_game(game)).players[1]
+        self.assertIsInstance(restored, MCTSPlayer)
+        self.assertEqual((restored.iterations, restored.rollout, restored.time_budget), (200, "win_or_block", 0.5))
+        game = TicTacToe(7, 7, 4)
+        game.create_mnk_player(depth=3, width=6)
+        restored = decode_game(encode_game(game)).players[1]
+        self.assertIsInstance(restored, MNKPlayer)
+        self.assertEqual((restored.depth, restored.width, restored.time_budget), (3, 6, None))
+
+    def test_rejects_players_it_cannot_store(self):
+        """Test that players without a name or of an unsupported type raise ValueError."""
+        game = ConnectFour()
+        game.create_mcts_player(name=None)
+        with self.assertRaises(ValueError):
+            encode_game(game)
+        game = ConnectFour()
+        game.players = (game.players[0], SolverPlayer(marker="y", game=game))
+        with self.assertRaises(ValueError):
+            encode_game(game)
+
+    def test_snapshot_is_compact(self):
+        """Test that each move adds a single byte to the snapshot."""
+        before = len(encode_game(self.game))
+        self.game.make_move(0, 2, "x")
+        self.assertEqual(len(encode_game(self.game)), before + 1)
+
+    def test_store_batches_writes(self):
+        """Test that checkpoints are only written once the batch is full or flushed."""
+        store = SnapshotStore(self.path, batch_size=3)
+        store.checkpoint("a", self.game)
+        store.checkpoint("b", self.game)
+        reader = SnapshotStore(self.path)
+        self.assertEqual(len(reader), 0)
+        store.checkpoint("c", self.game)
+        self.assertEqual(len(reader), 3)
+        store.delete("b")
+        store.close()
+        games = reader.load_all()
+        self.assertEqual(sorted(games), ["a", "c"])
+        self.assertEqual(games["a"].move_list, self.game.move_list)
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from games.Game import ConnectFour
+from games.solver import BitBoard, OpeningBook, Solver, build_opening_book, opening_positions
+
+
+def play(game, columns):
+    """Plays the columns with alternating markers starting with red."""
+    for index, column in enumerate(columns):
+        game.make_move(column, "ry"[index % 2])
+
+
+class TestSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.solver = Solver(rows=4, columns=4, connect_value=3)
+
+    def tearDown(self):
+        self.solver.close()
+
+    def test_immediate_win(self):
+        """Test that a win on the next move scores one point per stone left to the winner."""
+        game = ConnectFour(3, 4, 4)
+        play(game, [0, 3, 1, 3])
+        self.assertEqual(self.solver.solve(BitBoard.from_game(game)), (16 + 1 - 4) // 2)
+
+    def test_solves_small_board(self):
+        """Test the exact scores of the moves from the empty 4x4 board with three in a row to win."""
+        scores = self.solver.move_scores(BitBoard(4, 4, 3))
+        self.assertEqual(scores, {0: 1, 1: 4, 2: 4, 3: 1})
+        self.assertEqual(self.solver.solve(BitBoard(4, 4, 3)), 4)
+
+    def test_winning_squares_do_not_wrap(self):
+        """Test that stones at the top of one column and the bottom of the next are not a line."""
+        board = BitBoard(4, 4, 3)
+        for column in (0, 1, 0, 1, 0, 1, 1):
+            board.play_column(column)
+        position = board.position ^ board.mask  # The stones of the player who just moved, in column 1
+        self.assertEqual(board.winning_squares(position) & board.possible() & board.column_mask(2), 0)
+
+    def test_opening_book(self):
+        """Test that the book has every opening position once and agrees with the solver."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "book.bin")
+        count = build_opening_book(path, rows=4, columns=4, connect_value=3, ply=2)
+        book = OpeningBook(path)
+        try:
+            self.assertEqual(len(book), count)
+            self.assertEqual(count, 1 + 2 + 8)  # Mirror images are stored once
+            for board in opening_positions(4, 4, 3, 2):
+                self.assertEqual(book.lookup(board), self.solver.solve(board))
+            board = BitBoard(4, 4, 3)
+            for column in (0, 1, 2):
+                board.play_column(column)
+            self.assertIsNone(book.lookup(board))
+        finally:
+            book.close()
+
+    def test_solver_player(self):
+        """Test that the player blocks a line and falls back to tree search when the solve runs out of time."""
+        game = ConnectFour(3, 4, 4)
+        game.create_solver_player()
+        play(game, [0, 3, 1])
+        self.assertEqual(game.players[1].move(), 2)
+        self.assertTrue(game.players[1].solved)
+
+        game = ConnectFour()
+        game.create_solver_player(time_limit=0.05, iterations=10)
+        game.make_move(3, "r")
+        self.assertIn(game.players[1].move(), range(7))
+        self.assertFalse(game.players[1].solved)
+
+
+if __name__ == "__main__":
+    unittest.main()
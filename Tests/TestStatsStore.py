@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from core.player import Player
+from core.stats_store import PlayerStatsStore
+from games.Game import TicTacToe
+
+
+class TestStatsStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a store in a temporary directory that only writes every three games."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "stats.sqlite3")
+        self.store = PlayerStatsStore(self.path, flush_every=3)
+
+    def tearDown(self):
+        self.store.close()
+
+    def stored(self, name):
+        reader = PlayerStatsStore(self.path)
+        stats = reader._connection.execute("SELECT wins, losses, played FROM player_stats WHERE name = ?",
+                                           (name,)).fetchone()
+        reader.close()
+        return stats
+
+    def test_results_are_written_in_batches(self):
+        """Test that results stay in the cache until flush_every games have completed."""
+        game = TicTacToe()
+        game.add_observer(self.store)
+        game.winner_name = "Player 1"
+        game.update_players_stats()
+        game.winner_name = None
+        game.update_players_stats()
+        self.assertIsNone(self.stored("Player 1"))
+        self.assertEqual(self.store.get("Player 1"), (1, 0, 2))
+        game.winner_name = "Player 2"
+        game.update_players_stats()
+        self.assertEqual(self.stored("Player 1"), (1, 1, 3))
+        self.assertEqual(self.stored("Player 2"), (1, 1, 3))
+
+    def test_results_are_written_after_the_interval(self):
+        """Test that a game completing after flush_interval seconds writes the cache before the batch is full."""
+        game = TicTacToe()
+        game.add_observer(self.store)
+        game.update_players_stats()
+        self.assertIsNone(self.stored("Player 1"))
+        self.store.flush_interval = 0.0
+        game.update_players_stats()
+        self.assertEqual(self.stored("Player 1"), (0, 0, 2))
+
+    def test_flush_adds_to_stored_totals(self):
+        """Test that repeated flushes accumulate instead of overwriting the stored totals."""
+        self.store.record("Ada", won=1)
+        self.store.flush()
+        self.store.record("Ada", lost=1)
+        self.store.flush()
+        self.assertEqual(self.stored("Ada"), (1, 1, 2))
+
+    def test_load_into_player(self):
+        """Test that stored totals are restored onto a player."""
+        self.store.record("Ada", won=2, played=3)
+        player = Player("Ada", "x")
+        self.store.load_into(player)
+        self.assertEqual((player.win_count, player.lost_count, player.draw_count), (2, 0, 1))
+        self.assertIsNone(self.store.get("Grace"))
+
+    def test_negative_update(self):
+        """Ensure ValueError is raised for negative statistics updates."""
+        with self.assertRaises(ValueError):
+            self.store.record("Ada", won=-1)
+
+    def test_unnamed_player(self):
+        """Ensure ValueError is raised for a player without a name rather than storing a NULL key."""
+        with self.assertRaises(ValueError):
+            self.store.record(None, won=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import filecmp
+import os
+import tempfile
+import unittest
+from games.Game import TicTacToe, ConnectFour
+from games.tablebase import DRAW, LOSS, WIN, Result, Rules, Tablebase, generate
+
+
+class TestTablebase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.tic_tac_toe_path = os.path.join(cls.directory, "tictactoe.tb")
+        cls.connect_path = os.path.join(cls.directory, "connect.tb")
+        cls.tic_tac_toe_count = generate(cls.tic_tac_toe_path, Rules(False, 3, 3, 3))
+        generate(cls.connect_path, Rules(True, 4, 4, 3))
+        cls.tic_tac_toe = Tablebase(cls.tic_tac_toe_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tic_tac_toe.close()
+        for name in os.listdir(cls.directory):
+            os.remove(os.path.join(cls.directory, name))
+        os.rmdir(cls.directory)
+
+    def test_tic_tac_toe_is_a_draw(self):
+        """Test that the empty board is a draw played to the last square and every position is stored."""
+        self.assertEqual(self.tic_tac_toe.lookup(0, 0), Result(DRAW, 9))
+        self.assertEqual(len(self.tic_tac_toe), self.tic_tac_toe_count)
+
+    def test_lookup_game(self):
+        """Test the results of a game position for the player to move, and the move that wins fastest."""
+        game = TicTacToe()
+        for row, col, marker in ((0, 0, "x"), (1, 1, "o"), (2, 2, "x"), (0, 2, "o")):
+            game.make_move(row, col, marker)
+        self.assertEqual(self.tic_tac_toe.lookup_game(game), Result(WIN, 3))
+        game.make_move(2, 0, "x")
+        self.assertEqual(self.tic_tac_toe.lookup_game(game), Result(LOSS, 2))
+        game.make_move(1, 0, "o")
+        self.assertEqual(self.tic_tac_toe.best_move(game), (2, 1))
+
+    def test_connect_four_with_gravity(self):
+        """Test that the first player wins the 4x4 board with three in a row on the ninth move."""
+        tablebase = Tablebase(self.connect_path)
+        try:
+            self.assertEqual(tablebase.lookup(0, 0), Result(WIN, 9))
+            game = ConnectFour(3, 4, 4)
+            self.assertIn(tablebase.best_move(game), (1, 2))
+        finally:
+            tablebase.close()
+
+    def test_file_is_compact(self):
+        """Test that positions take a few bytes each and that a position that cannot be reached is not found."""
+        self.assertLess(os.path.getsize(self.tic_tac_toe_path) / self.tic_tac_toe_count, 4)
+        self.assertIsNone(self.tic_tac_toe.lookup(0b111, 0b111 << 4))
+
+    def test_parallel_generation(self):
+        """Test that spreading the layers over worker processes writes the same file."""
+        path = os.path.join(self.directory, "parallel.tb")
+        generate(path, Rules(True, 4, 4, 3), workers=2, chunk_size=512)
+        self.assertTrue(filecmp.cmp(path, self.connect_path, shallow=False))
+
+    def test_board_too_large(self):
+        with self.assertRaises(ValueError):
+            generate(os.path.join(self.directory, "large.tb"), Rules(True, 6, 7, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
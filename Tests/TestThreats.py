@@ -0,0 +1,81 @@
+import unittest
+from core.board import Board
+from core.threats import ThreatIndex
+from games.Game import TicTacToe
+
+
+class TestThreats(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Board(3, 3)
+        self.threats = ThreatIndex(3, 3, 3)
+
+    def place(self, squares):
+        for row, column, marker in squares:
+            self.board.add_to_square(row, column, marker)
+            self.threats.play(row, column, marker)
+
+    def test_wins_and_blocks(self):
+        """Test the squares that complete a line for each player, and that a line with both markers is closed."""
+        self.place([(0, 0, "o"), (0, 1, "o"), (1, 0, "x"), (1, 1, "x"), (2, 2, "o")])
+        self.assertEqual(self.threats.winning_squares("o"), {(0, 2)})
+        self.assertEqual(self.threats.blocking_squares("o"), {(1, 2)})
+        self.assertEqual(self.threats.winning_squares("x"), {(1, 2)})
+        self.assertFalse(self.threats.has_won("o"))
+        self.place([(0, 2, "o")])
+        self.assertTrue(self.threats.has_won("o"))
+
+    def test_forks(self):
+        """Test that a square on two lines with one marker and two blanks each is a fork."""
+        self.place([(0, 0, "o"), (2, 2, "o"), (1, 1, "x")])
+        self.assertEqual(self.threats.fork_squares("o"), {(0, 2), (2, 0)})
+        self.assertEqual(self.threats.fork_squares("x"), set())
+
+    def test_undo_matches_load(self):
+        """Test that undoing moves on a larger board leaves the same counts as loading the board."""
+        board = Board(7, 7)
+        threats = ThreatIndex(7, 7, 5)
+        moves = [(3, 3, "x"), (3, 4, "o"), (2, 2, "x"), (4, 4, "o"), (1, 1, "x"), (2, 3, "o")]
+        for row, column, marker in moves:
+            board.add_to_square(row, column, marker)
+            threats.play(row, column, marker)
+        loaded = ThreatIndex(7, 7, 5)
+        loaded.load(board)
+        self.assertEqual((threats.counts, threats.open), (loaded.counts, loaded.open))
+        for row, column, marker in reversed(moves[3:]):
+            board.update_square(row, column, 0)
+            threats.undo(row, column, marker)
+        loaded.load(board)
+        self.assertEqual((threats.counts, threats.open, threats.empty_squares),
+                         (loaded.counts, loaded.open, loaded.empty_squares))
+        self.assertEqual(threats.score("x", [0, 1, 8, 64, 512, 4096]),
+                         sum(len(threats.open_windows("x", count)) * 8 ** (count - 1) for count in range(1, 5)) -
+                         sum(len(threats.open_windows("o", count)) * 8 ** (count - 1) for count in range(1, 5)))
+
+    def test_follow_a_game(self):
+        """Test that following a game's moves through take backs and a new game matches loading its board."""
+        game = TicTacToe()
+        loaded = ThreatIndex(3, 3, 3)
+        for moves in ([(1, 1, "x"), (0, 0, "o"), (2, 2, "x")], [], [(1, 1, "o"), (0, 0, "x")]):
+            for row, column, marker in moves:
+                game.make_move(row, column, marker)
+            self.threats.follow(game.board, game.move_list)
+            loaded.load(game.board)
+            self.assertEqual((self.threats.counts, self.threats.open), (loaded.counts, loaded.open))
+            game.undo_move()
+            self.threats.follow(game.board, game.move_list)
+            loaded.load(game.board)
+            self.assertEqual((self.threats.counts, self.threats.open), (loaded.counts, loaded.open))
+            game.reset_game_state()
+
+    def test_ai_player_wins_before_blocking(self):
+        """Test that the classic computer player takes its win over a block using the index."""
+        game = TicTacToe()
+        game.create_ai_player(name="CPU", difficulty=False)
+        for row, column, marker in [(1, 0, "x"), (0, 0, "o"), (1, 1, "x"), (0, 1, "o"), (2, 2, "x")]:
+            game.make_move(row, column, marker)
+        self.assertEqual(game.players[1].win_or_block(game.board), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
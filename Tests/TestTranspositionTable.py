@@ -0,0 +1,125 @@
+import unittest
+from multiprocessing import Process
+from games.Game import TicTacToe
+from games.search import AnytimeSearch
+from games.transposition import COMPLETE_DEPTH, EXACT, LOWER, MAX_DEPTH, UPPER, TranspositionTable, ZobristKeys
+
+
+def store_from_worker(name: str, key: int) -> None:
+    """Runs in another process and writes an entry into the shared table."""
+    table = TranspositionTable.attach(name)
+    table.store(key, 4, -12, LOWER, 7)
+    table.close()
+
+
+def expected_entry(key: int) -> tuple[int, int, int, int]:
+    """The entry every writer stores for the key in the contention test."""
+    return key % 300, key % 2000 - 1000, key % 65535, EXACT
+
+
+def store_many(name: str, keys: range, rounds: int) -> None:
+    """Runs in another process and keeps overwriting the entries of the keys, which share buckets."""
+    table = TranspositionTable.attach(name)
+    for _ in range(rounds):
+        for key in keys:
+            depth, value, move, flag = expected_entry(key)
+            table.store(key, depth, value, flag, move)
+            table.new_search()
+    table.close()
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = TranspositionTable(buckets=16)
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_store_and_probe(self):
+        """Test that an entry is read back as stored and other keys miss."""
+        self.table.store(12345, 3, -250, UPPER, 4)
+        entry = self.table.probe(12345)
+        self.assertEqual((entry.depth, entry.value, entry.move, entry.flag), (3, -250, 4, UPPER))
+        self.assertIsNone(self.table.probe(12345 + 16))
+        self.assertEqual(self.table.hit_rate(), 0.5)
+
+    def test_replacement_keeps_deeper_entry(self):
+        """Test that a shallower result of another position in the bucket does not replace a deeper one."""
+        self.table.store(1, 6, 10, EXACT, 0)
+        self.table.store(17, 2, 20, EXACT, 1)
+        self.table.store(33, 1, 30, EXACT, 2)
+        self.assertEqual(self.table.probe(1).value, 10)
+        self.assertIsNone(self.table.probe(17))
+        self.assertEqual(self.table.probe(33).value, 30)
+        self.table.new_search()
+        self.table.store(49, 1, 40, EXACT, 3)
+        self.assertEqual(self.table.probe(49).value, 40)
+
+    def test_torn_entry_is_a_miss(self):
+        """Test that an entry whose key and data do not belong together is ignored."""
+        self.table.store(5, 3, 1, EXACT, 0)
+        self.table._words[5 * 4 + 1] ^= 1 << 16
+        self.assertIsNone(self.table.probe(5))
+
+    def test_shared_between_processes(self):
+        """Test that an entry written by another process is visible without any copying."""
+        worker = Process(target=store_from_worker, args=(self.table.name, 99))
+        worker.start()
+        worker.join()
+        self.assertEqual(tuple(self.table.probe(99)), (4, -12, 7, LOWER))
+
+    def test_deep_entries(self):
+        """Test that depths past a byte are kept, searches complete to the end stay apart from deep ones, and
+        depths beyond the field are stored as the deepest it holds."""
+        self.table.store(1, 300, 0, EXACT, 400)
+        self.table.store(2, COMPLETE_DEPTH, 0, EXACT, 0)
+        self.table.store(3, COMPLETE_DEPTH + 5, 0, EXACT, 0)
+        self.assertEqual((self.table.probe(1).depth, self.table.probe(1).move), (300, 400))
+        self.assertEqual(self.table.probe(2).depth, COMPLETE_DEPTH)
+        self.assertEqual(self.table.probe(3).depth, MAX_DEPTH)
+
+    def test_concurrent_writers(self):
+        """Test that entries read while several processes overwrite the same buckets are either misses or exactly
+        as one of them stored, never a mix of two writes."""
+        keys = range(1, 200)
+        workers = [Process(target=store_many, args=(self.table.name, keys, 200)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        hits = 0
+        while any(worker.is_alive() for worker in workers):
+            for key in keys:
+                if (entry := self.table.probe(key)) is not None:
+                    hits += 1
+                    self.assertEqual(tuple(entry), expected_entry(key))
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        self.assertGreater(hits, 0)
+
+    def test_search_with_table(self):
+        """Test that the search gives the same result with a table while visiting fewer positions."""
+        searches = []
+        for table in (None, self.table):
+            game = TicTacToe()
+            game.apply_move((1, 1), "x")
+            search = AnytimeSearch(game, "o", table=table)
+            search.run(10.0)
+            searches.append(search)
+        self.assertTrue(searches[1].solved)
+        self.assertEqual(searches[1].best_score, searches[0].best_score)
+        self.assertLess(searches[1].nodes, searches[0].nodes)
+
+    def test_zobrist_keys(self):
+        """Test that the position key matches the key built move by move."""
+        game = TicTacToe()
+        keys = ZobristKeys(3, 3, ("x", "o"))
+        game.make_move(0, 2, "x")
+        game.make_move(1, 1, "o")
+        expected = keys.turn("x") ^ keys.square(0, 2, "x") ^ keys.square(1, 1, "o")
+        self.assertEqual(keys.position(game.board, "x"), expected)
+        self.assertEqual(ZobristKeys(3, 3, ("o", "x")).position(game.board, "x"), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import sys
+import tracemalloc
+from Tests.game_tests import play_game
+from Tests.profile_simulation import MATCHES, create_game
+
+
+def count_built_lines(board) -> list[int]:
+    """Wraps get_columns and get_diagonals of the board to count the lists they build, the outer list and each
+    line. Lines returned from the board's buffers, as in simulation mode, are filled in place and count nothing.
+    Returns the one item list holding the count."""
+    built = [0]
+
+    def buffers():
+        yield board._column_buffer
+        yield from (lines for _, lines in (board._diagonal_buffers or {}).values())
+
+    for name in ("get_columns", "get_diagonals"):
+        def counted(*args, method=getattr(board, name)):
+            lines = method(*args)
+            if not any(lines is buffer for buffer in buffers()):
+                built[0] += 1 + len(lines)
+            return lines
+        setattr(board, name, counted)
+    return built
+
+
+def measure_match(match: str, simulation: bool, number_of_games: int, warm_up: int) -> dict[str, float]:
+    """Plays the games of one match with the same game object after the warm up games have filled the caches and
+    buffers. Returns the mean lists the win checks build per game, which simulation mode removes, and the mean
+    peak bytes a game allocates above what was in use when it started, traced in a second run of the games."""
+    random.seed(0)
+    game = create_game(*MATCHES[match], simulation=simulation)
+    for _ in range(warm_up):
+        play_game(game)
+
+    built = count_built_lines(game.board)
+    for _ in range(number_of_games):
+        play_game(game)
+    del game.board.get_columns, game.board.get_diagonals
+
+    tracemalloc.start()
+    transient = 0
+    for _ in range(number_of_games):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        play_game(game)
+        transient += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return {"lists_built": built[0] / number_of_games, "peak_bytes": transient / number_of_games}
+
+
+def run_benchmark(number_of_games: int, warm_up: int) -> None:
+    # Memory still held after a game is not shown: it was already close to nothing without simulation mode, as
+    # the board and move list are reset in place, so it does not tell the modes apart
+    print(f"{number_of_games} games per match after {warm_up} warm up games, per game")
+    print(f"{'Match':<20}{'Mode':<12}{'lists built':>12}{'peak bytes':>12}")
+    for match in MATCHES:
+        for mode, simulation in (("default", False), ("simulation", True)):
+            result = measure_match(match, simulation, number_of_games, warm_up)
+            print(f"{match:<20}{mode:<12}{result['lists_built']:>12.1f}{result['peak_bytes']:>12.0f}")
+
+
+def main(arguments: list[str]) -> None:
+    parser = argparse.ArgumentParser(description="Count the lists built and trace the memory allocated by each simulated game.")
+    parser.add_argument("--games", type=int, default=200, help="Measured games per match.")
+    parser.add_argument("--warm-up", type=int, default=20, help="Games played before tracing starts.")
+    options = parser.parse_args(arguments)
+    run_benchmark(options.games, options.warm_up)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import platform
+import sys
+from statistics import median
+from timeit import Timer
+from typing import Callable
+from core.board import Board, WinChecker
+from games.Game import TicTacToe, ConnectFour
+import utils.display as display
+
+BASELINE_PATH = "benchmark_baseline.json"
+CONNECT_FOUR_MOVES = (3, 3, 4, 2, 5, 6, 0, 1, 3, 4, 2, 2)
+# Positions from the opening to the end of a game with the computer, "o", to move: free choices, wins and blocks
+AI_POSITIONS = (
+    ((1, 1),),
+    ((0, 0),),
+    ((1, 1), (0, 0), (2, 2)),
+    ((0, 0), (1, 1), (0, 1)),
+    ((0, 0), (1, 1), (2, 2), (0, 2), (2, 0)),
+    ((1, 1), (0, 0), (2, 2), (0, 2), (0, 1), (2, 1), (1, 2)),
+)
+
+
+def _connect_four() -> ConnectFour:
+    game = ConnectFour()
+    for index, col in enumerate(CONNECT_FOUR_MOVES):
+        game.make_move(col, "ry"[index % 2])
+    return game
+
+
+def _tic_tac_toe(difficulty=None, moves=((1, 1),)) -> TicTacToe:
+    """A game in which the human, moving first, and the computer have played the moves and the computer is to
+    move. By default the human has taken the center."""
+    game = TicTacToe()
+    game.create_ai_player(name="CPU", difficulty=difficulty)
+    for index, (row, col) in enumerate(moves):
+        game.make_move(row, col, "xo"[index % 2])
+    return game
+
+
+def bench_add_to_square() -> Callable:
+    board = Board(6, 7)
+
+    def run():
+        board.add_to_square(2, 3, "r")
+        board.update_square(2, 3, 0)
+    return run
+
+
+def bench_get_columns() -> Callable:
+    return _connect_four().board.get_columns
+
+
+def bench_get_diagonals() -> Callable:
+    board = _connect_four().board
+    return lambda: (board.get_diagonals(4, "right"), board.get_diagonals(4, "left"))
+
+
+def bench_check_for_winner_3x3() -> Callable:
+    game = _tic_tac_toe()
+    game.make_move(0, 0, "o")
+    return WinChecker(game.board).check_for_winner
+
+
+def bench_check_for_winner_6x7() -> Callable:
+    return WinChecker(_connect_four().board, 4).check_for_winner
+
+
+def bench_ai_move(difficulty) -> Callable[[], Callable]:
+    """Times one move in each of AI_POSITIONS, so a call covers the whole game rather than one easy position."""
+    def setup():
+        games = [_tic_tac_toe(difficulty, moves) for moves in AI_POSITIONS]
+
+        def run():
+            for game in games:
+                game.players[1].move(game.board)
+        return run
+    return setup
+
+
+def bench_connect_four_make_move() -> Callable:
+    game = _connect_four()
+
+    def run():
+        game.make_move(6, "r")
+        game.undo_move()
+    return run
+
+
+def bench_create_board(cached: bool) -> Callable[[], Callable]:
+    """Times drawing the board from the cached rows, or with the caches emptied first as for a board that has not
+    been drawn before."""
+    def setup():
+        squares = display.board_translator(_connect_four().board.get_board())
+        line = "* " * 44 + "*"
+        if cached:
+            return lambda: display.create_board(squares, line)
+
+        def run():
+            display.render_row.cache_clear()
+            display.render_separator.cache_clear()
+            display.create_board(squares, line)
+        return run
+    return setup
+
+
+# Benchmark name -> function returning the callable to time, so that setup is not part of the measurement
+BENCHMARKS = {
+    "Board.add_to_square": bench_add_to_square,
+    "Board.get_columns 6x7": bench_get_columns,
+    "Board.get_diagonals 6x7": bench_get_diagonals,
+    "WinChecker.check_for_winner 3x3": bench_check_for_winner_3x3,
+    "WinChecker.check_for_winner 6x7": bench_check_for_winner_6x7,
+    f"AIPlayer.move easy x{len(AI_POSITIONS)}": bench_ai_move(None),
+    f"AIPlayer.move intermediate x{len(AI_POSITIONS)}": bench_ai_move(False),
+    f"AIPlayer.move hard x{len(AI_POSITIONS)}": bench_ai_move(True),
+    "ConnectFour.make_move": bench_connect_four_make_move,
+    "display.create_board 6x7": bench_create_board(False),
+    "display.create_board 6x7 cached": bench_create_board(True),
+}
+
+
+def measure(function: Callable, repeats: int) -> dict[str, float]:
+    """Times the function in repeats batches of enough calls to take about 0.2 seconds each. Returns the median
+    time per call in microseconds and the noise, the spread of the batches relative to the median."""
+    timer = Timer(function)
+    number, _ = timer.autorange()
+    times = [total / number * 1e6 for total in timer.repeat(repeats, number)]
+    middle = median(times)
+    return {"median_us": middle, "noise": (max(times) - min(times)) / middle, "calls": number * repeats}
+
+
+def run_benchmarks(names: list[str], repeats: int) -> dict[str, dict[str, float]]:
+    return {name: measure(BENCHMARKS[name](), repeats) for name in names}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """Prints each result beside its baseline. A change only counts when it is larger than the threshold and the
+    noise of both runs. Returns the number of benchmarks that got slower."""
+    regressions = 0
+    print(f"{'Benchmark':<34}{'baseline us':>12}{'current us':>12}{'change':>9}{'noise':>8}  Result")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<34}{'':>12}{result['median_us']:>12.2f}{'':>9}{result['noise']:>8.1%}  new")
+            continue
+        before = baseline[name]
+        change = (result["median_us"] - before["median_us"]) / before["median_us"]
+        margin = max(threshold, result["noise"], before["noise"])
+        if change > margin:
+            verdict = "slower"
+            regressions += 1
+        elif change < -margin:
+            verdict = "faster"
+        else:
+            verdict = "within noise"
+        print(f"{name:<34}{before['median_us']:>12.2f}{result['median_us']:>12.2f}{change:>9.1%}"
+              f"{margin:>8.1%}  {verdict}")
+    return regressions
+
+
+def main(arguments: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Time the core game functions and compare with a baseline.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON file of earlier results.")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--threshold", type=float, default=0.05, help="Smallest change reported, 0.05 is 5%%.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text.")
+    options = parser.parse_args(arguments)
+
+    names = [name for name in BENCHMARKS if options.filter.lower() in name.lower()]
+    results = run_benchmarks(names, options.repeats)
+    if options.save or not os.path.exists(options.baseline):
+        with open(options.baseline, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                      file, indent=2)
+        for name, result in results.items():
+            print(f"{name:<34}{result['median_us']:>12.2f} us  noise {result['noise']:.1%}")
+        print(f"Saved baseline to {options.baseline}")
+        return 0
+    with open(options.baseline) as file:
+        baseline = json.load(file)["results"]
+    return 1 if compare(results, baseline, options.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
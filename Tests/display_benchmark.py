@@ -0,0 +1,65 @@
+import io
+import sys
+from time import perf_counter
+from games.Game import TicTacToe, ConnectFour
+import utils.display as display
+
+
+class CountingRaw(io.RawIOBase):
+    """Raw output stream that discards its data and counts the write calls, which are the write system calls a
+    terminal would receive."""
+
+    def __init__(self):
+        self.writes = 0
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.writes += 1
+        self.bytes_written += len(data)
+        return len(data)
+
+
+def measure(game_board, line: str, typewriter: bool, renders: int) -> tuple[float, float]:
+    """Renders a board repeatedly through print_board into a line buffered stream, like an interactive terminal.
+    Returns the average wall time in milliseconds and the average number of write calls per render."""
+    raw = CountingRaw()
+    stream = io.TextIOWrapper(io.BufferedWriter(raw), encoding="utf-8", line_buffering=True)
+    original_stdout, original_effect = sys.stdout, display.TYPEWRITER_EFFECT
+    sys.stdout, display.TYPEWRITER_EFFECT = stream, typewriter
+    try:
+        start = perf_counter()
+        for _ in range(renders):
+            if typewriter:
+                # The typewriter path with no delay, which is how print_board ran before the buffered path
+                display.delay_effect([display.create_board(display.board_translator(game_board), line)], 0, False)
+            else:
+                display.print_board(game_board, line)
+        stream.flush()
+        elapsed = perf_counter() - start
+    finally:
+        sys.stdout, display.TYPEWRITER_EFFECT = original_stdout, original_effect
+    return elapsed / renders * 1000, raw.writes / renders
+
+
+def run_benchmark(renders: int = 200) -> None:
+    tic_tac_toe = TicTacToe()
+    for row, col, marker in ((1, 1, "x"), (0, 0, "o"), (2, 1, "x")):
+        tic_tac_toe.make_move(row, col, marker)
+    connect_four = ConnectFour()
+    for index, col in enumerate((3, 3, 4, 2, 5, 6, 0, 1, 3)):
+        connect_four.make_move(col, "ry"[index % 2])
+
+    boards = {"3x3": (tic_tac_toe.board.get_board(), "* " * 18 + "*"),
+              "6x7": (connect_four.board.get_board(), "* " * 44 + "*")}
+    print(f"{'Board':<8}{'Output path':<14}{'ms/render':>12}{'writes/render':>16}")
+    for name, (game_board, line) in boards.items():
+        for label, typewriter in (("typewriter", True), ("buffered", False)):
+            milliseconds, writes = measure(game_board, line, typewriter, renders)
+            print(f"{name:<8}{label:<14}{milliseconds:>12.3f}{writes:>16.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
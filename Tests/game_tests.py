@@ -1,4 +1,7 @@
 from games.Game import TicTacToe
+from games.records import recorder_from_environment
+from core.stats_store import stats_store_from_environment
+from utils.instrument import instrumentation_from_environment
 from core.board import *
 from core.player import *
 from random import randint
@@ -24,13 +27,13 @@ def play_game(game_instance) -> None:
             player = game_instance.players[(round_count % 2) - 1]
 
         # Handle moves based on player type
-        if isinstance(player, Game.TicTacToePlayer): 
+        if isinstance(player, game_instance.TicTacToePlayer):
             while True:
                 # Simulates blind human play (the same as AI easy mode)
                 move = randint(0, 2), randint(0, 2), player.marker
                 if game_instance.make_move(*move):
                     break
-        elif isinstance(player, Game.AIPlayer):
+        elif isinstance(player, game_instance.AIPlayer):
             # Moves are validated in the AIPlayer Class itself
             row, col = player.move(game_instance.board)
             game_instance.make_move(row, col, player.marker)
@@ -46,11 +49,12 @@ def play_game(game_instance) -> None:
     return
 
 
-def test_games(number_of_games: int) -> None:
+def test_games(game_instance, number_of_games: int) -> None:
     """
     Runs test games between a human player and AI at varying difficulty levels and modes.
 
     Parameters:
+        game_instance (Game): The game instance the AI players are created on and the games are played with.
         number_of_games (int): The number of games to simulate per configuration.
         ai_levels (dict): A dictionary mapping AI difficulty names to internal difficulty values.
         test_modes (dict): A dictionary mapping test modes (offensive/defensive) to boolean values.
@@ -68,22 +72,24 @@ def test_games(number_of_games: int) -> None:
     for difficulty_level, difficulty_bool_value in ai_levels.items():
         print(f"Blind mode tests for Player 1 versus AI Player ({difficulty_level} Mode).")
         for mode_name, go_first in test_modes.items():
-            Game.create_ai_player(name=f"Computer ({difficulty_level} Mode - {mode_name})", difficulty=difficulty_bool_value)
+            game_instance.create_ai_player(name=f"Computer ({difficulty_level} Mode - {mode_name})",
+                                           difficulty=difficulty_bool_value)
             # go_first == True is set for human player to make the first move
             print(f"Player 1 moves first: {go_first}. Running {number_of_games} games.")
 
             for _ in range(number_of_games):
-                Game.go_first = go_first
-                play_game(Game)
+                game_instance.go_first = go_first
+                play_game(game_instance)
 
-            print(Game.print_stats())
+            print(game_instance.print_stats())
 
 
-def test_ai_games(number_of_games: int, ai_level1: any, ai_level2: any) -> None:
+def test_ai_games(game_instance, number_of_games: int, ai_level1: any, ai_level2: any) -> None:
     """
     Simulates AI-versus-AI games at specified difficulty levels.
 
     Parameters:
+        game_instance (Game): The game instance the AI players are added to and the games are played with.
         number_of_games (int): The number of games to simulate per configuration.
         ai_level1 (any): Difficulty level for the first AI player.
         ai_level2 (any): Difficulty level for the second AI player.
@@ -107,35 +113,51 @@ def test_ai_games(number_of_games: int, ai_level1: any, ai_level2: any) -> None:
         else:
             print(f"AI ({ai_level_map[ai_level1]}) moves first.")
 
-        Game.add_ai_players_for_testing(ai_level1, ai_level2)
+        game_instance.add_ai_players_for_testing(ai_level1, ai_level2)
 
         for _ in range(number_of_games):
-            Game.go_first = bool(first_player)
-            play_game(Game)
+            game_instance.go_first = bool(first_player)
+            play_game(game_instance)
 
-        print(Game.print_stats())
+        print(game_instance.print_stats())
 
-# Instantiate Game Object for Testing
-Game = TicTacToe()
-number_of_games = 10
+if __name__ == "__main__":
+    # Instantiate Game Object for Testing, reused for every simulated game so its lines can be refilled in place
+    Game = TicTacToe()
+    Game.enable_simulation_mode()
+    number_of_games = 10
 
-# Run simulated human vs AI tests
-test_games(number_of_games)
+    # Record every simulated game when GAME_RECORDS names a record file, keep player totals in the database named
+    # by PLAYER_STATS and count the hot path calls of each game when INSTRUMENT is set
+    instrumentation = instrumentation_from_environment()
+    observers = [observer for observer in
+                 (recorder_from_environment(), stats_store_from_environment(), instrumentation)
+                 if observer is not None]
+    for observer in observers:
+        Game.add_observer(observer)
 
-# Run AI vs AI tests
-test_ai_games(number_of_games, None, True)
-test_ai_games(number_of_games, False, True)
-test_ai_games(number_of_games, None, None)
-test_ai_games(number_of_games, False, False)
+    # Run simulated human vs AI tests
+    test_games(Game, number_of_games)
 
-# Additional hard-mode-only AI vs AI tests
+    # Run AI vs AI tests
+    test_ai_games(Game, number_of_games, None, True)
+    test_ai_games(Game, number_of_games, False, True)
+    test_ai_games(Game, number_of_games, None, None)
+    test_ai_games(Game, number_of_games, False, False)
 
-Game.add_two_hard_move_ai_players_for_testing()
-print(f"AI (Hard Mode) versus AI (Hard Mode). Running {number_of_games} games.")
+    # Additional hard-mode-only AI vs AI tests
 
-for _ in range(number_of_games):
-    play_game(Game)
+    Game.add_two_hard_move_ai_players_for_testing()
+    print(f"AI (Hard Mode) versus AI (Hard Mode). Running {number_of_games} games.")
 
-print(Game.print_stats())
+    for _ in range(number_of_games):
+        play_game(Game)
 
-exit()
\ No newline at end of file
+    print(Game.print_stats())
+
+    if instrumentation is not None:
+        print(instrumentation.report())
+
+    for observer in observers:
+        observer.close()
+    exit()
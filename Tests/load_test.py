@@ -0,0 +1,132 @@
+import json
+from argparse import ArgumentParser
+from collections import defaultdict
+from math import ceil
+from random import choice
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Optional
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+
+class FlaskClientTransport:
+    """Sends requests to the Flask app in this process through its test client. No server is needed."""
+
+    def __init__(self):
+        from app import app
+        self.client = app.test_client()
+
+    def post(self, path: str, payload: dict) -> tuple[int, dict]:
+        response = self.client.post(path, json=payload)
+        return response.status_code, response.get_json(silent=True) or {}
+
+
+class HttpTransport:
+    """Sends requests to a running server, such as one started locally with 'python app.py'."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+
+    def post(self, path: str, payload: dict) -> tuple[int, dict]:
+        request = Request(self.url + path, data=json.dumps(payload).encode(),
+                          headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            with urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read() or b"{}")
+        except HTTPError as error:
+            return error.code, {}
+
+
+class LoadStats:
+    """Collects the latency of every request and the number of failed requests per endpoint."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.games_played = 0
+        self._lock = Lock()
+
+    def record(self, endpoint: str, seconds: float, failed: bool) -> None:
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            if failed:
+                self.errors[endpoint] += 1
+
+    def game_finished(self) -> None:
+        with self._lock:
+            self.games_played += 1
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Returns the nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[max(0, ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def timed_post(transport, stats: LoadStats, path: str, payload: dict) -> Optional[dict]:
+    """Sends one request and records its latency. Returns the json body, or None if the request failed."""
+    start = perf_counter()
+    try:
+        status, body = transport.post(path, payload)
+        failed = status != 200 or body.get("status") == "error"
+    except Exception:
+        body, failed = None, True
+    stats.record(path, perf_counter() - start, failed)
+    return None if failed else body
+
+
+def play_client(transport, stats: LoadStats, games: int, difficulty: str) -> None:
+    """Simulates one browser playing a number of complete single player games against the AI."""
+    for _ in range(games):
+        body = timed_post(transport, stats, "/start_game",
+                          {"gameType": "single", "playerName": "Load", "difficulty": difficulty})
+        if body is None:
+            continue
+        game_id = body["gameId"]
+        board = [""] * 9
+        while True:
+            free = [index for index, square in enumerate(board) if not square]
+            if not free:
+                break
+            row, col = divmod(choice(free), 3)
+            body = timed_post(transport, stats, "/make_move", {"gameId": game_id, "row": row, "col": col})
+            if body is None:
+                break
+            board = body.get("board", board)
+            if body["status"] in ("winner", "draw"):
+                stats.game_finished()
+                break
+
+
+def run_load_test(clients: int, games: int, difficulty: str = "hard", url: Optional[str] = None) -> None:
+    """Runs the simulated clients concurrently and prints throughput, latency percentiles and error rates."""
+    transports = [HttpTransport(url) if url else FlaskClientTransport() for _ in range(clients)]
+    stats = LoadStats()
+    threads = [Thread(target=play_client, args=(transport, stats, games, difficulty)) for transport in transports]
+
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - start
+
+    print(f"{clients} clients played {stats.games_played} games ({difficulty} mode) in {elapsed:.2f} seconds "
+          f"against {url or 'the in-process test client'}.")
+    print(f"{'Endpoint':<14}{'Requests':>10}{'Req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'Errors':>10}")
+    for endpoint, latencies in sorted(stats.latencies.items()):
+        error_rate = stats.errors[endpoint] / len(latencies)
+        print(f"{endpoint:<14}{len(latencies):>10}{len(latencies) / elapsed:>10.1f}"
+              f"{percentile(latencies, 50) * 1000:>10.2f}{percentile(latencies, 95) * 1000:>10.2f}"
+              f"{percentile(latencies, 99) * 1000:>10.2f}{error_rate:>10.2%}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Load test the Tic Tac Toe web game API with simulated clients.")
+    parser.add_argument("--clients", type=int, default=10, help="number of concurrent simulated clients")
+    parser.add_argument("--games", type=int, default=20, help="complete games played by each client")
+    parser.add_argument("--difficulty", choices=["easy", "intermediate", "hard"], default="hard")
+    parser.add_argument("--url", help="base url of a running server; defaults to the in-process test client")
+    arguments = parser.parse_args()
+    run_load_test(arguments.clients, arguments.games, arguments.difficulty, arguments.url)
@@ -0,0 +1,33 @@
+import os
+import sys
+from games.Game import TicTacToe, ConnectFour
+from games.mcts import ROLLOUT_POLICIES, shutdown_pools
+
+# Board name -> function creating an empty game of that size
+BOARDS = {
+    "3x3 connect 3": lambda: TicTacToe(),
+    "5x5 connect 4": lambda: TicTacToe(rows=5, columns=5, connect_value=4),
+    "6x7 connect 4": lambda: ConnectFour(),
+}
+
+
+def run_benchmark(budget: float = 1.0, workers: int = os.cpu_count() or 1) -> None:
+    """Prints the MCTS playouts per second from the empty board for each board size and rollout policy, searching
+    in a single process and root parallel on the given number of worker processes."""
+    print(f"{'Board':<16}{'Rollout':<14}{'Workers':>8}{'playouts':>10}{'playouts/s':>12}  Move")
+    for name, create_game in BOARDS.items():
+        for rollout in ROLLOUT_POLICIES:
+            for worker_count in sorted({1, workers}):
+                game = create_game()
+                game.create_mcts_player(rollout=rollout, workers=worker_count)
+                player = game.players[1]
+                if worker_count > 1:
+                    player.search(iterations=worker_count)  # Start the worker processes before timing
+                move = player.think(budget)
+                print(f"{name:<16}{rollout:<14}{worker_count:>8}{player.playouts:>10}"
+                      f"{player.playouts_per_second:>12.0f}  {move}")
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    run_benchmark(*(convert(argument) for convert, argument in zip((float, int), sys.argv[1:])))
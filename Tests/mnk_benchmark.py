@@ -0,0 +1,67 @@
+import sys
+from random import choice, seed
+from time import perf_counter
+from games.Game import TicTacToe
+from games.mnk import MNKPlayer
+
+# Board name -> rows, columns and number in a row to win
+BOARDS = {
+    "5x5 connect 4": (5, 5, 4),
+    "7x7 connect 5": (7, 7, 5),
+    "15x15 connect 5": (15, 15, 5),
+}
+
+
+def play(game, players: dict) -> tuple[str, list[float], int]:
+    """Plays a game from the empty board, x first, with the player for each marker, or a random move where the
+    player is None. Returns the winning marker or 'draw', the seconds of each search move and the nodes searched."""
+    times = []
+    nodes = 0
+    marker, other = "x", "o"
+    while moves := game.legal_moves():
+        player = players[marker]
+        if player is None:
+            move = choice(moves)
+        else:
+            start = perf_counter()
+            move = player.move()
+            times.append(perf_counter() - start)
+            nodes += player.nodes
+        game.apply_move(move, marker)
+        if game.last_move_won():
+            return marker, times, nodes
+        marker, other = other, marker
+    return "draw", times, nodes
+
+
+def run_benchmark(depth: int = 4, random_games: int = 10) -> None:
+    """Prints the speed and results of the threat search player on each board: a game against itself and a number
+    of games as o against random moves."""
+    print(f"{'Board':<18}{'Game':<14}{'Result':>8}{'moves':>7}{'ms/move':>9}{'max ms':>8}{'nodes/s':>10}")
+    for name, (rows, columns, win_value) in BOARDS.items():
+        seed(0)
+        game = TicTacToe(rows, columns, win_value)
+        game.players = (MNKPlayer("X", "x", game, depth), MNKPlayer("O", "o", game, depth))
+        matches = [("self play", {"x": game.players[0], "o": game.players[1]})] + \
+                  [("vs random", {"x": None, "o": game.players[1]})] * random_games
+        wins = 0
+        all_times, all_nodes = [], 0
+        for match, players in matches:
+            while game.undo_move():
+                pass
+            result, times, nodes = play(game, players)
+            if match == "self play":
+                print(f"{name:<18}{match:<14}{result:>8}{len(game.move_list):>7}{sum(times) / len(times) * 1000:>9.1f}"
+                      f"{max(times) * 1000:>8.1f}{nodes / sum(times):>10.0f}")
+            else:
+                wins += result == "o"
+                all_times.extend(times)
+                all_nodes += nodes
+        if random_games:
+            print(f"{name:<18}{'vs random':<14}{f'{wins}/{random_games}':>8}{'':>7}"
+                  f"{sum(all_times) / len(all_times) * 1000:>9.1f}{max(all_times) * 1000:>8.1f}"
+                  f"{all_nodes / sum(all_times):>10.0f}")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(argument) for argument in sys.argv[1:]))
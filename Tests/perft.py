@@ -0,0 +1,130 @@
+import argparse
+import sys
+from time import perf_counter
+from games.Game import TicTacToe, ConnectFour
+from games.tablebase import Geometry, Rules
+
+# Published counts of positions reached at each ply, to catch move generation or win check regressions
+KNOWN_POSITIONS = {
+    Rules(False, 3, 3, 3): [9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872],
+    Rules(True, 6, 7, 4): [7, 49, 343, 2401, 16807, 117649, 823536, 5673234],
+}
+
+
+class PerftCounts:
+    """Number of positions reached at each ply, and how many of them ended the game with a win or a draw."""
+
+    def __init__(self, depth: int):
+        self.positions = [0] * (depth + 1)
+        self.wins = [0] * (depth + 1)
+        self.draws = [0] * (depth + 1)
+
+    @property
+    def total(self) -> int:
+        return sum(self.positions)
+
+
+def perft_board(game, depth: int) -> PerftCounts:
+    """Counts positions with the game's own engine: legal_moves, apply_move, undo_move and last_move_won over the
+    list based Board."""
+    counts = PerftCounts(depth)
+    markers = [player.marker for player in game.players]
+
+    def visit(ply: int) -> None:
+        marker = markers[(ply - 1) % 2]
+        for move in game.legal_moves():
+            game.apply_move(move, marker)
+            counts.positions[ply] += 1
+            if game.last_move_won():
+                counts.wins[ply] += 1
+            elif not game.legal_moves():
+                counts.draws[ply] += 1
+            elif ply < depth:
+                visit(ply + 1)
+            game.undo_move()
+
+    visit(1)
+    return counts
+
+
+def perft_bitboard(rules: Rules, depth: int) -> PerftCounts:
+    """Counts positions on the bitboard layout of the solver and tablebase, with the stones of each player in an
+    integer."""
+    counts = PerftCounts(depth)
+    geometry = Geometry(rules)
+
+    def visit(mover: int, waiting: int, ply: int) -> None:
+        for move in geometry.moves(mover | waiting):
+            moved = mover | move
+            counts.positions[ply] += 1
+            if geometry.has_line(moved):
+                counts.wins[ply] += 1
+            elif moved | waiting == geometry.board_mask:
+                counts.draws[ply] += 1
+            elif ply < depth:
+                visit(waiting, moved, ply + 1)
+
+    visit(0, 0, 1)
+    return counts
+
+
+def create_game(rules: Rules):
+    if rules.gravity:
+        return ConnectFour(rules.connect_value, rules.rows, rules.columns)
+    return TicTacToe(rules.rows, rules.columns, rules.connect_value)
+
+
+BACKENDS = {
+    "board": lambda rules, depth: perft_board(create_game(rules), depth),
+    "bitboard": perft_bitboard,
+}
+
+
+def run_perft(rules: Rules, depth: int, backends: list[str]) -> bool:
+    """Prints the counts and speed of each backend. Returns False if a backend disagrees with the published
+    counts or with the other backends."""
+    known = KNOWN_POSITIONS.get(rules, [])
+    agreed = True
+    reference = None
+    for name in backends:
+        start = perf_counter()
+        counts = BACKENDS[name](rules, depth)
+        elapsed = perf_counter() - start
+        print(f"\n{name} backend")
+        print(f"{'Ply':>4}{'positions':>12}{'wins':>10}{'draws':>10}")
+        for ply in range(1, depth + 1):
+            mismatch = ply <= len(known) and counts.positions[ply] != known[ply - 1]
+            print(f"{ply:>4}{counts.positions[ply]:>12}{counts.wins[ply]:>10}{counts.draws[ply]:>10}"
+                  f"{'  expected ' + str(known[ply - 1]) if mismatch else ''}")
+            agreed = agreed and not mismatch
+        print(f"{counts.total} positions in {elapsed:.2f} s, {counts.total / elapsed:,.0f} positions/s")
+        results = (counts.positions, counts.wins, counts.draws)
+        if reference is not None and results != reference:
+            print(f"{name} does not agree with {backends[0]}")
+            agreed = False
+        reference = reference or results
+    return agreed
+
+
+def main(arguments: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Count every position reachable to a depth.")
+    parser.add_argument("--game", choices=("tictactoe", "connectfour"), default="tictactoe")
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--rows", type=int)
+    parser.add_argument("--columns", type=int)
+    parser.add_argument("--connect", type=int)
+    parser.add_argument("--backend", nargs="+", choices=tuple(BACKENDS), default=list(BACKENDS))
+    options = parser.parse_args(arguments)
+
+    gravity = options.game == "connectfour"
+    rows = options.rows or (6 if gravity else 3)
+    columns = options.columns or (7 if gravity else 3)
+    rules = Rules(gravity, rows, columns, options.connect or (4 if gravity else 3))
+    depth = min(options.depth or (6 if gravity else rows * columns), rows * columns)
+    print(f"{'Connect Four' if gravity else 'Tic Tac Toe'} {rows}x{columns}, {rules.connect_value} in a row, "
+          f"depth {depth}")
+    return 0 if run_perft(rules, depth, options.backend) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,130 @@
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from games.Game import TicTacToe
+from Tests.game_tests import play_game
+
+# Matches of the simulation harness: blind human against each AI level, then AI against AI
+MATCHES = {
+    "human-easy": ("human", None),
+    "human-intermediate": ("human", False),
+    "human-hard": ("human", True),
+    "easy-hard": (None, True),
+    "intermediate-hard": (False, True),
+    "hard-hard": (True, True),
+}
+
+
+def create_game(first, second, simulation: bool = True) -> TicTacToe:
+    """Returns a game set up for the match, in simulation mode unless simulation is False, as one game object
+    plays every game of the match."""
+    game = TicTacToe()
+    if simulation:
+        game.enable_simulation_mode()
+    if first == "human":
+        game.create_ai_player(name="CPU", difficulty=second)
+    elif first is True and second is True:
+        game.add_two_hard_move_ai_players_for_testing()
+    else:
+        game.add_ai_players_for_testing(first, second)
+    return game
+
+
+def profile_match(match: str, number_of_games: int, seed: int, directory: str) -> str:
+    """Runs in a worker process: plays the games of one match under cProfile and writes the stats to a file in
+    the directory. Returns the path of the file."""
+    random.seed(seed)
+    game = create_game(*MATCHES[match])
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for _ in range(number_of_games):
+        play_game(game)  # Resetting the game after each one alternates who moves first
+    profiler.disable()
+    path = os.path.join(directory, f"{match}-{seed}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def label(function: tuple) -> str:
+    """Returns a short name for a function key of the profile stats: module file, line and function name."""
+    filename, line, name = function
+    if filename == "~":
+        return name  # Built in functions
+    if filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    else:
+        filename = os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+    return f"{filename}:{line}:{name}"
+
+
+def collapsed_stacks(stats: pstats.Stats, min_fraction: float = 0.0005, max_depth: int = 64) -> dict[str, int]:
+    """Rebuilds call stacks from the caller and callee edges of the profile for a flame graph. cProfile only keeps
+    one level of callers, so the time of a function is shared between its call paths in proportion to the
+    cumulative time of each caller edge. Returns the microseconds of self time for each stack, keyed by the
+    function names joined with semicolons."""
+    functions = stats.stats  # function -> (primitive calls, calls, self time, cumulative time, callers)
+    callees: dict[tuple, dict[tuple, float]] = {}
+    for function, (_, _, _, _, callers) in functions.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[function] = edge[3]
+    roots = [function for function, entry in functions.items() if not entry[4]]
+    total = sum(functions[root][3] for root in roots) or 1.0
+    stacks: dict[str, int] = {}
+
+    def visit(function: tuple, seconds: float, path: list[str], on_path: set) -> None:
+        if seconds < total * min_fraction or len(path) >= max_depth:
+            return
+        _, _, self_time, cumulative, _ = functions[function]
+        path.append(label(function))
+        share = seconds / cumulative if cumulative else 0.0
+        stack = ";".join(path)
+        stacks[stack] = stacks.get(stack, 0) + round(self_time * share * 1e6)
+        for callee, edge_time in callees.get(function, {}).items():
+            if callee not in on_path:  # Recursion is folded into the first frame
+                on_path.add(callee)
+                visit(callee, edge_time * share, path, on_path)
+                on_path.discard(callee)
+        path.pop()
+
+    for root in roots:
+        visit(root, functions[root][3], [], {root})
+    return {stack: microseconds for stack, microseconds in stacks.items() if microseconds > 0}
+
+
+def run_profile(number_of_games: int, workers: int, top: int, collapsed_path: str, stats_path: str) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        tasks = [(match, number_of_games, seed, directory) for seed, match in enumerate(MATCHES)]
+        with ProcessPoolExecutor(workers) as pool:
+            paths = list(pool.map(profile_match, *zip(*tasks)))
+        stats = pstats.Stats(*paths)  # Adds up the stats of every worker
+    if stats_path:
+        stats.dump_stats(stats_path)
+
+    print(f"{len(MATCHES) * number_of_games} games in {len(paths)} profiles")
+    stats.sort_stats("tottime").print_stats(r"games|core|utils", top)
+    stats.sort_stats("cumulative").print_stats(r"games|core|utils", top)
+    stacks = collapsed_stacks(stats)
+    with open(collapsed_path, "w") as file:
+        for stack, microseconds in sorted(stacks.items()):
+            file.write(f"{stack} {microseconds}\n")
+    print(f"Wrote {len(stacks)} stacks to {collapsed_path}, for flamegraph.pl or speedscope")
+
+
+def main(arguments: list[str]) -> None:
+    parser = argparse.ArgumentParser(description="Profile simulated games across worker processes.")
+    parser.add_argument("--games", type=int, default=200, help="Games per match.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top", type=int, default=25, help="Functions listed in each report.")
+    parser.add_argument("--collapsed", default="simulation.collapsed", help="Collapsed stack output file.")
+    parser.add_argument("--stats", default="", help="Also write the merged stats for pstats or snakeviz.")
+    options = parser.parse_args(arguments)
+    run_profile(options.games, options.workers, options.top, options.collapsed, options.stats)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+from statistics import median
+
+# Modules imported by each way of starting the project. main is the game menu before a game is chosen.
+ENTRY_POINTS = ["main", "cli.TicTacToeCLI", "cli.ConnectFourCLI", "app"]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> list[tuple[str, int, int]]:
+    """Imports a module in a fresh interpreter and returns the name, cumulative import time in microseconds and
+    nesting level of every module loaded, in the order reported by python -X importtime. A module is listed after
+    the modules it imports."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times.append((name.strip(), int(cumulative), (len(name) - len(name.lstrip())) // 2))
+    return times
+
+
+def direct_imports(times: list[tuple[str, int, int]], module: str) -> list[tuple[str, int]]:
+    """Returns the modules first imported by the module itself with their cumulative times, slowest first."""
+    index = next(i for i, (name, _, _) in enumerate(times) if name == module)
+    level = times[index][2]
+    children = []
+    for name, cumulative, child_level in reversed(times[:index]):
+        if child_level <= level:
+            break
+        if child_level == level + 1:
+            children.append((name, cumulative))
+    return sorted(children, key=lambda child: child[1], reverse=True)
+
+
+def run_benchmark(runs: int = 5, slowest: int = 5) -> None:
+    """Prints the median cold start import time of each entry point and the modules that cost the most."""
+    for module in ENTRY_POINTS:
+        samples = [import_times(module) for _ in range(runs)]
+        total = median(next(cumulative for name, cumulative, _ in sample if name == module)
+                       for sample in samples) / 1000
+        print(f"{module:<20}{total:>10.1f} ms over {runs} cold starts")
+        for name, cumulative in direct_imports(samples[-1], module)[:slowest]:
+            print(f"    {name:<36}{cumulative / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -1,70 +1,184 @@
-from flask import Flask, render_template, request, jsonify
-from tictactoe import Game, Player, Square, AIPlayer
+import atexit
+import os
+from time import perf_counter
+from typing import Optional
+from uuid import uuid4
+from flask import Flask, Response, g, render_template, request, jsonify
+from games.Game import TicTacToe
+from games.snapshot import SnapshotStore
+from utils.metrics import Registry, deep_size
 
 app = Flask(__name__)
-game = None
+
+# Active games are checkpointed after every move and resumed when the server restarts. The store is opened by the
+# first request, in the file named by GAME_SNAPSHOTS or else in the app's instance folder, so importing the app
+# creates no files
+snapshots: Optional[SnapshotStore] = None
+games = {}  # Active games keyed by the game id handed to the browser in /start_game
+
+# Finished games are appended to the record file named by GAME_RECORDS and the player totals are kept in the
+# database named by PLAYER_STATS when they are set. Their modules are only imported when they are used.
+observers = []
+stats_store = None
+if os.environ.get("GAME_RECORDS"):
+    from games.records import recorder_from_environment
+    observers.append(recorder_from_environment())
+if os.environ.get("PLAYER_STATS"):
+    from core.stats_store import stats_store_from_environment
+    stats_store = stats_store_from_environment()
+    observers.append(stats_store)
+for observer in observers:
+    atexit.register(observer.close)
+
+DIFFICULTY_LEVELS = {"easy": None, "intermediate": False, "hard": True}
+AI_NAMES = {None: "CPU Easy", False: "CPU Intermediate", True: "CPU Hard"}
+
+# Operational metrics served at /metrics in the Prometheus text format
+SESSION_SAMPLE_SIZE = 100  # Games measured for the memory per session gauge, as measuring walks each game
+
+
+def session_bytes() -> float:
+    """Returns the average memory of a game session, leaving out the observers shared by every game."""
+    sample = list(games.values())[:SESSION_SAMPLE_SIZE]
+    return sum(deep_size(game, observers) for game in sample) / len(sample) if sample else 0
+
+
+metrics = Registry()
+metrics.gauge("tictactoe_active_games", "Games in progress.", function=lambda: len(games))
+request_count = metrics.counter("tictactoe_requests_total", "Requests by endpoint and status code.",
+                                ("endpoint", "status"))
+request_latency = metrics.histogram("tictactoe_request_duration_seconds", "Time to handle a request.",
+                                    ("endpoint",))
+ai_decision_time = metrics.histogram("tictactoe_ai_decision_seconds", "Time for the AI to choose a move.",
+                                     ("difficulty",))
+metrics.gauge("tictactoe_game_session_bytes", "Average memory of an active game session.", function=session_bytes)
+DIFFICULTY_NAMES = {difficulty: name for name, difficulty in DIFFICULTY_LEVELS.items()}
+
+
+def get_ai_move(game: TicTacToe, player: TicTacToe.AIPlayer) -> tuple[int, int]:
+    """Returns the AI reply for the current position. Every level answers in a few microseconds and intermediate
+    and hard mode pick between equal moves at random, so replies are worked out for each request."""
+    return tuple(player.move(game.board))
+
+
+def current_player(game: TicTacToe):
+    if game.go_first:
+        return game.players[game.round_count % 2]
+    return game.players[game.round_count % 2 - 1]
+
+
+def board_state(game: TicTacToe) -> list[str]:
+    return [square or "" for row in game.board.get_rows() for square in row]
+
+
+def finish_game(game_id: str, game: TicTacToe) -> dict:
+    """Records the result of a completed game and returns the response for the browser."""
+    game.update_winner_info()
+    game.update_players_stats()
+    games.pop(game_id, None)
+    snapshots.delete(game_id)
+    if game.winner_name is None:
+        return {"status": "draw", "board": board_state(game)}
+    return {"status": "winner", "board": board_state(game), "winner": game.winner_name}
+
+
+def play_turn(game_id: str, game: TicTacToe, row: int, col: int) -> dict:
+    if not game.make_move(row, col, current_player(game).marker):
+        return {"status": "invalid", "board": board_state(game)}
+    if game.check_winner() or game.round_count == game.board_size:
+        return finish_game(game_id, game)
+
+    player = current_player(game)
+    if isinstance(player, TicTacToe.AIPlayer):
+        start = perf_counter()
+        ai_row, ai_col = get_ai_move(game, player)
+        ai_decision_time.observe(perf_counter() - start, DIFFICULTY_NAMES[player.difficulty])
+        game.make_move(ai_row, ai_col, player.marker)
+        if game.check_winner() or game.round_count == game.board_size:
+            return finish_game(game_id, game)
+
+    snapshots.checkpoint(game_id, game)
+    return {"status": "continue", "board": board_state(game)}
+
+
+@app.before_request
+def start_timer():
+    g.request_start = perf_counter()
+
+
+@app.before_request
+def open_snapshots():
+    """Opens the snapshot store on the first request and resumes the games stored in it."""
+    global snapshots
+    if snapshots is not None:
+        return
+    path = os.environ.get("GAME_SNAPSHOTS") or os.path.join(app.instance_path, "game_snapshots.sqlite3")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    snapshots = SnapshotStore(path)
+    atexit.register(snapshots.close)
+    for game_id, game in snapshots.load_all().items():
+        for observer in observers:
+            game.add_observer(observer)
+        games[game_id] = game
+
+
+@app.after_request
+def record_request(response):
+    endpoint = request.endpoint or "unknown"
+    request_count.inc(endpoint, response.status_code)
+    if "request_start" in g:
+        request_latency.observe(perf_counter() - g.request_start, endpoint)
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
 
 @app.route('/')
 def home():
     return render_template('index.html')
 
+
 @app.route('/start_game', methods=['POST'])
 def start_game():
-    global game
     data = request.json
-    game_type = data.get('gameType')
-    player_name = data.get('playerName')
-    difficulty = data.get('difficulty')
-    
-    game = Game()
-    game.add_player(Player(player_name, Square.X))
-    
-    if game_type == 'single':
-        if difficulty == 'easy':
-            diff_setting = None
-        elif difficulty == 'intermediate':
-            diff_setting = False
-        else:
-            diff_setting = True
-        game.add_player(AIPlayer(difficulty=diff_setting))
+    game = TicTacToe()
+
+    if data.get('gameType') == 'single':
+        difficulty = DIFFICULTY_LEVELS.get(data.get('difficulty'), True)
+        game.create_ai_player(name=AI_NAMES[difficulty], difficulty=difficulty)
     else:
-        game.add_player(Player(data.get('player2Name'), Square.O))
-    
-    return jsonify({'status': 'success'})
+        game.update_player_name(data.get('player2Name') or "Anonymous O", "o")
+    game.update_player_name(data.get('playerName') or "Anonymous X", "x")
+    for observer in observers:
+        game.add_observer(observer)
+    if stats_store is not None:
+        for player in game.players:
+            stats_store.load_into(player)  # Players carry their totals over from earlier games
+
+    game_id = uuid4().hex
+    games[game_id] = game
+    snapshots.checkpoint(game_id, game)
+    return jsonify({'status': 'success', 'gameId': game_id})
+
 
 @app.route('/make_move', methods=['POST'])
 def make_move():
     data = request.json
+    game_id = data.get('gameId')
+    game = games.get(game_id)
+    if game is None:
+        return jsonify({'status': 'error', 'message': 'Unknown or finished game.'}), 404
+
     row = data.get('row')
     col = data.get('col')
-    
-    if game.game_board.square_is_occupied(row, col):
-        return jsonify({'status': 'invalid'})
-        
-    game.take_turn(game.players[0])
-    
-    if game.check_for_winner():
-        return jsonify({
-            'status': 'winner',
-            'board': [str(square) for row in game.game_board.get_rows() for square in row],
-            'winner': game.players[0].name
-        })
-    
-    if isinstance(game.players[1], AIPlayer):
-        ai_row, ai_col = game.players[1].move(game.game_board)
-        game.game_board.update_square(ai_row, ai_col, Square.O)
-        
-        if game.check_for_winner():
-            return jsonify({
-                'status': 'winner',
-                'board': [str(square) for row in game.game_board.get_rows() for square in row],
-                'winner': game.players[1].name
-            })
-    
-    return jsonify({
-        'status': 'continue',
-        'board': [str(square) for row in game.game_board.get_rows() for square in row]
-    })
+    if not isinstance(row, int) or not isinstance(col, int) or not (0 <= row < 3 and 0 <= col < 3):
+        return jsonify({'status': 'invalid', 'board': board_state(game)})
+
+    return jsonify(play_turn(game_id, game, row, col))
+
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8080)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=8080)
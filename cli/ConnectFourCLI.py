@@ -1,22 +1,20 @@
+from time import sleep
 from games.Game import ConnectFour
-from utils.display import set_console_window_size, print_board
+from utils.display import set_console_window_size, BoardRenderer
 
 LINE = "* " * 44 + "*" # for Connect 4
 
+DEMO_MOVES = [(0, "r"), (0, "y"), (6, "y"), (6, "r"), (7, "y"), (3, "y"), (3, "y"), (3, "y"), (4, "y"), (4, "y"),
+              (4, "r")]
+
+
 def run():
     set_console_window_size(100, 40)
 
     test = ConnectFour()
-    test.make_move(0, "r")
-    test.make_move(0, "y")
-    test.make_move(6, "y")
-    test.make_move(6, "r")
-    test.make_move(7, "y")
-    test.make_move(3, "y")
-    test.make_move(3, "y")
-    test.make_move(3, "y")
-    test.make_move(4, "y")
-    test.make_move(4, "y")
-    test.make_move(4, "r")
-
-    print_board(test.board.get_board(), LINE)
+    with BoardRenderer(LINE) as renderer:  # After the first frame only the square of each new piece is redrawn
+        renderer.render(test.board.get_board())
+        for col, marker in DEMO_MOVES:
+            if test.make_move(col, marker):
+                sleep(0.25)
+                renderer.render(test.board.get_board())
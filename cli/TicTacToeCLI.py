@@ -1,6 +1,7 @@
 import os
-from time import sleep
-from typing import Optional
+import sys
+from time import perf_counter, sleep
+from typing import Callable, Iterable, Optional
 from utils.display import *
 from games.Game import TicTacToe
 
@@ -53,6 +54,7 @@ This is an online version of the classic game. Play multiple games per session
 against and opponent or the computer. X starts the game.
 """
 THINKING = "\nComputer is now thinking."
+THINKING_PAUSE = 1.5  # Seconds the computer appears to think for before each move
 # DRAW = "\nCATS GAME.\n There was no winner so there will be no chicken dinner.\n"
 
 LINE = "* " * 18 + "*" # for Tic Tac Toe
@@ -333,7 +335,49 @@ def set_up_game():
     return Game
 
 
-def play_game(Game) -> None:
+def attach_recorder(Game):
+    """Returns a record writer observing the game when GAME_RECORDS is set, otherwise None. The record module is
+    only imported when games are being recorded to keep the start up of the CLI short."""
+    if not os.environ.get("GAME_RECORDS"):
+        return None
+    from games.records import recorder_from_environment
+    recorder = recorder_from_environment()
+    Game.add_observer(recorder)
+    return recorder
+
+
+def attach_stats_store(Game):
+    """Returns a player statistics store observing the game when PLAYER_STATS is set, otherwise None. The totals
+    stored for the named players are restored onto them, so the scoreboard carries on from earlier sessions."""
+    if not os.environ.get("PLAYER_STATS"):
+        return None
+    from core.stats_store import stats_store_from_environment
+    stats_store = stats_store_from_environment()
+    Game.add_observer(stats_store)
+    for player in Game.players:
+        stats_store.load_into(player)
+    return stats_store
+
+
+def play_game(Game, read_move: Callable[[], Optional[tuple[int, int]]] = prompt_move, interactive: bool = True,
+              pause: float = THINKING_PAUSE) -> tuple[Optional[str], int, float]:
+    """Plays one game, reading each human move with read_move. The headless replay runs this same loop with
+    interactive False, which leaves out the printing, board drawing and pondering, and no pause, so it times the
+    moves players wait for.
+    A read_move that returns None ends the game early without counting it. Returns the result, the number of moves
+    played and the seconds spent making, searching and checking moves, with a result of None for a game cut short."""
+    # Against the computer, its replies to every possible human move are worked out while the human decides. There
+    # is nothing to wait for in a headless game, and the pondering thread would only slow the moves being timed.
+    ai_player = next((player for player in Game.players if isinstance(player, TicTacToe.AIPlayer)), None)
+    ponderer = None
+    if interactive and ai_player is not None and ai_player.difficulty:
+        from games.ponder import Ponderer
+        ponderer = Ponderer()
+    # The board is drawn once and then only the square of each new move is redrawn, with the messages of the turn
+    # written below it, instead of clearing the screen and printing the whole board after every move
+    renderer = BoardRenderer(LINE) if interactive else None
+    elapsed = 0.0
+    result = "draw"
     for i in range(Game.board_size):
         # print(Game.round_count)
         if Game.go_first:
@@ -342,42 +386,78 @@ def play_game(Game) -> None:
             player = Game.players[i % 2 - 1]
 
         name = player.get_player_name()
-        if i == 0:
+        if i == 0 and interactive:
             print_first_player(name)
-            clear_screen()
+            renderer.render(Game.board.get_board())
 
         if isinstance(player, TicTacToe.TicTacToePlayer):
 
-            print_first_prompt(name)
+            if ponderer:
+                ponderer.start(Game, ai_player)
+            if interactive:
+                print_first_prompt(name)
             while True:
-                row, col = prompt_move()
-                if Game.make_move(row, col, player.marker):
+                move = read_move()
+                if move is None:
+                    if ponderer:
+                        ponderer.cancel()
+                    if renderer:
+                        renderer.close()
+                    Game.reset_game_state()
+                    return None, i, elapsed
+                row, col = move
+                start = perf_counter()
+                valid = Game.make_move(row, col, player.marker)
+                elapsed += perf_counter() - start
+                if valid:
                     break
-                else:
+                elif interactive:
                     print_second_prompt(name)
         elif isinstance(player, TicTacToe.AIPlayer):
-            print(THINKING)
-            sleep(1.5)
-            row, col = player.move(Game.board)
+            if interactive:
+                print(THINKING)
+            start = perf_counter()
+            if ponderer and (move := ponderer.take(Game)):
+                row, col = move  # Already worked out while the human was deciding
+                thought = None
+            else:
+                row, col = player.think()  # The computer searches during the thinking pause instead of sleeping
+                thought = perf_counter() - start
             Game.make_move(row, col, player.marker)
-
-        clear_screen()
-        print_move(name, row, col)
-        print_board(Game.board.get_board(), LINE)
-
-        if i >= 4 and Game.check_winner():
-            print_game_over()
-            print_board(Game.board.get_board(), LINE)
+            elapsed += perf_counter() - start
+            if thought is not None:
+                sleep(max(0.0, pause - thought))
+
+        start = perf_counter()
+        won = i >= 4 and Game.check_winner()
+        elapsed += perf_counter() - start
+        if interactive:
+            renderer.render(Game.board.get_board())
+            print_move(name, row, col)
+
+        if won:
+            result = f"{player.marker} wins"
+            if interactive:
+                print_game_over()
+                renderer.reset()  # The flashing banner cleared the screen
+                renderer.render(Game.board.get_board())
             break
+    if ponderer:
+        ponderer.cancel()
+    if renderer:
+        renderer.close()
     
     
+    played = Game.round_count
     Game.update_winner_info()
     Game.update_players_stats()
-    winner = Game.get_winner_attributes()
-    print_winner_info(*winner)
+    if interactive:
+        winner = Game.get_winner_attributes()
+        print_winner_info(*winner)
     # Game.print_winner()
     # print(Game.move_list)
     Game.reset_game_state()
+    return result, played, elapsed
 
 
 def play_again():
@@ -403,6 +483,8 @@ def play_again():
 def run():
     set_console_window_size(85, 30) # console dimensions: width, height
     Game = set_up_game()
+    recorder = attach_recorder(Game)
+    stats_store = attach_stats_store(Game)
     play_game(Game)
     multiplay = play_again()
     print_scoreboard(Game.players)
@@ -412,4 +494,86 @@ def run():
         play_game(Game)
         multiplay = play_again()
         print_scoreboard(Game.players)
+    for observer in (recorder, stats_store):
+        if observer:
+            observer.close()
     exit()
+
+
+def parse_script_line(line: str) -> list[tuple[int, int]]:
+    """Converts a line of scripted moves such as '2,2 1,1 3,3' into zero based row and column pairs. Raises
+    ValueError naming the first move that is not two whole numbers separated by a comma."""
+    moves = []
+    for move in line.split():
+        try:
+            row, column = move.split(",")
+            moves.append((int(row) - 1, int(column) - 1))
+        except ValueError:
+            raise ValueError(f"bad move '{move}'") from None
+    return moves
+
+
+def scripted_moves(Game, moves: list[tuple[int, int]]) -> Callable[[], Optional[tuple[int, int]]]:
+    """Returns a read_move for play_game that gives the scripted moves in turn, skipping moves that are off the
+    board, and None once the script runs out. Moves on occupied squares are refused by the game loop itself."""
+    remaining = iter(moves)
+
+    def read_move() -> Optional[tuple[int, int]]:
+        for row, col in remaining:
+            if 0 <= row < Game.board.rows and 0 <= col < Game.board.columns:
+                return row, col
+        return None
+    return read_move
+
+
+def run_headless(script: Iterable[str], one_player: bool = True, difficulty: Optional[bool] = True) -> None:
+    """Replays scripted games through the CLI game loop and prints only the results. Each non-empty line of the
+    script is one game made of the human moves as 'row,column' pairs from 1 to 3. With two players the moves of
+    both players alternate on the line. The first player alternates between games as in the interactive CLI."""
+    Game = TicTacToe()
+    if one_player:
+        Game.create_ai_player(name="CPU", difficulty=difficulty)
+    recorder = attach_recorder(Game)
+
+    results = {}
+    total_moves = 0
+    total_time = 0.0
+    games = 0
+    for number, line in enumerate(script, 1):
+        if not line.strip():
+            continue
+        try:
+            moves = parse_script_line(line)
+        except ValueError as error:
+            print(f"Skipped line {number}: {error}")
+            continue
+        games += 1
+        result, moves, elapsed = play_game(Game, scripted_moves(Game, moves), interactive=False, pause=0.0)
+        result = result or "incomplete"
+        results[result] = results.get(result, 0) + 1
+        total_moves += moves
+        total_time += elapsed
+        print(f"Game {games}: {result} after {moves} moves")
+
+    if recorder:
+        recorder.close()
+    summary = ", ".join(f"{result}: {count}" for result, count in sorted(results.items()))
+    per_move = total_time / total_moves * 1e6 if total_moves else 0.0
+    print(f"{games} games ({summary}). {total_moves} moves at {per_move:.1f} microseconds per move.")
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+    parser = ArgumentParser(description="Play Tic Tac Toe in the terminal.")
+    parser.add_argument("--headless", action="store_true",
+                        help="replay scripted games without prompts, delays or screen clears")
+    parser.add_argument("--script", help="file of scripted games, one game per line; defaults to stdin")
+    parser.add_argument("--players", type=int, choices=[1, 2], default=1)
+    parser.add_argument("--difficulty", choices=["easy", "intermediate", "hard"], default="hard")
+    arguments = parser.parse_args()
+    if arguments.headless:
+        levels = {"easy": None, "intermediate": False, "hard": True}
+        with open(arguments.script) if arguments.script else sys.stdin as script:
+            run_headless(script, arguments.players == 1, levels[arguments.difficulty])
+    else:
+        run()
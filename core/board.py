@@ -1,5 +1,5 @@
+from functools import lru_cache
 from typing import Union, Optional
-from collections import Counter
 
 def int_converter(number, columns):
     return divmod(number, columns)
@@ -9,17 +9,52 @@ def winner_info(winner_dictionary):
       f"Row {winner_dictionary['row'] + 1} and Column {winner_dictionary['column'] + 1}")
 
 
+@lru_cache(maxsize=None)
+def winning_windows(rows: int, columns: int, win_value: int) -> tuple[tuple[tuple[int, int], ...], ...]:
+    """Returns every line of win_value squares a player could fill to win on a board of the given size, as the row
+    and column of each square. Rows come first, then columns, right diagonals and left diagonals, and windows overlap
+    so a row longer than win_value holds several. The result only depends on the size and is shared."""
+    windows = []
+    for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for row in range(rows):
+            for column in range(columns):
+                end_row = row + row_step * (win_value - 1)
+                end_column = column + column_step * (win_value - 1)
+                if end_row < rows and 0 <= end_column < columns:
+                    windows.append(tuple((row + row_step * n, column + column_step * n) for n in range(win_value)))
+    return tuple(windows)
+
+
 class Board:
     def __init__(self, rows: int, columns: int):
         self.rows = rows
         self.columns = columns
         self.board: list[list[Union[int, str]]] = self._initialize_board()
+        self._column_buffer: Optional[list[list[Union[int, str]]]] = None  # Reused lines, see reuse_line_buffers
+        self._diagonal_buffers: Optional[dict[tuple[int, str], tuple[list, list]]] = None
     
     def _initialize_board(self) -> list[list[Union[int, str]]]:
         return [[0] * self.columns for _ in range(self.rows)]
 
     def reset_board(self) -> None:
-        self.board = self._initialize_board()
+        """Blanks every square in place so the row lists are kept from game to game."""
+        for row in self.board:
+            for c in range(self.columns):
+                row[c] = 0
+
+    def reuse_line_buffers(self, enabled: bool = True) -> None:
+        """When enabled, get_columns and get_diagonals fill the same lists on every call instead of building new
+        ones. This saves allocating lines on every win check when many games are simulated, but the lists that are
+        returned change with the board, so callers must not keep them."""
+        if enabled:
+            self._column_buffer = self._initialize_board_columns()
+            self._diagonal_buffers = {}
+        else:
+            self._column_buffer = None
+            self._diagonal_buffers = None
+
+    def _initialize_board_columns(self) -> list[list[Union[int, str]]]:
+        return [[0] * self.rows for _ in range(self.columns)]
 
     def get_board(self) -> list[list[Union[int, str]]]:
         # Return a deep copy to ensure immutability
@@ -30,11 +65,18 @@ class Board:
         return self.board
     
     def get_columns(self) -> list[list[int]]:
-        return [list(col) for col in zip(*self.board)]
+        if self._column_buffer is None:
+            return [list(col) for col in zip(*self.board)]
+        for r, row in enumerate(self.board):
+            for c, column in enumerate(self._column_buffer):
+                column[r] = row[c]
+        return self._column_buffer
     
     def get_diagonals(self, dimension: int, direction: str) -> list[list[int]]:
         if dimension > min(self.rows, self.columns):
             return []
+        if self._diagonal_buffers is not None:
+            return self._fill_diagonals(dimension, direction)
         diagonals = []
         for i in range(self.rows - dimension + 1):
             for j in range(self.columns - dimension + 1):
@@ -43,6 +85,30 @@ class Board:
                 elif direction == "left":
                     diagonals.append([self.board[i + n][(self.columns - 1) - (j + n)] for n in range(dimension)])
         return diagonals
+
+    def _fill_diagonals(self, dimension: int, direction: str) -> list[list[int]]:
+        """Copies the squares of each diagonal into its buffer, which is made with the list of squares it reads on
+        the first call for the dimension and direction."""
+        buffers = self._diagonal_buffers.get((dimension, direction))
+        if buffers is None:
+            squares = self._diagonal_squares(dimension, direction)
+            buffers = self._diagonal_buffers[dimension, direction] = squares, [[0] * dimension for _ in squares]
+        board = self.board
+        for squares, line in zip(*buffers):
+            for n, (r, c) in enumerate(squares):
+                line[n] = board[r][c]
+        return buffers[1]
+
+    def _diagonal_squares(self, dimension: int, direction: str) -> list[list[tuple[int, int]]]:
+        """Returns the row and column of each square of the diagonals, in the order of get_diagonals."""
+        squares = []
+        for i in range(self.rows - dimension + 1):
+            for j in range(self.columns - dimension + 1):
+                if direction == "right":
+                    squares.append([(i + n, j + n) for n in range(dimension)])
+                elif direction == "left":
+                    squares.append([(i + n, (self.columns - 1) - (j + n)) for n in range(dimension)])
+        return squares
     
     def square_is_occupied(self, row: int, column: int) -> bool:
         return self.board[row][column] != 0
@@ -97,9 +163,11 @@ class WinChecker:
         self.win_column = win_column
 
     def _check_win(self, line: list[Union[int, str]], win_value: int) -> Optional[Union[int, str]]:
-        counter = Counter(line)
-        for key, value in counter.items():
-            if value >= win_value and key != 0:
+        # A marker found win_value times must appear among the first len(line) - win_value + 1 squares, and
+        # counting in place avoids building a Counter for every line of every check
+        for index in range(len(line) - win_value + 1):
+            key = line[index]
+            if key != 0 and line.count(key) >= win_value:
                 return key
         return None
     
@@ -126,6 +194,25 @@ class WinChecker:
                 c = self.board.columns - 1 - c
                 return winner, "left_diagonal", r, c
     
+    def check_square(self, row: int, column: int) -> bool:
+        """Checks the four lines through one square for win_value of its marker in a row. Only lines through the
+        last marker played can have become a win, so this is much cheaper than check_for_winner after a move. It
+        does not update the win info."""
+        board = self.board.board
+        marker = board[row][column]
+        if marker == 0:
+            return False
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * row_step, column + sign * column_step
+                while 0 <= r < self.board.rows and 0 <= c < self.board.columns and board[r][c] == marker:
+                    count += 1
+                    r, c = r + sign * row_step, c + sign * column_step
+            if count >= self.win_value:
+                return True
+        return False
+
     def check_for_winner(self) -> Optional[tuple]:
         if self.win_value > max(self.board.rows, self.board.columns):
             raise ValueError(f"Invalid win condition: {self.win_value} is too large for a board of size "
@@ -2,6 +2,9 @@ from collections import namedtuple
 from typing import Tuple, List
 from copy import deepcopy
 
+# Made once here rather than on every call of Player.__repr__
+PlayerRepr = namedtuple("Player", ["name", "marker", "win", "lost", "draw", "played"])
+
 class Player:
     def __init__(self, name: str = None, marker: str = None):
         self._name = name
@@ -83,7 +86,6 @@ class Player:
 
     def __repr__(self) -> str:
         """Returns a string of information on current attributes of the player for information purposes only."""
-        PlayerRepr = namedtuple("Player", ["name", "marker", "win", "lost", "draw", "played"])
         player_info = PlayerRepr(
             self.name,
             self.marker,
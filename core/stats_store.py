@@ -0,0 +1,100 @@
+import os
+import sqlite3
+from threading import Lock
+from time import monotonic
+from typing import Optional
+from core.player import Player
+
+
+class PlayerStatsStore:
+    """Persistent player statistics kept in a local SQLite database and keyed by player name. Results are collected
+    in an in-memory write-behind cache of per-player deltas and applied in one atomic transaction every flush_every
+    games, or by the first game to complete flush_interval seconds after the last write, so results are not held
+    for long by a quiet server and simulations need no commit per game. Register the store with a game's
+    add_observer method to record every game it completes, and call load_into once a player is named to restore
+    their totals."""
+
+    def __init__(self, path: str, flush_every: int = 1000, flush_interval: float = 30.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending: dict[str, list[int]] = {}  # name -> [wins, losses, games played] not yet written
+        self._pending_games = 0
+        self._written_at = monotonic()
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS player_stats (name TEXT PRIMARY KEY, "
+                                 "wins INTEGER NOT NULL, losses INTEGER NOT NULL, played INTEGER NOT NULL)")
+        self._connection.commit()
+
+    def record(self, name: str, won: int = 0, lost: int = 0, played: int = 1) -> None:
+        """Adds a result to the cached totals of a player. Raises ValueError for a player without a name, as the
+        name is the key of the stored totals."""
+        if not isinstance(name, str):
+            raise ValueError("Statistics can only be recorded for a named player.")
+        if min(won, lost, played) < 0:
+            raise ValueError("Statistics updates cannot be negative.")
+        with self._lock:
+            totals = self._pending.setdefault(name, [0, 0, 0])
+            totals[0] += won
+            totals[1] += lost
+            totals[2] += played
+
+    def game_complete(self, game) -> None:
+        """Observer hook called by update_players_stats once a game has finished. Mirrors the in-memory update."""
+        for player in game.players:
+            won = player.name == game.winner_name
+            self.record(player.name, won=int(won), lost=int(not won and game.winner_name is not None))
+        with self._lock:
+            self._pending_games += 1
+            if self._pending_games >= self.flush_every or monotonic() - self._written_at >= self.flush_interval:
+                self._write()
+
+    def flush(self) -> None:
+        """Applies every cached result to the database in a single transaction."""
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO player_stats (name, wins, losses, played) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET wins = wins + excluded.wins, "
+                    "losses = losses + excluded.losses, played = played + excluded.played",
+                    ((name, *totals) for name, totals in self._pending.items()))
+            self._pending.clear()
+        self._pending_games = 0
+        self._written_at = monotonic()
+
+    def get(self, name: str) -> Optional[tuple[int, int, int]]:
+        """Returns the wins, losses and games played of a player including cached results, or None if unknown."""
+        with self._lock:
+            row = self._connection.execute("SELECT wins, losses, played FROM player_stats WHERE name = ?",
+                                           (name,)).fetchone()
+            pending = self._pending.get(name)
+        if row is None and pending is None:
+            return None
+        row = row or (0, 0, 0)
+        pending = pending or (0, 0, 0)
+        return tuple(stored + cached for stored, cached in zip(row, pending))
+
+    def load_into(self, player: Player) -> None:
+        """Restores the stored statistics of a player onto a Player object through its validated setters."""
+        if stats := self.get(player.name):
+            player.win_count, player.lost_count, player.games_played = stats
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._connection.execute("SELECT COUNT(*) FROM player_stats").fetchone()[0]
+
+
+def stats_store_from_environment() -> Optional[PlayerStatsStore]:
+    """Returns a statistics store for the database named by the PLAYER_STATS environment variable, or None."""
+    path = os.environ.get("PLAYER_STATS")
+    return PlayerStatsStore(path) if path else None
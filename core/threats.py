@@ -0,0 +1,150 @@
+from core.board import Board, winning_windows
+
+
+class ThreatIndex:
+    """Keeps, for every window of win_value squares a player could fill to win, the number of markers each player
+    has in it and which of its squares are empty. A move only changes the windows through its square, found in a
+    table made once for the board size, so play and undo touch a handful of windows instead of every line. Open
+    windows, those holding markers of only one player, are also filed by their count, which answers the threat
+    queries without looking at the rest of the board: the squares that win or block straight away in O(1) per
+    threat, and the fork squares that make two threats at once. It does not watch a board by itself: load it from
+    the board or have it follow a game's move list, and play and undo the moves of a search on both."""
+
+    def __init__(self, rows: int, columns: int, win_value: int, markers: tuple[str, str] = ("x", "o")):
+        self.rows = rows
+        self.columns = columns
+        self.win_value = win_value
+        self.markers = markers
+        self.other = {markers[0]: markers[1], markers[1]: markers[0]}
+        self.windows = winning_windows(rows, columns, win_value)
+        # Window number -> its square numbers, row * columns + column, and square number -> windows through it
+        self.window_squares = [tuple(row * columns + column for row, column in window) for window in self.windows]
+        membership: list[list[int]] = [[] for _ in range(rows * columns)]
+        for number, squares in enumerate(self.window_squares):
+            for square in squares:
+                membership[square].append(number)
+        self.square_windows = [tuple(numbers) for numbers in membership]
+        self.played: list[tuple[int, int, str]] = []  # Squares and markers the counts were brought to by follow
+        self.counts = {marker: [0] * len(self.windows) for marker in markers}
+        self.empty_squares = [set(squares) for squares in self.window_squares]
+        # Marker -> numbers of the windows holding none of the other marker, filed by the count of the marker
+        self.open = {marker: [set() for _ in range(win_value + 1)] for marker in markers}
+
+    def clear(self) -> None:
+        """Empties every window, as on a new board. The lists and sets are emptied in place to be used again."""
+        self.played.clear()
+        for counts in self.counts.values():
+            for window in range(len(counts)):
+                counts[window] = 0
+        for empty, squares in zip(self.empty_squares, self.window_squares):
+            empty.update(squares)
+        for open_windows in self.open.values():
+            for windows in open_windows:
+                windows.clear()
+
+    def load(self, board: Board) -> None:
+        """Sets the counts to the markers on the board."""
+        self.clear()
+        for row, squares in enumerate(board.get_rows()):
+            for column, marker in enumerate(squares):
+                if marker != 0:
+                    self.play(row, column, marker)
+                    self.played.append((row, column, marker))
+
+    def follow(self, board: Board, moves: list[tuple[int, int]]) -> None:
+        """Brings the counts up to date with a game from its board and move list. Moves since the last call are
+        played and moves that were taken back are undone, so following a game costs only the moves in between
+        rather than a load of the whole board. Moves passed to play and undo directly must be balanced in between
+        calls, as a search does."""
+        played = self.played
+        squares = board.board
+        kept = 0
+        while kept < len(played) and kept < len(moves):
+            row, column, marker = played[kept]
+            if moves[kept] != (row, column) or squares[row][column] != marker:
+                break
+            kept += 1
+        while len(played) > kept:
+            self.undo(*played.pop())
+        for row, column in moves[kept:]:
+            marker = squares[row][column]
+            self.play(row, column, marker)
+            played.append((row, column, marker))
+
+    def play(self, row: int, column: int, marker: str) -> None:
+        """Adds the marker on the square to each window through it."""
+        square = row * self.columns + column
+        own_counts, other_counts = self.counts[marker], self.counts[self.other[marker]]
+        own_open, other_open = self.open[marker], self.open[self.other[marker]]
+        for window in self.square_windows[square]:
+            own, other = own_counts[window], other_counts[window]
+            if other == 0:
+                own_open[own].discard(window)  # Windows without markers are not filed
+                own_open[own + 1].add(window)
+            elif own == 0:
+                other_open[other].remove(window)  # The other player can no longer fill the window
+            own_counts[window] = own + 1
+            self.empty_squares[window].remove(square)
+
+    def undo(self, row: int, column: int, marker: str) -> None:
+        """Takes the marker on the square back out of each window through it."""
+        square = row * self.columns + column
+        own_counts, other_counts = self.counts[marker], self.counts[self.other[marker]]
+        own_open, other_open = self.open[marker], self.open[self.other[marker]]
+        for window in self.square_windows[square]:
+            own, other = own_counts[window] - 1, other_counts[window]
+            if other == 0:
+                own_open[own + 1].remove(window)
+                if own:
+                    own_open[own].add(window)
+            elif own == 0:
+                other_open[other].add(window)
+            own_counts[window] = own
+            self.empty_squares[window].add(square)
+
+    def open_windows(self, marker: str, count: int) -> set[int]:
+        """Returns the numbers of the windows holding count of the marker and none of the other marker."""
+        return self.open[marker][count]
+
+    def has_won(self, marker: str) -> bool:
+        return bool(self.open[marker][self.win_value])
+
+    def winning_squares(self, marker: str) -> set[tuple[int, int]]:
+        """Returns the squares where the marker completes a window, the empty square of each window one short."""
+        return {divmod(next(iter(self.empty_squares[window])), self.columns)
+                for window in self.open[marker][self.win_value - 1]}
+
+    def blocking_squares(self, marker: str) -> set[tuple[int, int]]:
+        """Returns the squares the marker must take to stop the other player completing a window."""
+        return self.winning_squares(self.other[marker])
+
+    def fork_squares(self, marker: str) -> set[tuple[int, int]]:
+        """Returns the squares where the marker makes two threats at once: squares in two or more windows that are
+        two short, which after the move leaves windows to be completed on at least two different squares."""
+        partners: dict[int, set[int]] = {}
+        for window in self.open[marker][self.win_value - 2]:
+            first, second = self.empty_squares[window]
+            partners.setdefault(first, set()).add(second)
+            partners.setdefault(second, set()).add(first)
+        return {divmod(square, self.columns) for square, others in partners.items() if len(others) > 1}
+
+    def gain(self, row: int, column: int, marker: str, values: list[int]) -> int:
+        """Returns the change in the marker's score from playing the empty square: the growth of its open windows
+        plus the worth of the other player's windows it closes, with values giving the worth of an open window by
+        its count."""
+        own_counts, other_counts = self.counts[marker], self.counts[self.other[marker]]
+        gain = 0
+        for window in self.square_windows[row * self.columns + column]:
+            own, other = own_counts[window], other_counts[window]
+            if other == 0:
+                gain += values[own + 1] - values[own]
+            elif own == 0:
+                gain += values[other]
+        return gain
+
+    def score(self, marker: str, values: list[int]) -> int:
+        """Returns the worth of the marker's open windows less the worth of the other player's, found from the
+        number of open windows of each count."""
+        own_open, other_open = self.open[marker], self.open[self.other[marker]]
+        return sum(values[count] * (len(own_open[count]) - len(other_open[count]))
+                   for count in range(1, self.win_value + 1))
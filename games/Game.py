@@ -1,8 +1,9 @@
-from collections import Counter
 from random import choice, randint
+from threading import Event
 from typing import Tuple, List, Union, Optional
 from core.board import Board, WinChecker
 from core.player import Player
+from core.threats import ThreatIndex
 
 def int_converter(number, columns):
     return divmod(number, columns)
@@ -36,6 +37,7 @@ class ConnectFour:
          self.win_column: int = -1
          self._win: WinChecker = WinChecker(self.board, self.connect_value)
          self.players = self.create_human_players() # Default to two player mode
+         self.observers: List = []  # Objects with a game_complete(game) method, notified after each game
 
     def create_board(self):
         return Board(self.rows, self.columns)
@@ -45,6 +47,25 @@ class ConnectFour:
             self.ConnectFourPlayer("Player 1", "r"),
             self.ConnectFourPlayer("Player 2", "y"),
         )
+
+    def create_mcts_player(self, name: Optional[str] = "CPU", **options) -> None:
+        """Replaces the second player with a Monte Carlo tree search player. The options are passed to MCTSPlayer."""
+        from games.mcts import MCTSPlayer  # Only loaded for games that use it, like the solver
+        self.players = (
+            self.ConnectFourPlayer("Player 1", "r"),
+            MCTSPlayer(name=name, marker="y", game=self, **options),
+        )
+
+    def create_solver_player(self, name: Optional[str] = "CPU", book_path: Optional[str] = None, **options) -> None:
+        """Replaces the second player with a player that solves positions exactly, using the opening book at
+        book_path if given. The options are passed to SolverPlayer."""
+        from games.solver import OpeningBook, SolverPlayer  # The solver is only loaded for games that use it
+        book = OpeningBook(book_path) if book_path else None
+        self.players = (
+            self.ConnectFourPlayer("Player 1", "r"),
+            SolverPlayer(name=name, marker="y", game=self, book=book, **options),
+        )
+
     # def create_ai_player(self, name: Optional[str], difficulty: Optional[bool]) -> Tuple[Player, Player]:
     #     self.players = (
     #         self.TicTacToePlayer("Player 1", "r"),
@@ -92,6 +113,27 @@ class ConnectFour:
                 self.round_count += 1
                 return True
         return False
+
+    def legal_moves(self) -> List[int]:
+        """Returns every column that still has room for a piece."""
+        return [col for col in range(self.columns) if not self.board.square_is_occupied(0, col)]
+
+    def apply_move(self, move: int, marker: str) -> bool:
+        """Plays a move as returned by legal_moves. Shared with TicTacToe so search can drive either game."""
+        return self.make_move(move, marker)
+
+    def undo_move(self) -> Optional[Tuple[int, int]]:
+        """Takes back the last move. Returns the square it was played on or None if no moves were made."""
+        if not self.move_list:
+            return None
+        row, col = self.move_list.pop()
+        self.board.update_square(row, col, 0)
+        self.round_count -= 1
+        return row, col
+
+    def last_move_won(self) -> bool:
+        """Checks if the last move completed a line, only looking at the lines through its square."""
+        return bool(self.move_list) and self._win.check_square(*self.move_list[-1])
     
     def reset_board(self) -> None:
         """Sets each square in the board to a blank."""
@@ -100,10 +142,17 @@ class ConnectFour:
     def reset_game_state(self):
         self.reset_board()
         self.reset_winner()
-        self.move_list = []
+        self.move_list.clear()
         self.round_count = 0
         self.go_first = not self.go_first
 
+    def enable_simulation_mode(self) -> None:
+        """Prepares the game for playing many games in a row with the same board, game and player objects, as the
+        simulation harness does. The win checks then refill the board's line buffers instead of building new lines,
+        and as reset_game_state already blanks the board and move list in place, games in a steady stream allocate
+        next to nothing. Lines from the board must not be kept between calls in this mode."""
+        self.board.reuse_line_buffers()
+
     # def update_ai_player_level(self, difficulty: bool):
     #     for player in self.players:
     #         if isinstance(player, self.AIPlayer): 
@@ -117,6 +166,10 @@ class ConnectFour:
         marker_to_index = {"r": 0, "y": 1}
         self.players[marker_to_index[marker.lower()]].name = name
 
+    def add_observer(self, observer) -> None:
+        """Registers an object whose game_complete(game) method is called once the stats of a game are updated."""
+        self.observers.append(observer)
+
     def update_players_stats(self) -> None:
         """Updates the game statistics on the two players based on if there is a winner or not."""
         for player in self.players:
@@ -125,6 +178,8 @@ class ConnectFour:
                 player.won()
             elif self.winner_name is not None:
                 player.lost()
+        for observer in self.observers:
+            observer.game_complete(self)
     
     def update_winner_info(self) -> None:
         """Updates the winner attributes to store information on the current winner. Resets to default values if
@@ -183,7 +238,10 @@ class ConnectFour:
 
 class TicTacToe:
 
-    def __init__(self):
+    def __init__(self, rows: int=3, columns: int=3, connect_value: int=3):
+         self.rows = rows  # The classic AIPlayer only plays the default 3x3 board, MCTSPlayer and MNKPlayer any size
+         self.columns = columns
+         self.connect_value = connect_value
          self.board: List[List] = self.create_board()
          self.move_list: List = []
          self.round_count: int = 0
@@ -192,11 +250,12 @@ class TicTacToe:
          self.winner_marker: str = None
          self.win_type: str = None
          self.win_index: int = None
-         self._win: WinChecker = WinChecker(self.board)
+         self._win: WinChecker = WinChecker(self.board, self.connect_value)
          self.players = self.create_human_players() # Default to two player mode
+         self.observers: List = []  # Objects with a game_complete(game) method, notified after each game
 
     def create_board(self):
-        return Board(3,3)
+        return Board(self.rows, self.columns)
 
     def create_human_players(self) -> Tuple[Player, Player]:
         return (
@@ -209,6 +268,24 @@ class TicTacToe:
             self.AIPlayer(name=name, difficulty=difficulty, game=self),
         )
 
+    def create_mcts_player(self, name: Optional[str] = "CPU", **options) -> None:
+        """Replaces the second player with a Monte Carlo tree search player, which unlike AIPlayer can play any board
+        size. The options are passed to MCTSPlayer."""
+        from games.mcts import MCTSPlayer  # Only loaded for games that use it, like the solver
+        self.players = (
+            self.TicTacToePlayer("Player 1", "x"),
+            MCTSPlayer(name=name, marker="o", game=self, **options),
+        )
+
+    def create_mnk_player(self, name: Optional[str] = "CPU", **options) -> None:
+        """Replaces the second player with a threat search player, which unlike AIPlayer plays any board size and
+        number in a row. The options are passed to MNKPlayer."""
+        from games.mnk import MNKPlayer
+        self.players = (
+            self.TicTacToePlayer("Player 1", "x"),
+            MNKPlayer(name=name, marker="o", game=self, **options),
+        )
+
     def add_two_hard_move_ai_players_for_testing(self):
         self.players = (
             self.AITestPlayer(name="AI one", marker="x", game=self, difficulty=True, hard_test=True),
@@ -252,6 +329,28 @@ class TicTacToe:
             self.round_count += 1
             return True
         return False
+
+    def legal_moves(self) -> List[Tuple[int, int]]:
+        """Returns the row and column of every unoccupied square."""
+        return [(row, col) for row, squares in enumerate(self.board.get_rows())
+                for col, square in enumerate(squares) if square == 0]
+
+    def apply_move(self, move: Tuple[int, int], marker: str) -> bool:
+        """Plays a move as returned by legal_moves. Shared with ConnectFour so search can drive either game."""
+        return self.make_move(*move, marker)
+
+    def undo_move(self) -> Optional[Tuple[int, int]]:
+        """Takes back the last move. Returns the square it was played on or None if no moves were made."""
+        if not self.move_list:
+            return None
+        row, col = self.move_list.pop()
+        self.board.update_square(row, col, 0)
+        self.round_count -= 1
+        return row, col
+
+    def last_move_won(self) -> bool:
+        """Checks if the last move completed a line, only looking at the lines through its square."""
+        return bool(self.move_list) and self._win.check_square(*self.move_list[-1])
     
     def reset_board(self) -> None:
         """Sets each square in the board to a blank."""
@@ -260,10 +359,17 @@ class TicTacToe:
     def reset_game_state(self):
         self.reset_board()
         self.reset_winner()
-        self.move_list = []
+        self.move_list.clear()
         self.round_count = 0
         self.go_first = not self.go_first
 
+    def enable_simulation_mode(self) -> None:
+        """Prepares the game for playing many games in a row with the same board, game and player objects, as the
+        simulation harness does. The win checks then refill the board's line buffers instead of building new lines,
+        and as reset_game_state already blanks the board and move list in place, games in a steady stream allocate
+        next to nothing. Lines from the board must not be kept between calls in this mode."""
+        self.board.reuse_line_buffers()
+
     def update_ai_player_level(self, difficulty: bool):
         for player in self.players:
             if isinstance(player, self.AIPlayer): 
@@ -277,6 +383,10 @@ class TicTacToe:
         marker_to_index = {"x": 0, "o": 1}
         self.players[marker_to_index[marker.lower()]].name = name
 
+    def add_observer(self, observer) -> None:
+        """Registers an object whose game_complete(game) method is called once the stats of a game are updated."""
+        self.observers.append(observer)
+
     def update_players_stats(self) -> None:
         """Updates the game statistics on the two players based on if there is a winner or not."""
         for player in self.players:
@@ -285,6 +395,8 @@ class TicTacToe:
                 player.won()
             elif self.winner_name is not None:
                 player.lost()
+        for observer in self.observers:
+            observer.game_complete(self)
     
     def update_winner_info(self) -> None:
         """Updates the winner attributes to store information on the current winner. Resets to default values if
@@ -334,6 +446,9 @@ class TicTacToe:
 
     class AIPlayer(Player):
 
+        THINKING_TIME = {None: 0.0, False: 0.5, True: 1.5}  # Seconds of search per move for each difficulty
+        SEARCH_DEPTH = {None: 0, False: 2, True: None}  # Plies searched ahead, None searches to the end of the game
+
         def __init__(self, name: str = 'CPU', marker: str = "o", difficulty: bool = False, game: 'TicTacToe' = None):
             """AIPlayer is a child class of Player and contains all the functionality for a one-player game
             against the computer. The computer player has three modes: easy, intermediate and hard.
@@ -344,6 +459,7 @@ class TicTacToe:
             self.difficulty = difficulty  # None is easy mode, False is intermediate mode, True is hard mode
             self.corners = [(0, 0), (0, 2), (2, 0), (2, 2)]
             self.insides = [(0, 1), (1, 0), (1, 2), (2, 1)]
+            self.threats = ThreatIndex(3, 3, 3)  # Window counts of the board for win, block and fork checks
 
         @property
         def difficulty(self) -> Optional[bool]:
@@ -358,79 +474,15 @@ class TicTacToe:
             self._difficulty = value
         
 
-        def get_fork_index(self, lines: list[Union[str, int]]) -> Optional[Union[int, bool]]:
-            """Finds the position of a branch of a fork. Returns an integer of the row or column index
-            if there is a column or row with a branch of a fork. Returns True if there is a diagonal fork 
-            branch position. Returns None if no fork branch is found."""
-            for index, line in enumerate(lines):
-                fork = Counter(line)
-                if fork["o"] == 1 and fork[0] == 2:
-                    if len(lines) == 1:  # this is for the two diagonals which are just a 1x3 matrix
-                        return True
-                    else:
-                        return index
-            else:
-                return
-
         def check_fork(self, board: Board) -> Optional[tuple[int, int]]:
             """Checks for forks on the board that allows the computer to make a move where it will have 
-            a winning position in two or more lines. The function searches the board for any fork branches.
-            If there is an intersection of two branches, the fork is added to a list, and randomly selects a fork.
+            a winning position in two or more lines. A fork is a blank square on two lines that each hold one 'O'
+            and two blanks. Randomly selects a fork if there is more than one.
             Returns the row and column position of the selected fork, or else return None if there are no forks."""
-            fork_row_index = None
-            fork_column_index = None
-            fork_diagonal_right = None
-            fork_diagonal_left = None
-            # list of all potential forks on a board after a given move by a human player
-            fork_positions = []
-
-            rows = self.game.board.get_rows()
-            columns = self.game.board.get_columns()
-
-            # check rows, columns and two diagonals to get an index of any fork position for row/col,
-            # or T/F for diagonal fork position
-            fork_row_index = self.get_fork_index(rows)
-            fork_column_index = self.get_fork_index(columns)
-            fork_diagonal_right = self.get_fork_index(
-                self.game.board.get_diagonals(3, "right"))  # get_fork_index only accepts a list of lines or 2D array
-            fork_diagonal_left = self.get_fork_index(self.game.board.get_diagonals(3, "left"))
-
-            # check for all forks: a fork is the intersection of a row and column or an intersection of a row or column
-            # and a diagonal. For any fork in a row and column intersection or a row and diagonal intersection
-            if fork_row_index is not None:
-                if fork_column_index is not None:
-                    if not self.game.board.square_is_occupied(fork_row_index, fork_column_index):
-                        fork_positions.append([fork_row_index, fork_column_index])
-                # row and right diagonal fork has the same column position as the row
-                if fork_diagonal_right:
-                    if not self.game.board.square_is_occupied(fork_row_index, fork_row_index):
-                        fork_positions.append([fork_row_index, fork_row_index])
-                        # row and left diagonal fork has the opposite column position as the row reflected through
-                        # the centre horizontal line
-                if fork_diagonal_left:
-                    if not self.game.board.square_is_occupied(fork_row_index, 2 - fork_row_index):
-                        fork_positions.append([fork_row_index, 2 - fork_row_index])
-
-            # for any fork in a column and diagonal intersection    
-            if fork_column_index is not None:
-                # column and right diagonal fork has the same row position as the column
-                if fork_diagonal_right:
-                    if not self.game.board.square_is_occupied(fork_column_index, fork_column_index):
-                        fork_positions.append([fork_column_index, fork_column_index])
-                # column and left diagonal fork has the opposite row position as the column reflected through
-                # the centre vertical line
-                if fork_diagonal_left:
-                    if not self.game.board.square_is_occupied(2 - fork_column_index, fork_column_index):
-                        fork_positions.append([2 - fork_column_index, fork_column_index])
-
-            # for a fork in the diagonal intersection: the centre is the intersection
-            if fork_diagonal_right and fork_diagonal_left:
-                fork_positions.append([1, 1])
-
-            if fork_positions:  # selects a random fork position if there is more than one fork or just the one
-                return fork_positions[randint(0, len(fork_positions) - 1)]
-            else:
-                return  # no forks were found
+            self.threats.follow(self.game.board, self.game.move_list)
+            if fork_positions := self.threats.fork_squares("o"):
+                return choice(sorted(fork_positions))
+            return  # no forks were found
 
         def two_blanks(self, board) -> Optional[tuple[int, int]]:
             """Finds any line with two blanks and one 'O' marker. Used as alternative to random 
@@ -669,54 +721,15 @@ class TicTacToe:
                 return self.random_ints(self.game.board)
 
         def win_or_block(self, board: Board) -> Optional[tuple[int, int]]:
-            """Checks for a win or block. Selects the first found win position or a random block position if there are
-            more than one block moves."""
-            block_positions = []  # Makes a list of all possible blocking points on the board of the opponent
-
-            lines = [self.game.board.get_rows(),
-                    self.game.board.get_columns(),
-                    self.game.board.get_diagonals(3, "right"),
-                    self.game.board.get_diagonals(3, "left")
-                    ]
-            for indicator, line in enumerate(lines):
-
-                for index_1, squares in enumerate(line):
-                    marker, count = Counter(squares).most_common(1)[0]
-                    if count == (len(squares) - 1) and marker !=  0:
-                        for index_2, square in enumerate(squares):
-                            if indicator == 0:
-                                if not self.game.board.square_is_occupied(index_1, index_2):
-                                    if marker !=  "o":
-                                        block_positions.append([index_1, index_2])
-                                    else:
-                                        return index_1, index_2
-
-                            elif indicator == 1:
-                                if not self.game.board.square_is_occupied(index_2, index_1):
-                                    if marker !=  "o":
-                                        block_positions.append([index_2, index_1])
-                                    else:
-                                        return index_2, index_1
-
-                            elif indicator == 2:
-                                if not self.game.board.square_is_occupied(index_2, index_2):
-                                    if marker !=  "o":
-                                        block_positions.append([index_2, index_2])
-
-                                    else:
-                                        return index_2, index_2
-                            else:
-                                if not self.game.board.square_is_occupied(index_2, 2 - index_2):
-                                    if marker !=  "o":
-                                        block_positions.append([index_2, 2 - index_2])
-
-                                    else:
-                                        return index_2, 2 - index_2
-            if block_positions:
+            """Checks for a win or block. Selects a win position or a random block position if there are
+            more than one block moves. Both come from the counts of the threat index rather than scanning each line."""
+            self.threats.follow(self.game.board, self.game.move_list)
+            if win_positions := self.threats.winning_squares("o"):
+                return min(win_positions)
+            if block_positions := self.threats.blocking_squares("o"):
                 # Use randomly selected block position from max of three for variety sake
-                return block_positions[randint(0, len(block_positions) - 1)]
-            else:
-                return None
+                return choice(sorted(block_positions))
+            return None
 
         def move(self, board: Board) -> Union[tuple[int, int], list[int]]:
             """Selects a move for the AI player based on the play mode of easy, intermediate or hard. """
@@ -755,6 +768,19 @@ class TicTacToe:
                         return move
                 return self.random_ints(self.game.board)
     
+        def think(self, budget: Optional[float] = None, stop: Optional[Event] = None) -> tuple[int, int]:
+            """Selects a move by searching ahead for up to budget seconds, defaulting to the thinking time of the
+            difficulty, or until stop is set. The strategy move from move() is the starting point and is kept unless
+            the search proves a better one, so the search only makes the computer stronger. Easy mode keeps its
+            random play."""
+            move = tuple(self.move(self.game.board))
+            depth = self.SEARCH_DEPTH[self.difficulty]
+            budget = self.THINKING_TIME[self.difficulty] if budget is None else budget
+            if depth == 0 or budget <= 0:
+                return move
+            from games.search import AnytimeSearch  # Only loaded once the computer searches
+            return AnytimeSearch(self.game, self.marker, max_depth=depth).run(budget, initial_move=move, stop=stop)
+    
     class AITestPlayer(AIPlayer):
 
         def __init__(self, name: str = 'Computer', marker: str = "o", difficulty: bool = False, game: 'TicTacToe' = None, hard_test: bool = False):
@@ -792,24 +818,3 @@ class TicTacToe:
                     if move := self.two_blanks(self.game.board):
                         return move
                 return self.random_ints(self.game.board)
-
-
-test = ConnectFour()
-print(test.board)
-test.make_move(0,"r")
-test.make_move(0,"r")
-test.make_move(0,"y")
-test.make_move(3,"y")
-test.make_move(0,"y")
-test.make_move(0,"y")
-test.make_move(0,"y")
-test.make_move(0,"y")
-test.make_move(0,"y")
-test.make_move(0,"y")
-print()
-print(test.board)
-if test.check_winner():
-    test.update_winner_info()
-    test.get_winner_attributes()
-    test.print_winner()
-# print(test.board.columns)
\ No newline at end of file
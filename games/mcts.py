@@ -0,0 +1,216 @@
+from math import log, sqrt
+from random import choice, getrandbits, seed, shuffle
+from time import perf_counter
+from typing import Any, Optional
+from core.player import Player
+
+
+def random_policy(game, moves: list, marker: str, opponent: str) -> Any:
+    """Rollout policy that plays a uniformly random legal move."""
+    return choice(moves)
+
+
+def win_or_block_policy(game, moves: list, marker: str, opponent: str) -> Any:
+    """Rollout policy that completes a line if it can, otherwise blocks the opponent from completing one and
+    otherwise plays randomly. Slower per playout than random_policy, but the playouts are closer to real games."""
+    for player_marker in (marker, opponent):
+        for move in moves:
+            game.apply_move(move, player_marker)
+            won = game.last_move_won()
+            game.undo_move()
+            if won:
+                return move
+    return choice(moves)
+
+
+ROLLOUT_POLICIES = {"random": random_policy, "win_or_block": win_or_block_policy}
+
+_pools: dict[int, 'ProcessPoolExecutor'] = {}  # Number of workers -> pool shared by every parallel player
+
+
+def worker_pool(workers: int) -> 'ProcessPoolExecutor':
+    """Returns the process pool for the number of workers, starting it on first use. Pools are shared between
+    players so that the worker processes are only started once. Multiprocessing is only imported here, as most
+    games never search in parallel."""
+    from concurrent.futures import ProcessPoolExecutor
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _pools[workers]
+
+
+def shutdown_pools() -> None:
+    """Stops the worker processes of every pool."""
+    while _pools:
+        _pools.popitem()[1].shutdown()
+
+
+def root_statistics(root: 'Node') -> tuple[dict, int]:
+    """Returns the visits and wins of each move from the root and the number of playouts of a search tree."""
+    return {child.move: (child.visits, child.wins) for child in root.children}, root.visits
+
+
+def _search_worker(snapshot: bytes, marker: str, rollout: str, exploration: float, iterations: int,
+                   budget: Optional[float], random_seed: int) -> tuple[dict, int]:
+    """Runs in a worker process: rebuilds the game from its snapshot and returns the root statistics of a search.
+    Each worker is seeded separately, as forked workers would otherwise repeat the same playouts."""
+    from games.snapshot import decode_game
+    seed(random_seed)
+    player = MCTSPlayer(marker=marker, game=decode_game(snapshot), rollout=rollout, exploration=exploration)
+    return root_statistics(player.build_tree(iterations, budget))
+
+
+class Node:
+    """A position in the search tree, reached by the marker playing move from the parent position. The wins are
+    counted for that marker, with a draw counting as half a win."""
+
+    __slots__ = ("move", "marker", "parent", "children", "untried", "wins", "visits")
+
+    def __init__(self, move: Any, marker: str, parent: Optional['Node'], untried: list):
+        self.move = move
+        self.marker = marker
+        self.parent = parent
+        self.children: list[Node] = []
+        self.untried = untried
+        self.wins = 0.0
+        self.visits = 0
+
+    def select_child(self, exploration: float) -> 'Node':
+        """Returns the child with the highest upper confidence bound (UCT)."""
+        log_visits = log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + exploration * sqrt(log_visits / child.visits))
+
+
+class MCTSPlayer(Player):
+    """Computer player using Monte Carlo tree search with UCT selection. Works with any game providing
+    legal_moves, apply_move, undo_move and last_move_won, so it plays TicTacToe and ConnectFour of any size.
+    Each search runs for a number of playouts, or until a time budget in seconds is spent when one is given.
+    The number of playouts and the time of the last search are kept to report the playout rate. With workers
+    above one, searches run root parallel on a shared process pool."""
+
+    def __init__(self, name: str = 'CPU', marker: str = "o", game=None, iterations: int = 1000,
+                 time_budget: Optional[float] = None, rollout: str = "random", exploration: float = sqrt(2),
+                 workers: int = 1):
+        super().__init__(name, marker)
+        if rollout not in ROLLOUT_POLICIES:
+            raise ValueError(f"Invalid rollout policy: {rollout}. Must be one of {', '.join(ROLLOUT_POLICIES)}.")
+        self.game = game
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.rollout = rollout
+        self.exploration = exploration
+        self.workers = workers
+        self.playouts = 0
+        self.search_time = 0.0
+
+    @property
+    def playouts_per_second(self) -> float:
+        """Returns the playout rate of the last search."""
+        return self.playouts / self.search_time if self.search_time else 0.0
+
+    def search(self, iterations: Optional[int] = None, budget: Optional[float] = None) -> Any:
+        """Searches the current position of the game and returns the most visited move. Stops after iterations
+        playouts, or when budget seconds have passed if a budget is given. The game is left as it was found.
+        With more than one worker, the iterations are shared out between independent searches in worker processes
+        and their root visit counts are added up before choosing."""
+        iterations = self.iterations if iterations is None else iterations
+        budget = self.time_budget if budget is None else budget
+        if not self.game.legal_moves():
+            return None
+        start = perf_counter()
+        if self.workers > 1:
+            statistics, self.playouts = self._parallel_search(iterations, budget)
+        else:
+            statistics, self.playouts = root_statistics(self.build_tree(iterations, budget))
+        self.search_time = perf_counter() - start
+        return max(statistics, key=lambda move: statistics[move][0])
+
+    def build_tree(self, iterations: int, budget: Optional[float]) -> Node:
+        """Grows a search tree from the current position for the iterations or time budget and returns its root.
+        At least one playout is always run, so a spent budget still gives a move to choose."""
+        game = self.game
+        opponent = next(player.marker for player in game.players if player.marker != self.marker)
+        policy = ROLLOUT_POLICIES[self.rollout]
+        moves = game.legal_moves()
+        shuffle(moves)
+        root = Node(None, opponent, None, moves)
+        deadline = None if budget is None else perf_counter() + budget
+        while not root.visits or (root.visits < iterations if deadline is None else perf_counter() < deadline):
+            node, depth = root, 0
+            # Selection: follow the UCT choice while every move of the node has been tried
+            while not node.untried and node.children:
+                node = node.select_child(self.exploration)
+                game.apply_move(node.move, node.marker)
+                depth += 1
+            # Expansion: add one untried move, unless the game already ended at this node
+            if node.untried:
+                marker = opponent if node.marker == self.marker else self.marker
+                move = node.untried.pop()
+                game.apply_move(move, marker)
+                depth += 1
+                replies = [] if game.last_move_won() else game.legal_moves()
+                shuffle(replies)
+                node.children.append(Node(move, marker, node, replies))
+                node = node.children[-1]
+            winner = self._rollout(node, opponent, policy)
+            # Backpropagation
+            while node is not None:
+                node.visits += 1
+                if winner == node.marker:
+                    node.wins += 1
+                elif winner is None:
+                    node.wins += 0.5
+                node = node.parent
+            for _ in range(depth):
+                game.undo_move()
+        return root
+
+    def _parallel_search(self, iterations: int, budget: Optional[float]) -> tuple[dict, int]:
+        """Runs one search per worker process from the current position and merges their root statistics. The
+        position is sent to the workers as a game snapshot."""
+        from games.snapshot import encode_game  # Only needed by parallel searches
+        snapshot = encode_game(self.game)
+        share = -(-iterations // self.workers)
+        options = (self.marker, self.rollout, self.exploration, share, budget)
+        futures = [worker_pool(self.workers).submit(_search_worker, snapshot, *options, getrandbits(64))
+                   for _ in range(self.workers)]
+        statistics: dict[Any, list] = {}
+        playouts = 0
+        for future in futures:
+            worker_statistics, worker_playouts = future.result()
+            playouts += worker_playouts
+            for move, (visits, wins) in worker_statistics.items():
+                totals = statistics.setdefault(move, [0, 0.0])
+                totals[0] += visits
+                totals[1] += wins
+        return statistics, playouts
+
+    def _rollout(self, node: Node, opponent: str, policy) -> Optional[str]:
+        """Plays the game out from the node with the rollout policy and returns the winning marker, or None for a
+        draw. The moves of the playout are taken back before returning."""
+        game = self.game
+        if node.parent is not None and game.last_move_won():
+            return node.marker
+        marker = opponent if node.marker == self.marker else self.marker
+        other = node.marker
+        winner = None
+        played = 0
+        while moves := game.legal_moves():
+            game.apply_move(policy(game, moves, marker, other), marker)
+            played += 1
+            if game.last_move_won():
+                winner = marker
+                break
+            marker, other = other, marker
+        for _ in range(played):
+            game.undo_move()
+        return winner
+
+    def move(self, board=None) -> Any:
+        """Returns the move for the current position of the game. The board argument matches AIPlayer.move and is
+        not needed, the position is read from the game."""
+        return self.search()
+
+    def think(self, budget: Optional[float] = None) -> Any:
+        """Searches for up to budget seconds, or with the player's own iteration or time budget if not given."""
+        return self.search(budget=budget)
@@ -0,0 +1,151 @@
+from time import perf_counter
+from typing import Optional
+from core.player import Player
+from core.threats import ThreatIndex
+from games.search import SearchTimeout
+
+WIN_SCORE = 10 ** 9
+
+
+def window_values(win_value: int) -> list[int]:
+    """Returns the worth of a window holding n markers of one player and none of the other, indexed by n. Each
+    marker is worth several times the one before it, so one open line of three counts for more than many lines of
+    two, and a full window is a win."""
+    return [0] + [8 ** n for n in range(1, win_value)] + [WIN_SCORE]
+
+
+class MNKPlayer(Player):
+    """Computer player for Tic Tac Toe on any rows x columns board with any number in a row to win, the m,n,k game.
+    Positions are judged by threats: every window of win_value squares that only one player has markers in is worth
+    more the fuller it is. Moves are searched with alpha-beta negamax to a bounded depth over the most promising
+    squares near the markers already played, ordered by how much they build the player's windows and break the
+    opponent's. A square that wins, or blocks a win, is the only one searched. The window counts are kept in a
+    ThreatIndex that follows the moves of the search. With a time budget the search deepens one ply at a time until
+    the budget is spent."""
+
+    def __init__(self, name: str = 'CPU', marker: str = "o", game=None, depth: int = 4, width: int = 8,
+                 reach: int = 2, time_budget: Optional[float] = None):
+        super().__init__(name, marker)
+        self.game = game
+        self.depth = depth  # Plies searched, the greatest depth when searching to a time budget
+        self.width = width  # Candidate squares searched at each position, the rest are never played
+        self.reach = reach  # Distance from a played square for an empty square to be a candidate
+        self.time_budget = time_budget
+        self.nodes = 0
+        self.depth_reached = 0
+        self.search_time = 0.0
+        self._deadline = None
+        self.values = window_values(game.connect_value)
+        self.threats: Optional[ThreatIndex] = None  # Made on the first search, once both markers are known
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Returns the search rate of the last move."""
+        return self.nodes / self.search_time if self.search_time else 0.0
+
+    def candidates(self, marker: str, opponent: str) -> list[tuple[int, int]]:
+        """Returns the squares to search for the marker. A square that wins is the only one, and if the opponent
+        has squares that win they are the only ones, as any other move loses. Otherwise these are the empty squares
+        within reach of a played square, best first and at most width of them, ranked by the gain for the player
+        plus the gain for the opponent, as a square the opponent wants is one worth taking from them. An empty board
+        gives its centre square."""
+        threats = self.threats
+        if wins := threats.winning_squares(marker):
+            return [min(wins)]
+        if blocks := threats.winning_squares(opponent):
+            return sorted(blocks)
+        board = self.game.board
+        if not self.game.move_list:
+            return [(board.rows // 2, board.columns // 2)]
+        squares = set()
+        reach = self.reach
+        for row, column in self.game.move_list:
+            for r in range(max(0, row - reach), min(board.rows, row + reach + 1)):
+                for c in range(max(0, column - reach), min(board.columns, column + reach + 1)):
+                    if board.board[r][c] == 0:
+                        squares.add((r, c))
+        values = self.values
+        ranked = sorted(((threats.gain(*square, marker, values) + threats.gain(*square, opponent, values), square)
+                         for square in squares), reverse=True)
+        return [square for _, square in ranked[:self.width]]
+
+    def search(self, depth: Optional[int] = None, budget: Optional[float] = None) -> Optional[tuple[int, int]]:
+        """Returns the best square for the current position of the game, searching depth plies or deepening until
+        budget seconds have passed when a budget is given. The game is left as it was found."""
+        depth = self.depth if depth is None else depth
+        budget = self.time_budget if budget is None else budget
+        opponent = next(player.marker for player in self.game.players if player.marker != self.marker)
+        start = perf_counter()
+        self.nodes = 0
+        self.depth_reached = 0
+        if self.threats is None:
+            board = self.game.board
+            self.threats = ThreatIndex(board.rows, board.columns, self.game.connect_value, (self.marker, opponent))
+        self.threats.follow(self.game.board, self.game.move_list)
+        ranked = self.candidates(self.marker, opponent)
+        if not ranked:
+            return None
+        best = ranked[0]
+        if budget is None:
+            best = self._search_root(ranked, opponent, depth)[0]
+            self.depth_reached = depth
+        else:
+            self._deadline = start + budget
+            try:
+                for iteration in range(1, depth + 1):
+                    move, score = self._search_root(ranked, opponent, iteration)
+                    best, self.depth_reached = move, iteration
+                    if abs(score) > WIN_SCORE // 2:
+                        break  # A forced win or loss was found, searching deeper cannot change it
+            except SearchTimeout:
+                pass
+            self._deadline = None
+        self.search_time = perf_counter() - start
+        return best
+
+    def _search_root(self, ranked: list, opponent: str, depth: int) -> tuple[tuple[int, int], int]:
+        """Searches each candidate to the depth and returns the best square with its score. Of squares with equal
+        scores the one ranked first is kept, so a lost position is still defended where the threats are greatest."""
+        best, best_square = -WIN_SCORE - 1, ranked[0]
+        for square in ranked:
+            score = -self._negamax(square, self.marker, opponent, depth - 1, -WIN_SCORE - 1, -best, 1)
+            if score > best:
+                best, best_square = score, square
+        return best_square, best
+
+    def _negamax(self, square: tuple[int, int], marker: str, opponent: str, depth: int, alpha: int, beta: int,
+                 ply: int) -> int:
+        """Plays the square for the marker and returns the score of the position for the opponent, who moves
+        next. Wins found sooner score higher."""
+        self.nodes += 1
+        if self._deadline is not None and self.nodes & 63 == 0 and perf_counter() > self._deadline:
+            raise SearchTimeout
+        game, threats = self.game, self.threats
+        game.apply_move(square, marker)
+        threats.play(*square, marker)
+        try:
+            if threats.has_won(marker):
+                return -(WIN_SCORE - ply)
+            if len(game.move_list) == game.board_size:
+                return 0
+            if depth == 0:
+                return threats.score(opponent, self.values)
+            best = -WIN_SCORE - 1
+            for reply in self.candidates(opponent, marker):
+                best = max(best, -self._negamax(reply, opponent, marker, depth - 1, -beta, -alpha, ply + 1))
+                alpha = max(alpha, best)
+                if alpha >= beta:
+                    break
+            return best
+        finally:
+            threats.undo(*square, marker)
+            game.undo_move()
+
+    def move(self, board=None) -> Optional[tuple[int, int]]:
+        """Returns the move for the current position of the game. The board argument matches AIPlayer.move and is
+        not needed, the position is read from the game."""
+        return self.search()
+
+    def think(self, budget: Optional[float] = None) -> Optional[tuple[int, int]]:
+        """Searches for up to budget seconds, or with the player's own depth or time budget if not given."""
+        return self.search(budget=budget)
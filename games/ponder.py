@@ -0,0 +1,72 @@
+from copy import deepcopy
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Optional
+
+
+def think(game, player, stop: Event) -> Any:
+    """Default decision for pondering: the player's own time limited search, which ends early once stop is set."""
+    return player.think(stop=stop)
+
+
+class Ponderer:
+    """Works out the AI reply to each possible human move in a background thread while the human is deciding.
+    The search runs on a private copy of the game, so the real game can be used freely while pondering. When the
+    human moves, take returns the prepared reply for the new position, or None if it was not reached in time.
+    Starting again or taking a reply stops the work for the previous position: decide is given an Event that is
+    set when the work is no longer wanted and a search should return as soon as it sees it. A Ponderer runs at most
+    one thread, starting again waits for the previous one to stop."""
+
+    def __init__(self, decide: Callable[[Any, Any, Event], Any] = think):
+        self.decide = decide
+        self._replies: dict[tuple, Any] = {}  # move list after the human move -> AI reply
+        self._stop = Event()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+
+    def start(self, game, ai_player) -> None:
+        """Begins pondering the replies of ai_player to every legal move of its opponent in the current position."""
+        self.cancel()
+        self.join()
+        stop = Event()
+        with self._lock:
+            self._stop = stop
+        copy = deepcopy(game, {id(game.observers): []})  # Observers such as record writers are left behind
+        ai_copy = next(player for player in copy.players if player.marker == ai_player.marker)
+        human_marker = next(player.marker for player in copy.players if player.marker != ai_player.marker)
+        self._thread = Thread(target=self._ponder, args=(stop, copy, ai_copy, human_marker), daemon=True)
+        self._thread.start()
+
+    def _ponder(self, stop: Event, game, ai_player, human_marker: str) -> None:
+        for move in game.legal_moves():
+            if stop.is_set():
+                return  # A newer position is being pondered or a reply was already taken
+            game.apply_move(move, human_marker)
+            try:
+                if game.last_move_won() or not game.legal_moves():
+                    continue
+                reply = self.decide(game, ai_player, stop)
+                with self._lock:
+                    if not stop.is_set():
+                        self._replies[tuple(game.move_list)] = reply
+            finally:
+                game.undo_move()
+
+    def take(self, game) -> Optional[Any]:
+        """Returns the pondered reply for the current position of the game and stops pondering. Returns None if
+        the human played a move whose reply was not ready."""
+        with self._lock:
+            reply = self._replies.get(tuple(game.move_list))
+            self._stop.set()
+            self._replies = {}
+        return reply
+
+    def cancel(self) -> None:
+        """Stops pondering and discards any prepared replies."""
+        with self._lock:
+            self._stop.set()
+            self._replies = {}
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Waits for the background thread to finish pondering the current position."""
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,105 @@
+import os
+import struct
+import sys
+from collections import Counter, namedtuple
+from typing import Iterator, Optional, Union
+from games.Game import TicTacToe, ConnectFour
+from games.snapshot import GAME_TYPES, _move_width, _win_value
+
+RECORD_MAGIC = b"GR"
+RECORD_VERSION = 1
+# The result is the position of the winner in game.players, which does not say who moved first
+RESULT_NAMES = {0: "draw", 1: "player 1", 2: "player 2"}
+
+# 11 bytes: magic, version, game type, rows, columns, win value, go first, result, number of moves
+_HEADER = struct.Struct("<2sBBBBBBBH")
+
+GameRecord = namedtuple("GameRecord", ["game_type", "rows", "columns", "win_value", "go_first", "result", "moves"])
+
+
+def encode_record(game: Union[TicTacToe, ConnectFour]) -> bytes:
+    """Returns the binary record of a finished game: a fixed size header with the board configuration, turn order and
+    result, followed by the square of each move. The result is 0 for a draw, otherwise 1 or 2 for the position of the
+    winner in game.players, whichever of them moved first, which go_first records."""
+    rows, columns = game.board.rows, game.board.columns
+    win_marker = game.get_winner_info()["marker"]
+    result = next((index + 1 for index, player in enumerate(game.players) if player.marker == win_marker), 0)
+    header = _HEADER.pack(RECORD_MAGIC, RECORD_VERSION, GAME_TYPES[type(game)], rows, columns, _win_value(game),
+                          game.go_first, result, len(game.move_list))
+    width = _move_width(rows, columns)
+    return header + b"".join((row * columns + col).to_bytes(width, "little") for row, col in game.move_list)
+
+
+class GameRecordWriter:
+    """Appends finished games to a binary record file. Records are collected in a write buffer and reach the disk
+    in large blocks. Register the writer with a game's add_observer method to record every game it completes."""
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16):
+        self.path = path
+        self._file = open(path, "ab", buffering=buffer_size)
+        self.records_written = 0
+
+    def write(self, game: Union[TicTacToe, ConnectFour]) -> None:
+        self._file.write(encode_record(game))
+        self.records_written += 1
+
+    def game_complete(self, game: Union[TicTacToe, ConnectFour]) -> None:
+        """Observer hook called by update_players_stats once a game has finished."""
+        self.write(game)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> 'GameRecordWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_records(path: str, buffer_size: int = 1 << 16) -> Iterator[GameRecord]:
+    """Yields each game record in a file in order. Only one record is held in memory at a time, so files with
+    millions of games can be scanned in constant memory."""
+    with open(path, "rb", buffering=buffer_size) as file:
+        while header := file.read(_HEADER.size):
+            if len(header) < _HEADER.size:
+                raise ValueError(f"Truncated record header at the end of {path}.")
+            magic, version, game_type, rows, columns, win_value, go_first, result, move_count = \
+                _HEADER.unpack(header)
+            if magic != RECORD_MAGIC or version != RECORD_VERSION:
+                raise ValueError(f"Invalid game record in {path}.")
+            width = _move_width(rows, columns)
+            data = file.read(move_count * width)
+            if len(data) < move_count * width:
+                raise ValueError(f"Truncated move list at the end of {path}.")
+            moves = tuple(divmod(int.from_bytes(data[i:i + width], "little"), columns)
+                          for i in range(0, len(data), width))
+            yield GameRecord(game_type, rows, columns, win_value, bool(go_first), result, moves)
+
+
+def recorder_from_environment() -> Optional[GameRecordWriter]:
+    """Returns a record writer for the file named by the GAME_RECORDS environment variable, or None if it is unset."""
+    path = os.environ.get("GAME_RECORDS")
+    return GameRecordWriter(path) if path else None
+
+
+def summarize(path: str) -> None:
+    """Prints the number of games and the results by board configuration of a record file."""
+    results = Counter()
+    total_moves = 0
+    for record in read_records(path):
+        results[(record.rows, record.columns, record.win_value, RESULT_NAMES[record.result])] += 1
+        total_moves += len(record.moves)
+    games = sum(results.values())
+    print(f"{games} games with {total_moves} moves in {path}.")
+    for (rows, columns, win_value, result), count in sorted(results.items()):
+        print(f"{rows}x{columns} ({win_value} in a row) {result} wins: {count}" if result != "draw"
+              else f"{rows}x{columns} ({win_value} in a row) draws: {count}")
+
+
+if __name__ == "__main__":
+    summarize(sys.argv[1])
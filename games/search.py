@@ -0,0 +1,174 @@
+from random import choice
+from threading import Event
+from time import perf_counter
+from typing import Any, Optional
+from games.transposition import COMPLETE_DEPTH, EXACT, LOWER, UPPER, TranspositionTable, ZobristKeys
+
+WIN_SCORE = 1000
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search iteration when the deadline passes."""
+
+
+class AnytimeSearch:
+    """Iterative deepening negamax search with alpha-beta pruning that can be stopped at any time. Each call to
+    refine searches one ply deeper than the last and best_move always holds the choice of the deepest completed
+    iteration. Works with any game providing legal_moves, apply_move, undo_move and last_move_won, such as
+    TicTacToe and ConnectFour. Positions past the depth limit score as a draw. Given a transposition table, results
+    are shared between positions reached by different move orders, and between processes using the same table."""
+
+    def __init__(self, game, marker: str, max_depth: Optional[int] = None,
+                 table: Optional[TranspositionTable] = None):
+        self.game = game
+        self.marker = marker
+        self.opponent = next(player.marker for player in game.players if player.marker != marker)
+        self.max_depth = max_depth
+        self.best_move: Any = None
+        self.best_score: Optional[int] = None
+        self.depth = 0
+        self.solved = False
+        self.nodes = 0
+        self._deadline = None
+        self.stop: Optional[Event] = None  # Ends the search early when set, as the deadline does
+        self._complete = True
+        self.table = table
+        self._keys = None
+        self._key = 0
+        if table is not None:
+            self._keys = ZobristKeys(game.board.rows, game.board.columns, (marker, self.opponent))
+            self._turn = self._keys.turn(marker) ^ self._keys.turn(self.opponent)
+
+    def start(self, initial_move: Any = None) -> None:
+        """Begins a new search from the current position. The initial move is returned if no iteration completes
+        and is preferred over other moves of equal score."""
+        self.best_move = initial_move
+        self.best_score = None
+        self.depth = 0
+        self.solved = False
+        self.nodes = 0
+        if self.table is not None:
+            self.table.new_search()
+            self._key = self._keys.position(self.game.board, self.marker)
+
+    def refine(self, deadline: float) -> bool:
+        """Searches one ply deeper unless the deadline passes first. Returns False once the search cannot improve,
+        because the game tree was searched to the end or the depth limit was reached."""
+        moves = self.game.legal_moves()
+        if self.solved or not moves or (self.max_depth is not None and self.depth >= self.max_depth):
+            return False
+        depth = self.depth + 1
+        self._deadline = deadline
+        # Search the best move so far first so that alpha-beta prunes the rest of the moves sooner
+        if self.best_move in moves:
+            moves.remove(self.best_move)
+            moves.insert(0, self.best_move)
+
+        scores = {}
+        self._complete = True
+        alpha = -WIN_SCORE - 1
+        try:
+            for move in moves:
+                if self._out_of_time():
+                    raise SearchTimeout
+                # The window is one point wider than usual so moves that tie with the best get an exact score
+                score = -self._negamax(move, self.marker, self.opponent, depth - 1, -WIN_SCORE - 1, 1 - alpha, 1)
+                scores[move] = score
+                alpha = max(alpha, score)
+        except SearchTimeout:
+            return False
+
+        best = max(scores.values())
+        best_moves = [move for move, score in scores.items() if score == best]
+        self.best_move = self.best_move if self.best_move in best_moves else choice(best_moves)
+        self.best_score = best
+        self.depth = depth
+        # Every line was followed to the end of the game, so deeper iterations cannot change the result
+        self.solved = self._complete
+        return not self.solved
+
+    def _negamax(self, move: Any, marker: str, opponent: str, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """Plays the move for the marker and returns the score of the position for the opponent, who moves next."""
+        self.nodes += 1
+        if self.nodes & 255 == 0 and self._out_of_time():
+            raise SearchTimeout
+        self.game.apply_move(move, marker)
+        parent_key = self._key
+        try:
+            if self.game.last_move_won():
+                return -(WIN_SCORE - ply)
+            moves = self.game.legal_moves()
+            if not moves:
+                return 0
+            if depth == 0:
+                self._complete = False
+                return 0
+            if self.table is None:
+                best = -WIN_SCORE - 1
+                for reply in moves:
+                    best = max(best, -self._negamax(reply, opponent, marker, depth - 1, -beta, -alpha, ply + 1))
+                    alpha = max(alpha, best)
+                    if alpha >= beta:
+                        break
+                return best
+            return self._negamax_table(moves, opponent, marker, depth, alpha, beta, ply)
+        finally:
+            self._key = parent_key
+            self.game.undo_move()
+
+    def _negamax_table(self, moves: list, marker: str, opponent: str, depth: int, alpha: int, beta: int,
+                       ply: int) -> int:
+        """Searches the moves of the marker to play, probing and storing results in the transposition table."""
+        row, column = self.game.move_list[-1]
+        key = self._key = self._key ^ self._keys.square(row, column, opponent) ^ self._turn
+        entry = self.table.probe(key)
+        first = None
+        if entry is not None:
+            if entry.depth >= depth:
+                # Win and loss scores are stored counting from this position rather than from the root
+                value = entry.value - ply if entry.value > WIN_SCORE // 2 else \
+                    entry.value + ply if entry.value < -WIN_SCORE // 2 else entry.value
+                if entry.flag == EXACT or (entry.flag == LOWER and value >= beta) or \
+                        (entry.flag == UPPER and value <= alpha):
+                    if entry.depth != COMPLETE_DEPTH:
+                        self._complete = False
+                    return value
+            first = next((reply for reply in moves if self._move_index(reply) == entry.move), None)
+        if first is not None:
+            moves.remove(first)
+            moves.insert(0, first)
+
+        outer_complete, self._complete = self._complete, True
+        original_alpha = alpha
+        best, best_move = -WIN_SCORE - 1, moves[0]
+        for reply in moves:
+            score = -self._negamax(reply, marker, opponent, depth - 1, -beta, -alpha, ply + 1)
+            if score > best:
+                best, best_move = score, reply
+            alpha = max(alpha, best)
+            if alpha >= beta:
+                break
+        complete = self._complete
+        self._complete = outer_complete and complete
+
+        flag = UPPER if best <= original_alpha else LOWER if best >= beta else EXACT
+        stored = best + ply if best > WIN_SCORE // 2 else best - ply if best < -WIN_SCORE // 2 else best
+        self.table.store(key, COMPLETE_DEPTH if complete else depth, stored, flag, self._move_index(best_move))
+        return best
+
+    def _out_of_time(self) -> bool:
+        return perf_counter() > self._deadline or (self.stop is not None and self.stop.is_set())
+
+    def _move_index(self, move: Any) -> int:
+        """Returns the move as a single number for the table: the column in ConnectFour, the square otherwise."""
+        return move if isinstance(move, int) else move[0] * self.game.board.columns + move[1]
+
+    def run(self, budget: float, initial_move: Any = None, stop: Optional[Event] = None) -> Any:
+        """Searches until the time budget in seconds is spent, stop is set or the search is complete and returns
+        the best move."""
+        deadline = self._deadline = perf_counter() + budget
+        self.stop = stop
+        self.start(initial_move)
+        while not self._out_of_time() and self.refine(deadline):
+            pass
+        return self.best_move
@@ -0,0 +1,199 @@
+import sqlite3
+import struct
+from math import isnan, nan
+from threading import Lock
+from typing import Optional, Union
+from games.Game import TicTacToe, ConnectFour
+
+SNAPSHOT_VERSION = 1
+GAME_TYPES = {TicTacToe: 0, ConnectFour: 1}
+DIFFICULTY_CODES = {None: 1, False: 2, True: 3}  # 0 is used for human players
+MCTS_KIND, MNK_KIND = 4, 5  # Search players, stored with their settings after the name
+
+# version, game type, rows, columns, win value, go first, number of moves
+_HEADER = struct.Struct("<BBBBBBH")
+# player kind or difficulty code, wins, losses, games played, length of the encoded name
+_PLAYER = struct.Struct("<BIIIH")
+# MCTSPlayer iterations, time budget or NaN for none, rollout policy number, exploration and workers
+_MCTS_SETTINGS = struct.Struct("<IdBdB")
+# MNKPlayer depth, width, reach and time budget or NaN for none
+_MNK_SETTINGS = struct.Struct("<BBBd")
+
+
+def _win_value(game: Union[TicTacToe, ConnectFour]) -> int:
+    return game.connect_value
+
+
+def _move_width(rows: int, columns: int) -> int:
+    """Squares are stored as a single byte when the board has no more than 256 squares."""
+    return 1 if rows * columns <= 256 else 2
+
+
+def _marked_move_width(rows: int, columns: int) -> int:
+    """Moves of a snapshot also hold the player, so a byte is enough for boards of no more than 128 squares."""
+    return _move_width(rows * 2, columns)
+
+
+def _budget(value: float) -> Optional[float]:
+    return None if isnan(value) else value
+
+
+def _encode_player(player) -> tuple[int, bytes]:
+    """Returns the kind of a player and its settings. Players that cannot be rebuilt from a kind and settings,
+    such as the solver with its opening book, raise ValueError."""
+    from games.mcts import MCTSPlayer, ROLLOUT_POLICIES  # Only loaded here, the search players may not be in use
+    from games.mnk import MNKPlayer
+    if type(player) in (TicTacToe.TicTacToePlayer, ConnectFour.ConnectFourPlayer):
+        return 0, b""
+    if type(player) is TicTacToe.AIPlayer:
+        return DIFFICULTY_CODES[player.difficulty], b""
+    budget = nan if player.time_budget is None else player.time_budget
+    if type(player) is MCTSPlayer:
+        return MCTS_KIND, _MCTS_SETTINGS.pack(player.iterations, budget, list(ROLLOUT_POLICIES).index(player.rollout),
+                                              player.exploration, player.workers)
+    if type(player) is MNKPlayer:
+        return MNK_KIND, _MNK_SETTINGS.pack(player.depth, player.width, player.reach, budget)
+    raise ValueError(f"Players of type {type(player).__name__} cannot be stored in a snapshot.")
+
+
+def encode_game(game: Union[TicTacToe, ConnectFour]) -> bytes:
+    """Returns a compact binary snapshot of a game. The board itself is not stored: it is rebuilt on decoding by
+    replaying the move list, so a snapshot is a small header, the two players and one byte per move. Each move is
+    stored with the player whose marker is on its square, as positions set up with apply_move need not follow the
+    turn order of go_first. Raises ValueError for a player without a name or of a type that cannot be stored."""
+    rows, columns = game.board.rows, game.board.columns
+    parts = [_HEADER.pack(SNAPSHOT_VERSION, GAME_TYPES[type(game)], rows, columns, _win_value(game),
+                          game.go_first, len(game.move_list))]
+    for player in game.players:
+        if not isinstance(player.name, str):
+            raise ValueError(f"Player {player.marker} has no name.")
+        name = player.name.encode()
+        kind, settings = _encode_player(player)
+        parts.append(_PLAYER.pack(kind, player.win_count, player.lost_count, player.games_played, len(name)))
+        parts.append(name)
+        parts.append(settings)
+    width = _marked_move_width(rows, columns)
+    player_numbers = {player.marker: number for number, player in enumerate(game.players)}
+    squares = game.board.board
+    parts.extend(((row * columns + col) * 2 + player_numbers[squares[row][col]]).to_bytes(width, "little")
+                 for row, col in game.move_list)
+    return b"".join(parts)
+
+
+def decode_game(data: bytes) -> Union[TicTacToe, ConnectFour]:
+    """Rebuilds a game from a snapshot created by encode_game, replaying the moves onto a new board."""
+    version, game_type, rows, columns, win_value, go_first, move_count = _HEADER.unpack_from(data)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}.")
+    offset = _HEADER.size
+
+    if game_type == GAME_TYPES[ConnectFour]:
+        game = ConnectFour(win_value, rows, columns)
+    else:
+        game = TicTacToe(rows, columns, win_value)
+    difficulties = {code: difficulty for difficulty, code in DIFFICULTY_CODES.items()}
+
+    players = []
+    for default in game.players:
+        kind, wins, losses, played, name_length = _PLAYER.unpack_from(data, offset)
+        offset += _PLAYER.size
+        name = data[offset:offset + name_length].decode()
+        offset += name_length
+        if kind == MCTS_KIND:
+            from games.mcts import MCTSPlayer, ROLLOUT_POLICIES
+            iterations, budget, rollout, exploration, workers = _MCTS_SETTINGS.unpack_from(data, offset)
+            offset += _MCTS_SETTINGS.size
+            player = MCTSPlayer(name=name, marker=default.marker, game=game, iterations=iterations,
+                                time_budget=_budget(budget), rollout=list(ROLLOUT_POLICIES)[rollout],
+                                exploration=exploration, workers=workers)
+        elif kind == MNK_KIND:
+            from games.mnk import MNKPlayer
+            depth, width, reach, budget = _MNK_SETTINGS.unpack_from(data, offset)
+            offset += _MNK_SETTINGS.size
+            player = MNKPlayer(name=name, marker=default.marker, game=game, depth=depth, width=width, reach=reach,
+                               time_budget=_budget(budget))
+        elif kind:
+            player = TicTacToe.AIPlayer(name=name, marker=default.marker, difficulty=difficulties[kind], game=game)
+        else:
+            player = type(default)(name, default.marker)
+        player.win_count, player.lost_count, player.games_played = wins, losses, played
+        players.append(player)
+    game.players = tuple(players)
+    game.go_first = bool(go_first)
+
+    width = _marked_move_width(rows, columns)
+    for _ in range(move_count):
+        square, number = divmod(int.from_bytes(data[offset:offset + width], "little"), 2)
+        offset += width
+        row, col = divmod(square, columns)
+        marker = game.players[number].marker
+        if isinstance(game, ConnectFour):
+            game.make_move(col, marker)
+        else:
+            game.make_move(row, col, marker)
+    return game
+
+
+class SnapshotStore:
+    """Stores game snapshots in a local SQLite database. Checkpoints are held in memory and written together in a
+    single transaction once batch_size games are pending, so checkpointing after every move stays cheap. Only the
+    latest snapshot of each game is kept."""
+
+    def __init__(self, path: str, batch_size: int = 64):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: dict[str, bytes] = {}
+        self._deleted: set[str] = set()
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS snapshots (game_id TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        self._connection.commit()
+
+    def checkpoint(self, game_id: str, game: Union[TicTacToe, ConnectFour]) -> None:
+        """Queues the current state of a game, writing the batch if it is full."""
+        data = encode_game(game)
+        with self._lock:
+            self._pending[game_id] = data
+            self._deleted.discard(game_id)
+            if len(self._pending) + len(self._deleted) >= self.batch_size:
+                self._write()
+
+    def delete(self, game_id: str) -> None:
+        """Queues the removal of a finished or abandoned game."""
+        with self._lock:
+            self._pending.pop(game_id, None)
+            self._deleted.add(game_id)
+            if len(self._pending) + len(self._deleted) >= self.batch_size:
+                self._write()
+
+    def flush(self) -> None:
+        """Writes every queued checkpoint and removal to the database."""
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        if not self._pending and not self._deleted:
+            return
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO snapshots (game_id, data) VALUES (?, ?)",
+                                         self._pending.items())
+            self._connection.executemany("DELETE FROM snapshots WHERE game_id = ?",
+                                         ((game_id,) for game_id in self._deleted))
+        self._pending.clear()
+        self._deleted.clear()
+
+    def load_all(self) -> dict[str, Union[TicTacToe, ConnectFour]]:
+        """Returns every stored game keyed by its id, including checkpoints that have not been written yet."""
+        self.flush()
+        return {game_id: decode_game(data)
+                for game_id, data in self._connection.execute("SELECT game_id, data FROM snapshots")}
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._connection.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
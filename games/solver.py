@@ -0,0 +1,363 @@
+import mmap
+import struct
+import sys
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Iterator, Optional
+from games.mcts import MCTSPlayer
+from games.search import SearchTimeout
+from games.transposition import LOWER, UPPER, TranspositionTable
+
+BOOK_MAGIC = b"C4OB"
+# magic, rows, columns, connect value, ply, number of positions
+_BOOK_HEADER = struct.Struct("<4sBBBBQ")
+
+
+class BitBoard:
+    """Connect Four position stored as two integers, with one bit per square and one spare bit on top of each
+    column. position holds the stones of the player to move and mask holds every stone, so playing a move is a
+    couple of integer operations. Bits are numbered from the bottom of the first column upwards."""
+
+    def __init__(self, rows: int = 6, columns: int = 7, connect_value: int = 4):
+        self.rows = rows
+        self.columns = columns
+        self.connect_value = connect_value
+        self.height = rows + 1
+        self.bottom_mask = sum(1 << (column * self.height) for column in range(columns))
+        self.board_mask = self.bottom_mask * ((1 << rows) - 1)
+        self.position = 0
+        self.mask = 0
+        self.moves = 0
+        # Vertical, horizontal and both diagonals. The spare bits stop lines wrapping into the next column.
+        self._directions = (1, self.height, self.height - 1, self.height + 1)
+
+    @classmethod
+    def from_game(cls, game) -> 'BitBoard':
+        """Converts a ConnectFour game, replaying its moves in order. Players are assumed to take turns."""
+        board = cls(game.rows, game.columns, game.connect_value)
+        for _, column in game.move_list:
+            board.play_column(column)
+        return board
+
+    @property
+    def size(self) -> int:
+        return self.rows * self.columns
+
+    def column_mask(self, column: int) -> int:
+        return ((1 << self.rows) - 1) << (column * self.height)
+
+    def can_play(self, column: int) -> bool:
+        return self.mask & (1 << (self.rows - 1 + column * self.height)) == 0
+
+    def play(self, move: int) -> None:
+        """Plays a move given as the bit of the square it fills."""
+        self.position ^= self.mask
+        self.mask |= move
+        self.moves += 1
+
+    def play_column(self, column: int) -> None:
+        self.play((self.mask + (1 << (column * self.height))) & self.column_mask(column))
+
+    def key(self) -> int:
+        """Returns a number identifying the position and the player to move."""
+        return self.position + self.mask
+
+    def possible(self) -> int:
+        """Returns the bits of the lowest free square of each column that is not full."""
+        return (self.mask + self.bottom_mask) & self.board_mask
+
+    def winning_squares(self, position: int) -> int:
+        """Returns the free squares that would complete a line for the stones in position."""
+        lines = 0
+        for direction in self._directions:
+            # before[n] marks squares with n stones in a row just below them in this direction, after[n] above
+            before, after = [-1], [-1]
+            for _ in range(self.connect_value - 1):
+                before.append(before[-1] & (position << (len(before) * direction)))
+                after.append(after[-1] & (position >> (len(after) * direction)))
+            for count in range(self.connect_value):
+                lines |= before[count] & after[self.connect_value - 1 - count]
+        return lines & (self.board_mask ^ self.mask)
+
+    def can_win_next(self) -> bool:
+        return bool(self.winning_squares(self.position) & self.possible())
+
+    def non_losing_moves(self) -> int:
+        """Returns the playable squares that do not let the opponent win on the next move. Only called when the
+        player to move cannot win at once."""
+        possible = self.possible()
+        opponent_wins = self.winning_squares(self.position ^ self.mask)
+        forced = possible & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                return 0  # The opponent has two winning squares and only one can be blocked
+            possible = forced
+        return possible & ~(opponent_wins >> 1)  # Never play under a square the opponent wins on
+
+    def mirror_key(self) -> int:
+        """Returns the key of the position reflected left to right, which has the same score."""
+        key, column_bits = self.key(), (1 << self.height) - 1
+        mirrored = 0
+        for column in range(self.columns):
+            mirrored |= ((key >> (column * self.height)) & column_bits) << ((self.columns - 1 - column) * self.height)
+        return mirrored
+
+    def canonical_key(self) -> int:
+        return min(self.key(), self.mirror_key())
+
+
+class Solver:
+    """Negamax solver for Connect Four positions on a BitBoard. A score is positive when the player to move wins:
+    one point for each of their stones left unplayed at the end, so faster wins score higher, and 0 for a draw.
+    The search narrows the score window with null-window searches, tries the moves that create the most threats
+    first and keeps bounds in a TranspositionTable. Boards are limited to 64 bits of position key, which covers
+    the standard 6x7 board."""
+
+    def __init__(self, rows: int = 6, columns: int = 7, connect_value: int = 4, table_buckets: int = 1 << 20):
+        if (rows + 1) * columns > 64:
+            raise ValueError(f"Board of {rows}x{columns} is too large for the solver, keys are limited to 64 bits.")
+        self.rows = rows
+        self.columns = columns
+        self.connect_value = connect_value
+        self.table = TranspositionTable(table_buckets)
+        self.column_order = sorted(range(columns), key=lambda column: abs(columns // 2 - column))
+        self.nodes = 0
+        self._deadline = None
+
+    def solve(self, board: BitBoard, deadline: Optional[float] = None) -> int:
+        """Returns the exact score of the position. Raises SearchTimeout if the deadline passes first."""
+        if board.can_win_next():
+            return (board.size + 1 - board.moves) // 2
+        self._deadline = deadline
+        position, mask, moves = board.position, board.mask, board.moves
+        low, high = -((board.size - moves) // 2), (board.size + 1 - moves) // 2
+        try:
+            while low < high:
+                # Probe near zero first, as small windows around the likely score prune the most
+                middle = low + (high - low) // 2
+                if middle <= 0 and int(low / 2) < middle:
+                    middle = int(low / 2)
+                elif middle >= 0 and int(high / 2) > middle:
+                    middle = int(high / 2)
+                score = self._negamax(position, mask, moves, board, middle, middle + 1)
+                if score <= middle:
+                    high = score
+                else:
+                    low = score
+        finally:
+            board.position, board.mask, board.moves = position, mask, moves
+        return low
+
+    def _negamax(self, position: int, mask: int, moves: int, board: BitBoard, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if self.nodes & 4095 == 0 and self._deadline is not None and perf_counter() > self._deadline:
+            raise SearchTimeout
+        board.position, board.mask, board.moves = position, mask, moves
+        playable = board.non_losing_moves()
+        if not playable:
+            return -((board.size - moves) // 2)
+        if moves >= board.size - 2:
+            return 0
+        low = -((board.size - 2 - moves) // 2)
+        if alpha < low:
+            alpha = low
+            if alpha >= beta:
+                return alpha
+        high = (board.size - 1 - moves) // 2
+        key = position + mask
+        first_column = None
+        entry = self.table.probe(key)
+        if entry is not None:
+            if entry.flag == UPPER:
+                high = min(high, entry.value)
+            elif entry.flag == LOWER:
+                alpha = max(alpha, entry.value)
+            first_column = entry.move
+        if beta > high:
+            beta = high
+        if alpha >= beta:
+            return alpha
+
+        # Moves that leave the most winning squares come first, ties go to the center columns
+        candidates = []
+        for order, column in enumerate(self.column_order):
+            move = playable & board.column_mask(column)
+            if move:
+                threats = 100 if column == first_column else bin(board.winning_squares(position | move)).count("1")
+                candidates.append((-threats, order, column, move))
+        candidates.sort()
+
+        for _, _, column, move in candidates:
+            board.position, board.mask = position, mask
+            score = -self._negamax(position ^ mask, mask | move, moves + 1, board, -beta, -alpha)
+            if score >= beta:
+                self.table.store(key, 0, score, LOWER, column)
+                return score
+            alpha = max(alpha, score)
+        self.table.store(key, 0, alpha, UPPER)
+        return alpha
+
+    def move_scores(self, board: BitBoard, deadline: Optional[float] = None,
+                    book: Optional['OpeningBook'] = None) -> dict[int, int]:
+        """Returns the score of each playable column for the player to move, looking positions up in the book
+        when it has them."""
+        scores = {}
+        position, mask, moves = board.position, board.mask, board.moves
+        for column in self.column_order:
+            if not board.can_play(column):
+                continue
+            move = (mask + (1 << (column * board.height))) & board.column_mask(column)
+            if board.winning_squares(position) & move:
+                scores[column] = (board.size + 1 - moves) // 2
+                continue
+            board.position, board.mask, board.moves = position ^ mask, mask | move, moves + 1
+            try:
+                stored = book.lookup(board) if book is not None else None
+                scores[column] = -(stored if stored is not None else self.solve(board, deadline))
+            finally:
+                board.position, board.mask, board.moves = position, mask, moves
+        return scores
+
+    def close(self) -> None:
+        self.table.close()
+
+
+def opening_positions(rows: int, columns: int, connect_value: int, ply: int) -> Iterator[BitBoard]:
+    """Yields every position reachable in up to ply moves without either player having won, once per position
+    and its mirror image."""
+    board = BitBoard(rows, columns, connect_value)
+    seen = set()
+
+    def visit():
+        key = board.canonical_key()
+        if key in seen:
+            return
+        seen.add(key)
+        yield board
+        if board.moves == ply:
+            return
+        position, mask, moves = board.position, board.mask, board.moves
+        for column in range(columns):
+            if board.can_play(column):
+                move = (mask + (1 << (column * board.height))) & board.column_mask(column)
+                if not board.winning_squares(position) & move:
+                    board.play(move)
+                    yield from visit()
+                    board.position, board.mask, board.moves = position, mask, moves
+
+    yield from visit()
+
+
+def build_opening_book(path: str, rows: int = 6, columns: int = 7, connect_value: int = 4, ply: int = 4) -> int:
+    """Solves every position up to ply moves and writes the scores to an opening book file. Returns the number of
+    positions. This is done offline: on the standard board each position of the book is a full solve."""
+    solver = Solver(rows, columns, connect_value)
+    try:
+        scores = {board.canonical_key(): solver.solve(board)
+                  for board in opening_positions(rows, columns, connect_value, ply)}
+    finally:
+        solver.close()
+    keys = sorted(scores)
+    with open(path, "wb") as file:
+        file.write(_BOOK_HEADER.pack(BOOK_MAGIC, rows, columns, connect_value, ply, len(keys)))
+        file.write(struct.pack(f"<{len(keys)}Q", *keys))
+        file.write(struct.pack(f"<{len(keys)}b", *(scores[key] for key in keys)))
+    return len(keys)
+
+
+class OpeningBook:
+    """Read only view of an opening book file, memory mapped so that only the pages used are read from disk.
+    The file holds a header, the sorted canonical keys of the positions as 64 bit integers and then one signed
+    byte of score for each key. Lookups are a binary search over the mapped keys."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.rows, self.columns, self.connect_value, self.ply, count = _BOOK_HEADER.unpack_from(self._map)
+        if magic != BOOK_MAGIC:
+            raise ValueError(f"{path} is not an opening book.")
+        view = memoryview(self._map)
+        self._keys = view[_BOOK_HEADER.size:_BOOK_HEADER.size + count * 8].cast("Q")
+        self._scores = view[_BOOK_HEADER.size + count * 8:].cast("b")
+
+    def lookup(self, board: BitBoard) -> Optional[int]:
+        """Returns the score of the position, or None if the book does not have it."""
+        if (board.moves > self.ply or (board.rows, board.columns, board.connect_value)
+                != (self.rows, self.columns, self.connect_value)):
+            return None
+        key = board.canonical_key()
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._scores[index]
+        return None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self) -> None:
+        self._keys.release()
+        self._scores.release()
+        self._map.close()
+
+
+class SolverPlayer(MCTSPlayer):
+    """ConnectFour player that plays perfectly when it can. Opening positions come from the book, other positions
+    are solved within time_limit seconds, and if the solve does not finish the remaining time goes to the Monte
+    Carlo tree search of MCTSPlayer. Among moves of equal score it plays the most central one."""
+
+    def __init__(self, name: str = 'CPU', marker: str = "y", game=None, book: Optional[OpeningBook] = None,
+                 time_limit: float = 2.0, **options):
+        super().__init__(name, marker, game, **options)
+        self.book = book
+        self.time_limit = time_limit
+        self.solver = None
+        self.solved = False  # Whether the last move was chosen by an exact score
+
+    def search(self, iterations: Optional[int] = None, budget: Optional[float] = None) -> Any:
+        game = self.game
+        budget = self.time_limit if budget is None else budget
+        start = perf_counter()
+        if self.solver is None:
+            self.solver = Solver(game.rows, game.columns, game.connect_value)
+        board = BitBoard.from_game(game)
+        try:
+            scores = self.solver.move_scores(board, start + budget, self.book)
+        except SearchTimeout:
+            self.solved = False
+            return super().search(iterations, max(budget - (perf_counter() - start), 0.01))
+        self.solved = True
+        return max(scores, key=scores.get) if scores else None
+
+
+def main(arguments: list[str]) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Connect Four solver and opening book builder.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Solve every opening position up to a ply and write an opening book.")
+    build.add_argument("path")
+    build.add_argument("--ply", type=int, default=4)
+    solve = commands.add_parser("solve", help="Print the score of each move after a sequence of columns.")
+    solve.add_argument("moves", nargs="?", default="", help="Columns played so far, numbered from 1, e.g. 4453.")
+    for command in (build, solve):
+        command.add_argument("--rows", type=int, default=6)
+        command.add_argument("--columns", type=int, default=7)
+        command.add_argument("--connect", type=int, default=4)
+    options = parser.parse_args(arguments)
+
+    start = perf_counter()
+    if options.command == "build":
+        count = build_opening_book(options.path, options.rows, options.columns, options.connect, options.ply)
+        print(f"Wrote {count} positions to {options.path} in {perf_counter() - start:.1f} s")
+    else:
+        board = BitBoard(options.rows, options.columns, options.connect)
+        for column in options.moves:
+            board.play_column(int(column) - 1)
+        solver = Solver(options.rows, options.columns, options.connect)
+        scores = solver.move_scores(board)
+        solver.close()
+        print(" ".join(f"{column + 1}:{scores[column]}" for column in sorted(scores)))
+        print(f"{solver.nodes} positions in {perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,371 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_right
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator, Optional
+
+TABLEBASE_MAGIC = b"TB02"
+# magic, gravity, rows, columns, connect value, number of positions, positions per block
+_HEADER = struct.Struct("<4sBBBBQH")
+BLOCK_SIZE = 32  # Larger blocks shrink the index but lengthen the scan of every lookup
+
+# Results for the player to move, stored in the top two bits of a value byte with the distance below them
+WIN, LOSS, DRAW = 1, 2, 3
+RESULT_NAMES = {WIN: "win", LOSS: "loss", DRAW: "draw"}
+
+Rules = namedtuple("Rules", ["gravity", "rows", "columns", "connect_value"])
+Result = namedtuple("Result", ["result", "distance"])  # distance is the number of moves to the end of the game
+
+
+class Geometry:
+    """Bit layout shared with the solver's BitBoard: one bit per square numbered from the bottom of the first
+    column, with a spare bit on top of each column so lines cannot wrap. A position key holds the stones of the
+    first player in the low half and the stones of the second player above them."""
+
+    def __init__(self, rules: Rules):
+        self.rules = rules
+        self.height = rules.rows + 1
+        self.bits = self.height * rules.columns
+        self.bottom_mask = sum(1 << (column * self.height) for column in range(rules.columns))
+        self.board_mask = self.bottom_mask * ((1 << rules.rows) - 1)
+        self.size = rules.rows * rules.columns
+        self._directions = (1, self.height, self.height - 1, self.height + 1)
+
+    def check_key_size(self) -> None:
+        """Raises ValueError if the stones of both players do not fit in a 64 bit key."""
+        if 2 * self.bits > 64:
+            raise ValueError(f"Board of {self.rules.rows}x{self.rules.columns} is too large for a tablebase.")
+
+    def moves(self, mask: int) -> Iterator[int]:
+        """Yields the bit of each square that can be played, the lowest free square of each column if the game
+        has gravity and every free square otherwise."""
+        free = (mask + self.bottom_mask) & self.board_mask if self.rules.gravity else self.board_mask & ~mask
+        while free:
+            move = free & -free
+            yield move
+            free ^= move
+
+    def has_line(self, stones: int) -> bool:
+        for direction in self._directions:
+            line = stones
+            for step in range(1, self.rules.connect_value):
+                line &= stones >> (step * direction)
+            if line:
+                return True
+        return False
+
+    def mirror(self, stones: int) -> int:
+        column_bits = (1 << self.height) - 1
+        mirrored = 0
+        for column in range(self.rules.columns):
+            mirrored |= ((stones >> (column * self.height)) & column_bits) << \
+                        ((self.rules.columns - 1 - column) * self.height)
+        return mirrored
+
+    def key(self, first: int, second: int) -> int:
+        """Returns the key of the position or its mirror image, whichever is smaller, as both have one entry."""
+        return min(first | second << self.bits, self.mirror(first) | self.mirror(second) << self.bits)
+
+    def split(self, key: int) -> tuple[int, int]:
+        return key & ((1 << self.bits) - 1), key >> self.bits
+
+    def square(self, move: int) -> Any:
+        """Converts the bit of a move to a move of the games: a column with gravity, a (row, column) otherwise."""
+        index = move.bit_length() - 1
+        column, row_from_bottom = divmod(index, self.height)
+        return column if self.rules.gravity else (self.rules.rows - 1 - row_from_bottom, column)
+
+    def from_game(self, game) -> tuple[int, int]:
+        """Returns the stones of the player who moved first and of the other player in a TicTacToe or ConnectFour
+        game."""
+        stones = {}
+        for row, squares in enumerate(game.board.get_rows()):
+            for column, marker in enumerate(squares):
+                if marker != 0:
+                    bit = 1 << (column * self.height + self.rules.rows - 1 - row)
+                    stones[marker] = stones.get(marker, 0) | bit
+        if not game.move_list:
+            return 0, 0
+        row, column = game.move_list[0]
+        first_marker = game.board.get_rows()[row][column]
+        second = sum(bits for marker, bits in stones.items() if marker != first_marker)
+        return stones[first_marker], second
+
+
+def enumerate_layers(geometry: Geometry) -> list[set[int]]:
+    """Returns the keys of every reachable position grouped by the number of stones on the board. Positions where
+    the last move won are included but not expanded."""
+    layers = [{0}]
+    for count in range(geometry.size):
+        following = set()
+        for key in layers[-1]:
+            first, second = geometry.split(key)
+            mover, waiting = (first, second) if count % 2 == 0 else (second, first)
+            if geometry.has_line(waiting):
+                continue  # The previous move won
+            mask = first | second
+            for move in geometry.moves(mask):
+                moved = mover | move
+                following.add(geometry.key(moved, second) if count % 2 == 0 else geometry.key(first, moved))
+        layers.append(following)
+    return layers
+
+
+class LayerFile:
+    """Values of one layer of positions written to a file for the worker processes, as the sorted 64 bit keys
+    followed by a value byte for each. The file is memory mapped, so each worker reads it without it being pickled
+    to every process, and a value is found by a binary search of the keys."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        count = len(self._map) // 9
+        view = memoryview(self._map)
+        self._keys = view[:count * 8].cast("Q")
+        self._values = view[count * 8:]
+
+    @staticmethod
+    def write(path: str, values: dict[int, int]) -> None:
+        keys = sorted(values)
+        with open(path, "wb") as file:
+            file.write(struct.pack(f"<{len(keys)}Q", *keys))
+            file.write(bytes(values[key] for key in keys))
+
+    def __getitem__(self, key: int) -> int:
+        index = bisect_right(self._keys, key) - 1
+        if index < 0 or self._keys[index] != key:
+            raise KeyError(key)
+        return self._values[index]
+
+    def close(self) -> None:
+        self._keys.release()
+        self._values.release()
+        self._map.close()
+
+
+_rules: Optional[Rules] = None
+_layer: Optional[tuple[str, LayerFile]] = None  # Path and values of the layer the worker last read
+
+
+def _initialize_worker(rules: Rules) -> None:
+    global _rules
+    _rules = rules
+
+
+def _evaluate_chunk(count: int, keys: list[int], layer_path: str) -> list[tuple[int, int]]:
+    """Runs in a worker process: returns the value byte of each position of a layer from the values of the
+    positions one move later, read from the layer file."""
+    global _layer
+    if _layer is None or _layer[0] != layer_path:
+        if _layer is not None:
+            _layer[1].close()
+        _layer = layer_path, LayerFile(layer_path)
+    return evaluate(Geometry(_rules), count, keys, _layer[1])
+
+
+def evaluate(geometry: Geometry, count: int, keys: list[int], child_values) -> list[tuple[int, int]]:
+    """Works out the result of each position with count stones from the results of its children. A move to a
+    position lost for the opponent wins, the fastest such win is chosen, and a lost position is lost as slowly
+    as possible. The child values can be a dict or a LayerFile."""
+    values = []
+    for key in keys:
+        first, second = geometry.split(key)
+        mover, waiting = (first, second) if count % 2 == 0 else (second, first)
+        if geometry.has_line(waiting):
+            values.append((key, LOSS << 6))
+            continue
+        if count == geometry.size:
+            values.append((key, DRAW << 6))
+            continue
+        best = None
+        for move in geometry.moves(first | second):
+            moved = mover | move
+            child = child_values[geometry.key(moved, second) if count % 2 == 0 else geometry.key(first, moved)]
+            result, distance = child >> 6, (child & 63) + 1
+            # Ranked from the mover's side: quick wins, then draws, then slow losses
+            rank = (-100 + distance if result == LOSS else 0 if result == DRAW else 100 - distance)
+            if best is None or rank < best[0]:
+                best = rank, {LOSS: WIN, DRAW: DRAW, WIN: LOSS}[result], distance
+        values.append((key, best[1] << 6 | best[2]))
+    return values
+
+
+def generate(path: str, rules: Rules, workers: int = 1, chunk_size: int = 4096) -> int:
+    """Solves every reachable position of the game and writes the tablebase file. Layers of positions are worked
+    out from the full board back to the empty board, each spread over the worker processes. The workers are
+    started once, and read the values of the layer before from a file instead of being sent them. Returns the
+    number of positions."""
+    geometry = Geometry(rules)
+    geometry.check_key_size()
+    layers = enumerate_layers(geometry)
+    values: dict[int, int] = {}
+    child_values: dict[int, int] = {}
+    pool = ProcessPoolExecutor(workers, initializer=_initialize_worker, initargs=(rules,)) if workers > 1 else None
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            for count in range(len(layers) - 1, -1, -1):
+                keys = sorted(layers[count])
+                chunks = [keys[start:start + chunk_size] for start in range(0, len(keys), chunk_size)]
+                if pool is not None and len(chunks) > 1:
+                    layer_path = os.path.join(directory, f"layer-{count + 1}")
+                    LayerFile.write(layer_path, child_values)
+                    results = pool.map(_evaluate_chunk, [count] * len(chunks), chunks,
+                                       [layer_path] * len(chunks))
+                    layer_values = dict(value for chunk in results for value in chunk)
+                else:
+                    layer_values = dict(evaluate(geometry, count, keys, child_values))
+                values.update(layer_values)
+                child_values = layer_values
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    write_tablebase(path, rules, values)
+    return len(values)
+
+
+def _write_varint(number: int, out: bytearray) -> None:
+    while number >= 0x80:
+        out.append(number & 0x7F | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def write_tablebase(path: str, rules: Rules, values: dict[int, int]) -> None:
+    """Writes the positions in order of their keys, in blocks of BLOCK_SIZE. The first key of each block is stored
+    whole in an index with the offset of the block's other keys, which are stored as the difference from the key
+    before, seven bits to a byte. The value bytes follow in the same order, one per position. Sorted keys of a
+    layer lie close together, so most differences take one to three bytes instead of the eight of a key."""
+    keys = sorted(values)
+    first_keys = keys[::BLOCK_SIZE]
+    offsets = []
+    differences = bytearray()
+    for start in range(0, len(keys), BLOCK_SIZE):
+        offsets.append(len(differences))
+        block = keys[start:start + BLOCK_SIZE]
+        for before, key in zip(block, block[1:]):
+            _write_varint(key - before, differences)
+    offsets.append(len(differences))
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(TABLEBASE_MAGIC, rules.gravity, rules.rows, rules.columns, rules.connect_value,
+                                len(keys), BLOCK_SIZE))
+        file.write(struct.pack(f"<{len(first_keys)}Q", *first_keys))
+        file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        file.write(differences)
+        file.write(bytes(values[key] for key in keys))
+
+
+class Tablebase:
+    """Memory mapped tablebase file. A lookup finds the block of the position key with a binary search of the
+    index of first keys, then adds up the differences of the block until it reaches the key, which reads at most
+    BLOCK_SIZE small numbers. Lookups are therefore not constant time but logarithmic in the number of blocks plus
+    a block scan: about 8.5 microseconds on the 4x4 Connect Three table, against 2.7 for the hash table this format
+    replaced, in exchange for a file an eighth of the size."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, gravity, rows, columns, connect_value, self.count, self.block_size = _HEADER.unpack_from(self._map)
+        if magic != TABLEBASE_MAGIC:
+            raise ValueError(f"{path} is not a tablebase.")
+        self.rules = Rules(bool(gravity), rows, columns, connect_value)
+        self.geometry = Geometry(self.rules)
+        blocks = -(-self.count // self.block_size)
+        view = memoryview(self._map)
+        offset = _HEADER.size
+        self._first_keys = view[offset:offset + blocks * 8].cast("Q")
+        offset += blocks * 8
+        self._offsets = view[offset:offset + (blocks + 1) * 8].cast("Q")
+        offset += (blocks + 1) * 8
+        self._differences = view[offset:offset + self._offsets[blocks]]
+        self._values = view[offset + self._offsets[blocks]:]
+
+    def lookup(self, first: int, second: int) -> Optional[Result]:
+        """Returns the result for the player to move given the stones of each player, or None if the position
+        cannot be reached."""
+        key = self.geometry.key(first, second)
+        block = bisect_right(self._first_keys, key) - 1
+        if block < 0:
+            return None
+        stored, position = self._first_keys[block], block * self.block_size
+        offset, end = self._offsets[block], self._offsets[block + 1]
+        differences = self._differences
+        while stored < key and offset < end:
+            difference = shift = 0
+            while True:
+                byte = differences[offset]
+                offset += 1
+                difference |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            stored += difference
+            position += 1
+        if stored != key:
+            return None
+        value = self._values[position]
+        return Result(value >> 6, value & 63)
+
+    def lookup_game(self, game) -> Optional[Result]:
+        """Returns the result for the player to move in a game played under the rules of the tablebase."""
+        return self.lookup(*self.geometry.from_game(game))
+
+    def best_move(self, game) -> Any:
+        """Returns a move that keeps the best result for the player to move, winning as fast and losing as slowly
+        as possible, or None if the game is over or not in the tablebase."""
+        first, second = self.geometry.from_game(game)
+        first_to_move = len(game.move_list) % 2 == 0
+        best = None
+        for move in self.geometry.moves(first | second):
+            child = self.lookup(first | move, second) if first_to_move else self.lookup(first, second | move)
+            if child is None:
+                return None
+            rank = (-100 + child.distance if child.result == LOSS else 0 if child.result == DRAW
+                    else 100 - child.distance)
+            if best is None or rank < best[0]:
+                best = rank, self.geometry.square(move)
+        return None if best is None else best[1]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        for view in (self._first_keys, self._offsets, self._differences, self._values):
+            view.release()
+        self._map.close()
+
+
+def main(arguments: list[str]) -> None:
+    import argparse
+    from time import perf_counter
+    parser = argparse.ArgumentParser(description="Generate or read a tablebase of every position of a small game.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Solve every position and write a tablebase.")
+    build.add_argument("path")
+    build.add_argument("--game", choices=("connectfour", "tictactoe"), default="connectfour")
+    build.add_argument("--rows", type=int, default=4)
+    build.add_argument("--columns", type=int, default=4)
+    build.add_argument("--connect", type=int, default=3)
+    build.add_argument("--workers", type=int, default=1)
+    probe = commands.add_parser("probe", help="Print the result of the empty board and the best first move.")
+    probe.add_argument("path")
+    options = parser.parse_args(arguments)
+
+    if options.command == "build":
+        start = perf_counter()
+        rules = Rules(options.game == "connectfour", options.rows, options.columns, options.connect)
+        count = generate(options.path, rules, options.workers)
+        print(f"Wrote {count} positions to {options.path} in {perf_counter() - start:.1f} s")
+    else:
+        tablebase = Tablebase(options.path)
+        result = tablebase.lookup(0, 0)
+        print(f"{tablebase.rules}: {len(tablebase)} positions, the first player has a "
+              f"{RESULT_NAMES[result.result]} in {result.distance} moves")
+        tablebase.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
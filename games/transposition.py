@@ -0,0 +1,141 @@
+from collections import namedtuple
+from random import Random
+from typing import Optional
+from core.board import Board
+
+# Entry flags: the stored value is exact, a lower bound (the search failed high) or an upper bound (failed low)
+EXACT, LOWER, UPPER = 1, 2, 3
+NO_MOVE = 0xFFFF
+COMPLETE_DEPTH = 0xFFFF  # Depth stored for a subtree searched to the end of the game, which is valid at any depth
+MAX_DEPTH = COMPLETE_DEPTH - 1  # Deeper searches are stored as this depth, which only makes them used less often
+
+TableEntry = namedtuple("TableEntry", ["depth", "value", "move", "flag"])
+
+
+def _pack(depth: int, value: int, move: int, flag: int, generation: int) -> int:
+    """Packs an entry into 64 bits: value in 16 bits, depth in 16, move in 16, flag in 2 and generation in 8. The
+    depth has room for a search of every square of any board whose squares fit in a move."""
+    return (value + 0x8000) | depth << 16 | move << 32 | flag << 48 | generation << 50
+
+
+class ZobristKeys:
+    """Random 64 bit keys for each marker on each square of a board, and for the marker whose turn it is. The keys
+    only depend on the seed, board size and markers, so every process derives the same keys."""
+
+    def __init__(self, rows: int, columns: int, markers: tuple[str, ...], seed: int = 2024):
+        self.columns = columns
+        self._squares = {}
+        self._turns = {}
+        for marker in markers:
+            random = Random(f"{seed}:{marker}")  # Seeding with a string is the same in every process
+            self._squares[marker] = [random.getrandbits(64) for _ in range(rows * columns)]
+            self._turns[marker] = random.getrandbits(64)
+
+    def square(self, row: int, column: int, marker: str) -> int:
+        return self._squares[marker][row * self.columns + column]
+
+    def turn(self, marker: str) -> int:
+        return self._turns[marker]
+
+    def position(self, board: Board, to_move: str) -> int:
+        """Returns the key of the position on the board with the marker to move."""
+        key = self._turns[to_move]
+        for row, squares in enumerate(board.get_rows()):
+            for column, square in enumerate(squares):
+                if square != 0:
+                    key ^= self.square(row, column, square)
+        return key
+
+
+class TranspositionTable:
+    """Fixed size table of search results in shared memory. Each entry is two 64 bit words: the packed data and
+    the position key XORed with the data. Entries are written without locks; a torn write from two processes fails
+    the XOR check on probing and is read as a miss. Buckets hold two entries, one replaced only by deeper or newer
+    searches and one always replaced, so deep results survive without blocking recent ones.
+
+    The searches in this project, the Solver and AnytimeSearch when given a table, each use it from a single
+    process. The shared memory is there for a search spread over processes, which would open the table in each
+    worker with attach; none does so yet."""
+
+    def __init__(self, buckets: int = 1 << 16, name: Optional[str] = None):
+        from multiprocessing.shared_memory import SharedMemory  # Only loaded by searches that make a table
+        self.create = name is None
+        if self.create:
+            self._memory = SharedMemory(create=True, size=buckets * 32)  # New shared memory is zero filled
+        else:
+            self._memory = SharedMemory(name=name)
+        self._words = self._memory.buf.cast("Q")
+        self.buckets = len(self._words) // 4
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    @classmethod
+    def attach(cls, name: str) -> 'TranspositionTable':
+        """Opens a table created by another process, by the name of its shared memory."""
+        return cls(name=name)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def new_search(self) -> None:
+        """Ages the current entries so they are replaced before results of the new search."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        """Returns the entry stored for the position key, or None if there is none."""
+        self.probes += 1
+        words = self._words
+        base = (key % self.buckets) * 4
+        for slot in (base, base + 2):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                self.hits += 1
+                return TableEntry((data >> 16) & 0xFFFF, (data & 0xFFFF) - 0x8000, (data >> 32) & 0xFFFF,
+                                  (data >> 48) & 0x3)
+        return None
+
+    def store(self, key: int, depth: int, value: int, flag: int, move: int = NO_MOVE) -> None:
+        """Stores a search result for the position key. The move is an index such as a square or column number."""
+        self.stores += 1
+        if depth != COMPLETE_DEPTH:
+            depth = min(depth, MAX_DEPTH)
+        words = self._words
+        base = (key % self.buckets) * 4
+        data = words[base + 1]
+        # The first slot keeps the deepest result of the current search, unless it holds the same position
+        if (not data or words[base] ^ data == key or depth >= (data >> 16) & 0xFFFF
+                or (data >> 50) & 0xFF != self.generation):
+            slot = base
+        else:
+            slot = base + 2
+        data = _pack(depth, value, move, flag, self.generation)
+        words[slot] = key ^ data
+        words[slot + 1] = data
+
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def clear(self) -> None:
+        self._memory.buf[:] = bytes(len(self._memory.buf))
+
+    def close(self) -> None:
+        """Closes this process's view of the table. The creating process also frees the shared memory."""
+        if self._words is None:
+            return
+        self._words.release()
+        self._words = None
+        self._memory.close()
+        if self.create:
+            self._memory.unlink()
+
+    def __del__(self) -> None:
+        self.close()
+
+    def __enter__(self) -> 'TranspositionTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
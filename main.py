@@ -1,4 +1,7 @@
-from cli import TicTacToeCLI, ConnectFourCLI
+from importlib import import_module
+
+# Only the module of the chosen game is imported, along with the game engine and display code it needs
+GAMES = {'1': 'cli.TicTacToeCLI', '2': 'cli.ConnectFourCLI'}
 
 def main():
     print("Select a game:")
@@ -6,10 +9,8 @@ def main():
     print("2. Connect 4")
     choice = input("Enter your choice (1 or 2): ")
 
-    if choice == '1':
-        TicTacToeCLI.run()
-    elif choice == '2':
-        ConnectFourCLI.run()
+    if choice in GAMES:
+        import_module(GAMES[choice]).run()
     else:
         print("Invalid choice. See you next time.")
 
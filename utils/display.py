@@ -1,8 +1,12 @@
 import os
+import signal
+import sys
+from shutil import get_terminal_size
 from time import sleep
+from functools import lru_cache
 from itertools import chain
 from utils.square import Square
-from typing import Union
+from typing import Optional, Union
 
 def set_console_window_size(width: float, height: float) -> None:
     """Sets the console window to fit the board to the screen better."""
@@ -21,14 +25,26 @@ def clear_screen() -> None:
     os.system('clear||cls')
 
 
+# Set to True to print text one character or line at a time. When False every group of strings is written at once.
+TYPEWRITER_EFFECT = False
+
+
+def write_frame(strings: list[str], stream=None) -> None:
+    """Writes a group of strings as a single buffer with one write and one flush."""
+    stream = stream or sys.stdout
+    stream.write("".join(f"{string}\n" for string in strings))
+    stream.flush()
+
+
 def delay_effect(strings: list[str],
                  delay: float = 0.025,
                  word_flush: bool = True) -> None:
     """Creates the effect of the words or characters printed one letter or line at a time. 
-    Word_flush True delays each character. False delays each complete line in a list. """
-        # Used when testing so that can play the games quicker
-    if delay != 0:
-        delay = 0
+    Word_flush True delays each character. False delays each complete line in a list. Only animated when
+    TYPEWRITER_EFFECT is enabled, otherwise the strings are written in a single buffer. """
+    if not TYPEWRITER_EFFECT:
+        write_frame(strings)
+        return
     for string in strings:
         for char in string:
             print(char, end='', flush=word_flush)
@@ -57,25 +73,136 @@ def surround_string(strings: list[str],
     ]
 
 
+MARKER_SQUARES = {0: Square.BLANK, "x": Square.X, "o": Square.O, "r": Square.R, "y": Square.Y, "b": Square.B}
+
+# Each square's five glyph lines, built once at import and shared by every rendered row
+GLYPH_ATLAS = {square: tuple(square.value) for square in Square}
+
+
 def board_translator(raw_board: list[list[int, str]]) -> list[list[Square]]:
     """Converts a raw board with 0, 'x', 'o', 'r', 'y' into Square enum values."""
-    mapping = {0: Square.BLANK, "x": Square.X, "o": Square.O, "r": Square.R, "y": Square.Y}
-    return [[mapping[cell] for cell in row] for row in raw_board]
+    return [[MARKER_SQUARES[cell] for cell in row] for row in raw_board]
 
 
-def create_row(row: list[list[Square]]) -> str:
+def create_row(row: list[list[Square]], width: Optional[int] = None) -> str:
     """Returns a string of a single row of the board from current state of the board attribute."""
+    width = width or get_terminal_size().columns
     return "\n".join([
-        "*".join(line).center(os.get_terminal_size().columns - 1)
+        "*".join(line).center(width - 1)
         for line in zip(*row)
     ])
 
-def create_board(game_board: list[list[Union[int, str]]], line: str) -> str:
-    """Returns a string of the complete board created row by row using _create_row method for printing."""
-    return f"\n{line.center(os.get_terminal_size().columns - 1)}\n".join(
-        [create_row([square.value for square in row]) for row in game_board])
+
+@lru_cache(maxsize=1024)
+def render_row(squares: tuple[Square, ...], width: int) -> str:
+    """Returns the string of a row of squares centred for a terminal width. Rows are cached by their squares and
+    the width, so a row that has already been drawn is a dictionary lookup."""
+    return create_row([GLYPH_ATLAS[square] for square in squares], width)
+
+
+@lru_cache(maxsize=64)
+def render_separator(line: str, width: int) -> str:
+    return f"\n{line.center(width - 1)}\n"
+
+
+def create_board(game_board: list[list[Square]], line: str) -> str:
+    """Returns a string of the complete board created row by row from the cached rows for printing."""
+    width = get_terminal_size().columns  # Read once per frame rather than once per line
+    return render_separator(line, width).join([render_row(tuple(row), width) for row in game_board])
 
 def print_board(game_board: list[list[Union[int, str]]], line: str) -> None:
     """Prints the current state of the game board. Printed line by line."""
     game_board = board_translator(game_board)
     delay_effect([create_board(game_board, line)], 0.00075, False)
+
+
+class BoardRenderer:
+    """Draws a board at a fixed place on the screen and keeps the last frame, so that each later render only
+    rewrites the squares that changed, using ANSI cursor positioning instead of clearing the screen. The terminal
+    width is cached and only read again after the terminal is resized. When stdout is a terminal a SIGWINCH handler
+    watches for resizes, and close, or leaving a with block, puts back the handler it replaced."""
+
+    SQUARE_WIDTH = 12
+    SQUARE_HEIGHT = 5
+
+    def __init__(self, line: str, top: int = 1):
+        self.line = line
+        self.top = top  # Screen row of the first line of the board, starting at 1
+        self._frame = None
+        self._width = None
+        self._previous_handler = None
+        if hasattr(signal, "SIGWINCH") and sys.stdout.isatty():
+            try:
+                self._previous_handler = signal.signal(signal.SIGWINCH, self._on_resize)
+            except ValueError:  # Signal handlers can only be installed from the main thread
+                pass
+
+    def __enter__(self) -> "BoardRenderer":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Restores the SIGWINCH handler that was in place before the renderer was created."""
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGWINCH, self._previous_handler)
+            self._previous_handler = None
+
+    def _on_resize(self, *_) -> None:
+        self._width = None
+
+    @property
+    def terminal_width(self) -> int:
+        if self._width is None:
+            self._width = get_terminal_size().columns
+        return self._width
+
+    def _square_position(self, row: int, column: int, columns: int) -> tuple[int, int]:
+        """Returns the screen row and column of the top left corner of a square."""
+        board_width = columns * (self.SQUARE_WIDTH + 1) - 1
+        left = max((self.terminal_width - 1 - board_width) // 2, 0) + 1
+        return self.top + row * (self.SQUARE_HEIGHT + 1), left + column * (self.SQUARE_WIDTH + 1)
+
+    def _draw_square(self, square: Square, row: int, column: int, columns: int) -> str:
+        y, x = self._square_position(row, column, columns)
+        return "".join(f"\033[{y + n};{x}H{glyph_line}" for n, glyph_line in enumerate(square.value))
+
+    def _full_frame(self, squares: list[list[Square]]) -> list[str]:
+        rows, columns = len(squares), len(squares[0])
+        output = [f"\033[{self.top};1H\033[J"]
+        for r, row in enumerate(squares):
+            y, x = self._square_position(r, 0, columns)
+            for n in range(self.SQUARE_HEIGHT):
+                output.append(f"\033[{y + n};{x}H" + "*".join(square.value[n] for square in row))
+            if r < rows - 1:
+                output.append(f"\033[{y + self.SQUARE_HEIGHT};1H{self.line.center(self.terminal_width - 1)}")
+        return output
+
+    def render(self, game_board: list[list[Union[int, str]]], stream=None) -> int:
+        """Draws the board, repainting it fully on the first call or after a resize and otherwise only the changed
+        squares, then clears any text written below the board since the last frame. Returns the number of squares
+        written."""
+        stream = stream or sys.stdout
+        squares = board_translator(game_board)
+        rows, columns = len(squares), len(squares[0])
+        if self._frame is None or self._width is None or len(self._frame) != rows \
+                or len(self._frame[0]) != columns:
+            output = self._full_frame(squares)
+            written = rows * columns
+        else:
+            output = [self._draw_square(square, r, c, columns)
+                      for r, row in enumerate(squares)
+                      for c, square in enumerate(row)
+                      if square is not self._frame[r][c]]
+            written = len(output)
+        self._frame = squares
+        if output:
+            output.append(f"\033[{self.top + rows * (self.SQUARE_HEIGHT + 1) - 1};1H\033[J")
+            stream.write("".join(output))
+            stream.flush()
+        return written
+
+    def reset(self) -> None:
+        """Forgets the last frame so the next render repaints the whole board."""
+        self._frame = None
@@ -0,0 +1,96 @@
+import os
+from functools import wraps
+from time import perf_counter
+from typing import Optional
+from core.board import Board, WinChecker
+from games.Game import TicTacToe
+
+# Class -> methods counted and timed while instrumentation is enabled
+HOT_PATHS = {
+    Board: ("get_rows", "get_columns", "get_diagonals"),
+    WinChecker: ("check_for_winner",),
+    TicTacToe.AIPlayer: ("win_or_block", "check_fork", "two_blanks", "random_ints", "offence_mode", "defence_mode"),
+}
+
+
+class Instrumentation:
+    """Counts and times calls to the hot path methods of the board, win checker and AI strategy. Nothing is changed
+    until enable is called, which wraps the methods on their classes, and disable puts the original methods back,
+    so there is no cost when it is not in use. Times are inclusive: a strategy step includes the board calls it
+    makes. Add it as a game observer to keep a report for each game as well as the totals."""
+
+    def __init__(self):
+        self.calls: dict[str, list] = {}  # Method name -> [calls, seconds] for the current game
+        self.totals: dict[str, list] = {}
+        self.games: list[dict[str, list]] = []
+        self._originals: dict[tuple[type, str], object] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self) -> None:
+        for cls, names in HOT_PATHS.items():
+            for name in names:
+                if (cls, name) not in self._originals:
+                    self._originals[cls, name] = cls.__dict__[name]
+                    setattr(cls, name, self._wrap(cls.__dict__[name], f"{cls.__qualname__}.{name}"))
+
+    def disable(self) -> None:
+        while self._originals:
+            (cls, name), method = self._originals.popitem()
+            setattr(cls, name, method)
+
+    def _wrap(self, method, name: str):
+        calls = self.calls
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats = calls.get(name)
+                if stats is None:
+                    stats = calls[name] = [0, 0.0]
+                stats[0] += 1
+                stats[1] += perf_counter() - start
+        return timed
+
+    def game_complete(self, game) -> None:
+        """Closes the counts of the finished game and adds them to the totals."""
+        self.games.append({name: list(stats) for name, stats in self.calls.items()})
+        for name, (count, seconds) in self.calls.items():
+            totals = self.totals.setdefault(name, [0, 0.0])
+            totals[0] += count
+            totals[1] += seconds
+        self.calls.clear()
+
+    def report(self, stats: Optional[dict[str, list]] = None) -> str:
+        """Returns a table of calls and time per method, slowest first, for the given counts or the totals."""
+        stats = self.totals if stats is None else stats
+        lines = [f"{'Method':<34}{'calls':>10}{'total ms':>12}{'us/call':>10}"]
+        for name, (count, seconds) in sorted(stats.items(), key=lambda item: item[1][1], reverse=True):
+            lines.append(f"{name:<34}{count:>10}{seconds * 1000:>12.2f}{seconds / count * 1e6:>10.2f}")
+        if self.games and stats is self.totals:
+            lines.append(f"over {len(self.games)} games")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        self.disable()
+
+    def __enter__(self) -> 'Instrumentation':
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+
+def instrumentation_from_environment() -> Optional[Instrumentation]:
+    """Returns enabled instrumentation if the INSTRUMENT environment variable is set, or None otherwise."""
+    if not os.environ.get("INSTRUMENT"):
+        return None
+    instrumentation = Instrumentation()
+    instrumentation.enable()
+    return instrumentation
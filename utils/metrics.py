@@ -0,0 +1,162 @@
+import sys
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Iterable, Optional
+
+# Upper bounds in seconds of the latency histogram buckets, from a cache hit to a slow search
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """Base of the metric types. Values are kept per combination of label values and rendered in the Prometheus
+    text exposition format."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._values: dict[tuple, object] = {}
+        self._lock = Lock()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.extend(self._samples(label_values, value))
+        return lines
+
+    def _samples(self, label_values: tuple, value) -> list[str]:
+        return [f"{self.name}{_labels(self.label_names, label_values)} {value}"]
+
+
+class Counter(Metric):
+    """Counter that is either increased directly or read from a function each time the metrics are rendered, for a
+    count kept elsewhere that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text, labels)
+        self.function = function
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        if self.function is not None:
+            with self._lock:
+                self._values[()] = self.function()
+        return super().render()
+
+
+class Gauge(Metric):
+    """Gauge that is either set directly or read from a function each time the metrics are rendered."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text, labels)
+        self.function = function
+
+    def set(self, value: float, *label_values) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self) -> list[str]:
+        if self.function is not None:
+            self.set(self.function())
+        return super().render()
+
+
+class Histogram(Metric):
+    """Counts observations into cumulative buckets and keeps their sum, as Prometheus histograms do."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values) -> None:
+        with self._lock:
+            counts = self._values.get(label_values)
+            if counts is None:
+                counts = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            counts[0][bisect_left(self.buckets, value)] += 1
+            counts[1] += value
+
+    def _samples(self, label_values: tuple, value) -> list[str]:
+        bucket_counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), bucket_counts):
+            cumulative += count
+            le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, label_values, le)} {cumulative}")
+        labels = _labels(self.label_names, label_values)
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together for a /metrics endpoint."""
+
+    def __init__(self):
+        self.metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Iterable[str] = (),
+                function: Optional[Callable[[], float]] = None) -> Counter:
+        return self.register(Counter(name, help_text, labels, function))
+
+    def gauge(self, name: str, help_text: str, labels: Iterable[str] = (),
+              function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, help_text, labels, function))
+
+    def histogram(self, name: str, help_text: str, labels: Iterable[str] = (),
+                  buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+def deep_size(obj, exclude: Iterable = ()) -> int:
+    """Returns the memory in bytes of an object and everything it references, counting shared objects once.
+    Objects in exclude and everything they reference are left out, for example observers shared by all games."""
+    seen = {id(excluded) for excluded in exclude}
+    stack = [obj]
+    size = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, type):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(current.__dict__)
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return size